@@ -1,7 +1,7 @@
 # main.py
 # Prelimiary main function 
 import os
-from modules import input_handler, analysis_engine, job_searcher, application_automator, user_interface, rag_engine
+from modules import input_handler, analysis_engine, job_records, job_searcher, application_automator, user_interface, rag_engine
 
 def main_workflow():
     # 1. Get User Input
@@ -19,17 +19,30 @@ def main_workflow():
     job_listings = job_searcher.search_jobs(expanded_titles, location)
 
     # 4. Analyze and Rank Jobs
-    analyzed_jobs = []
     print("\n🔬 Analyzing job descriptions against your resume...")
-    for job in job_listings:
-        score, _ = analysis_engine.compare_resume_to_jd(resume_text, job.get('description', ''))
-        job['match_score'] = score
-        if score < 0.2: # Threshold for suggesting resume changes
-            job['suggestions'] = "High skill gap. Consider tailoring your resume significantly."
-        analyzed_jobs.append(job)
+    store = job_records.TextStore()
+    records = [job_records.JobRecord.from_dict(job, store) for job in job_listings]
+    jd_texts = [job.description for job in records]
+    scores, ranking = analysis_engine.score_jobs(resume_text, jd_texts)
 
-    # Sort jobs by match score in descending order
-    analyzed_jobs.sort(key=lambda x: x['match_score'], reverse=True)
+    gaps = analysis_engine.skill_gaps(resume_text, jd_texts)
+
+    # Jobs come back from the ranking in descending order of match score;
+    # scores and tips are columns of the table, not fields of the records
+    tips = []
+    for i in ranking:
+        missing = gaps[i]['missing']
+        tip = None
+        if scores[i] < 0.2: # Threshold for suggesting resume changes
+            if missing:
+                tip = f"High skill gap. Consider highlighting or building: {', '.join(missing[:3])}."
+            else:
+                tip = "Low match. Consider tailoring your resume significantly."
+        tips.append(tip)
+    analyzed_jobs = job_records.JobTable(
+        list(ranking), [records[i] for i in ranking], scores[ranking],
+        missing_skills=[gaps[i]['missing'] for i in ranking], tips=tips,
+    )
 
     # 5. Display jobs and get user selection
     user_interface.display_jobs(analyzed_jobs)
@@ -48,12 +61,15 @@ def main_workflow():
     # 6. Process Applications for Selected Jobs
 
     print("\n--- 🚀 Preparing to Apply ---")
-    for job in selected_jobs:
+    # Get hyper-personalized suggestions from the RAG chain for all jobs at once
+    # (each job's query only searches the resume and that job's description)
+    all_suggestions = rag_engine.query_rag_many(
+        rag_chain, [job['title'] for job in selected_jobs], range(len(selected_jobs))
+    )
+    for job, suggestions in zip(selected_jobs, all_suggestions):
         print(f"\nProcessing application for: {job['title']} at {job['company']}")
         
-        # Get hyper-personalized suggestions from the RAG chain
         print("\n--- AI RAG-Powered Resume Suggestions ---")
-        suggestions = rag_engine.query_rag_chain(rag_chain, job['title'])
         print(suggestions)
         print("---------------------------------------")
     
@@ -81,7 +97,7 @@ def main_workflow():
 
     # 8. Post-Application Feedback
     print("\n\n--- 🌟 Career Development Suggestions ---")
-    skills_to_learn = analysis_engine.suggest_skills_to_learn(resume_text, desired_job)
+    skills_to_learn = analysis_engine.suggest_skills_to_learn(resume_text, desired_job, jd_texts)
     print(skills_to_learn)
     print("\nAll tasks completed. Good luck with your job hunt! 💪")
 
@@ -0,0 +1,113 @@
+# benchmarks/bench_application_queue.py
+# Drives the application queue with a fake submit step (fixed latency, a share
+# of transient failures) spread over a few sites. Compares one application at
+# a time, as the applicator used to submit them, with the worker pool; checks
+# that no site ever had more than APPLY_PER_DOMAIN applications running, that
+# failures were retried to success, and that re-queueing the same
+# applications (a re-run or a resumed run) submits nothing again, while a
+# failed application queued again is retried.
+# Usage: python benchmarks/bench_application_queue.py [n_applications] [workers]
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from modules import application_queue
+
+SITES = ["www.linkedin.com", "boards.greenhouse.io", "jobs.lever.co", "careers.example.com"]
+LATENCY = 0.2
+FAILURE_RATE = 0.2
+
+class FakeSubmit:
+    """apply() for the workers: sleeps, fails transiently now and then, tracks concurrency per site."""
+
+    def __init__(self, latency=LATENCY, failure_rate=FAILURE_RATE, seed=0):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.running = Counter()
+        self.max_running = Counter()
+        self.calls = Counter()
+        self.failures = 0
+
+    def __call__(self, application):
+        domain = application["domain"]
+        with self.lock:
+            self.calls[application["key"]] += 1
+            self.running[domain] += 1
+            self.max_running[domain] = max(self.max_running[domain], self.running[domain])
+            fail = self.random.random() < self.failure_rate
+            self.failures += fail
+        try:
+            time.sleep(self.latency)
+            if fail:
+                raise TimeoutError("submit button never appeared")
+            return True
+        finally:
+            with self.lock:
+                self.running[domain] -= 1
+
+def make_jobs(n):
+    return [{"title": f"Engineer {i}", "company": f"Company {i % 37}", "location": "Remote",
+             "url": f"https://{SITES[i % len(SITES)]}/jobs/{i}", "description": ""} for i in range(n)]
+
+def run(directory, name, jobs, workers):
+    queue = application_queue.ApplicationQueue(os.path.join(directory, f"{name}.sqlite3"))
+    submit = FakeSubmit()
+    keys = [queue.enqueue(job, "resume.pdf", candidate="bench") for job in jobs]
+    start = time.perf_counter()
+    counts = application_queue.drain(queue, workers=workers, apply=submit)
+    return queue, keys, submit, counts, time.perf_counter() - start
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    config.APPLY_PER_DOMAIN = 2
+    config.APPLY_MAX_ATTEMPTS = 5
+    config.APPLY_BACKOFF_SEC = 0.05
+    jobs = make_jobs(n)
+
+    with tempfile.TemporaryDirectory() as directory:
+        with contextlib.redirect_stdout(io.StringIO()):
+            _, _, serial_submit, serial_counts, serial = run(directory, "serial", jobs, 1)
+            queue, keys, submit, counts, pooled = run(directory, "pooled", jobs, workers)
+
+        print(f"{n} applications over {len(SITES)} sites, {LATENCY:.1f}s each, "
+              f"{FAILURE_RATE:.0%} transient failures")
+        print(f"  one at a time:      {serial:6.2f}s  succeeded {serial_counts['succeeded']}/{n}, "
+              f"{sum(serial_submit.calls.values())} submits")
+        print(f"  {workers} workers:          {pooled:6.2f}s  succeeded {counts['succeeded']}/{n}, "
+              f"{sum(submit.calls.values())} submits ({submit.failures} failed and retried) | x{serial / pooled:.1f}")
+        print(f"  max running per site: {dict(submit.max_running)} (limit {config.APPLY_PER_DOMAIN})")
+        assert max(submit.max_running.values()) <= config.APPLY_PER_DOMAIN
+
+        # Re-queueing the same applications (a re-run) must not submit anything again
+        again = FakeSubmit(failure_rate=0)
+        before = sum(submit.calls.values())
+        assert [queue.enqueue(job, "resume.pdf", candidate="bench") for job in jobs] == keys
+        with contextlib.redirect_stdout(io.StringIO()):
+            application_queue.drain(queue, workers=workers, apply=again)
+        print(f"  re-queued {n}: {sum(again.calls.values())} new submits, {queue.status('bench')['total']} rows "
+              f"(was {before} submits)")
+        assert not again.calls
+
+        # A failed application queued again is retried from scratch, with the new resume
+        failed = application_queue.ApplicationQueue(os.path.join(directory, "failed.sqlite3"), max_attempts=1)
+        key = failed.enqueue(jobs[0], "old.pdf", candidate="bench")
+        with contextlib.redirect_stdout(io.StringIO()):
+            application_queue.drain(failed, workers=1, apply=FakeSubmit(latency=0, failure_rate=1))
+            assert failed.get([key])[key]["status"] == application_queue.FAILED
+            failed.enqueue(jobs[0], "new.pdf", candidate="bench")
+            resumes = []
+            application_queue.drain(failed, workers=1, apply=lambda a: resumes.append(a["resume_path"]) or True)
+        assert resumes == ["new.pdf"] and failed.get([key])[key]["status"] == application_queue.SUCCEEDED
+        print("  a failed application queued again was retried with the new resume")
@@ -0,0 +1,61 @@
+# benchmarks/bench_applicator.py
+# Runs the application flow against local fixture pages with controllable
+# delays. Compares a fresh Chrome per application (the old behaviour) with
+# pooled sessions, both with the same number of workers so only session
+# reuse differs, and reports what each event-driven step actually waited
+# against the 7 s of fixed sleeps the flow used to have. Needs Chrome installed.
+# Usage: python benchmarks/bench_applicator.py [n_applications] [pool_size]
+import os
+import statistics
+import sys
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fixture_server import FixtureServer
+from modules import application_automator, browser_pool, site_adapters
+
+OLD_FIXED_SLEEPS = 7.0  # time.sleep(3) + time.sleep(2) + time.sleep(2) per application
+DELAYS = {"delay": 100, "ui_delay": 300, "modal_delay": 200, "upload_delay": 400}
+
+site_adapters.register(site_adapters.EasyApplyAdapter(
+    "fixture", "127.0.0.1",
+    apply_button=("id", "easy-apply"),
+    file_input=("id", "resume"),
+    submit_button=("id", "submit"),
+    upload_done=("id", "upload-status"),
+))
+
+def run(pool, urls, timings):
+    start = time.perf_counter()
+    application_automator.apply_to_jobs([(url, os.path.abspath(__file__)) for url in urls], pool=pool,
+                                        timings=timings)
+    elapsed = time.perf_counter() - start
+    pool.close()
+    return elapsed, pool.stats()
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    size = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    try:
+        browser_pool.chromedriver_path()
+    except Exception as e:
+        sys.exit(f"Chrome/chromedriver not available: {e}")
+
+    timings = []
+    with FixtureServer() as server:
+        urls = [server.url("job.html", id=i, **DELAYS) for i in range(n)]
+        fresh, fresh_stats = run(browser_pool.BrowserPool(size=size, max_uses=1), urls, [])
+        pooled, pooled_stats = run(browser_pool.BrowserPool(size=size), urls, timings)
+
+    print(f"{n} applications, {size} workers | fresh browser each: {fresh:6.1f}s ({fresh_stats['created']} browsers) | "
+          f"pool of {size}: {pooled:6.1f}s ({pooled_stats['created']} browsers) | x{fresh / pooled:.1f}")
+
+    by_step = defaultdict(list)
+    for timing in timings:
+        by_step[timing.step].append(timing.seconds)
+    for step, seconds in by_step.items():
+        print(f"    {step:<24} median {statistics.median(seconds):6.2f}s")
+    per_application = sum(statistics.median(s) for s in by_step.values())
+    print(f"    waiting per application: {per_application:.2f}s (fixed sleeps: {OLD_FIXED_SLEEPS:.0f}s)")
@@ -0,0 +1,74 @@
+# benchmarks/bench_batch.py
+# Runs a batch of synthetic candidates through the full graph offline: a
+# synthetic job source and LLM with fixed latencies (benchmarks/fakes.py) and
+# dry-run policies. Compares one candidate at a time with concurrent workers,
+# after checking that a manifest naming two candidates alike is rejected.
+# Usage: python benchmarks/bench_batch.py [n_candidates] [workers]
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import fakes
+from benchmarks.synthetic import TITLES, make_resume
+from modules import batch_runner, input_handler
+
+SEARCH_LATENCY = 0.3
+LLM_LATENCY = 0.2
+
+def write_candidates(directory, n):
+    import docx
+    candidates = []
+    for i in range(n):
+        path = os.path.join(directory, f"resume_{i}.docx")
+        doc = docx.Document()
+        doc.add_paragraph("SUMMARY")
+        doc.add_paragraph(make_resume(seed=i))
+        doc.save(path)
+        candidates.append({
+            "name": f"candidate-{i}", "resume": path, "query": TITLES[i % 3], "location": "Remote",
+            "policy": {"top_k": 3, "min_score": 0.0, "apply": False, "resume_path": None},
+        })
+    return candidates
+
+def check_manifest(directory):
+    """Two candidates with one name would share a checkpoint thread and seen/applied store."""
+    path = os.path.join(directory, "manifest.json")
+    entry = {"resume": "resume.pdf", "query": TITLES[0], "location": "Remote"}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump([{**entry, "name": "ana"}, entry, {**entry, "name": "ana"}], f)
+    try:
+        batch_runner.load_manifest(path)
+    except ValueError as e:
+        assert "1 and 3" in str(e)
+    else:
+        raise AssertionError("a manifest with duplicate names was accepted")
+    print("manifest checks passed")
+
+def run(app, candidates, workers, cache_dir):
+    # Fresh caches for each run so neither starts warm
+    fakes.install(os.path.join(cache_dir, f"run_{workers}"), llm_latency=LLM_LATENCY,
+                  search_latency=SEARCH_LATENCY)
+    input_handler.parse_resumes([c["resume"] for c in candidates], workers=1)
+    return batch_runner.run_batch(app, candidates, workers)
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    from multi_agent_main import get_app
+
+    with tempfile.TemporaryDirectory() as directory:
+        check_manifest(directory)
+        fakes.install(directory)  # before get_app(), which opens the checkpoint database
+        candidates = write_candidates(directory, n)
+        with contextlib.redirect_stdout(io.StringIO()):
+            serial_results, serial = run(get_app(), candidates, 1, directory)
+            results, concurrent = run(get_app(), candidates, workers, directory)
+
+    batch_runner.print_report(results, concurrent)
+    print(f"\n1 worker: {serial['wall_seconds']:.2f}s ({serial['searches']} searches) | "
+          f"{workers} workers: {concurrent['wall_seconds']:.2f}s ({concurrent['searches']} searches)")
@@ -0,0 +1,76 @@
+# benchmarks/bench_checkpoint.py
+# Runs the graph offline once with checkpointing, then saves the state after
+# every node twice: in the compact form the graph uses (job ids, RAG chain
+# reference) and in the old inline form (full job dicts in found/analyzed/
+# selected lists). Reports checkpoint sizes and save latency for both.
+# Usage: python benchmarks/bench_checkpoint.py [jobs_per_search]
+import contextlib
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from benchmarks import fakes
+from benchmarks.synthetic import TITLES, make_resume
+from modules import checkpoints, job_index
+
+def inline_state(values, index):
+    """The same state as the old graph held it: job dicts inlined in every list."""
+    scores = values.get("match_scores") or {}
+
+    def jobs(key):
+        return [{**job, "match_score": scores.get(job_id)}
+                for job_id, job in zip(values.get(key) or [], index.get_jobs(values.get(key) or []))]
+
+    legacy = {k: v for k, v in values.items()
+              if k not in ("found_job_ids", "analyzed_job_ids", "selected_job_ids", "match_scores", "rag_chain_ref")}
+    legacy.update(found_jobs=jobs("found_job_ids"), analyzed_jobs=jobs("analyzed_job_ids"),
+                  selected_jobs=jobs("selected_job_ids"))
+    return legacy
+
+def save_all(saver, thread_id, states):
+    """Saves one checkpoint per state; returns (sizes in bytes, save times in ms)."""
+    from langgraph.checkpoint.base import empty_checkpoint
+    run_config = {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+    sizes, times = [], []
+    for step, values in enumerate(states):
+        checkpoint = empty_checkpoint()
+        checkpoint["channel_values"] = values
+        start = time.perf_counter()
+        run_config = saver.put(run_config, checkpoint, {"source": "loop", "step": step}, {})
+        times.append((time.perf_counter() - start) * 1000)
+        sizes.append(len(saver.serde.dumps_typed(checkpoint)[1]))
+    return sizes, times
+
+def report(label, sizes, times):
+    print(f"{label:>8} | {sum(sizes) / 1024:8.1f} KB total | {max(sizes) / 1024:7.1f} KB largest | "
+          f"save p50 {statistics.median(times):6.2f}ms, max {max(times):6.2f}ms")
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    with tempfile.TemporaryDirectory() as directory:
+        fakes.install(directory, per_search=n)
+
+        from multi_agent_main import get_app
+        app = get_app()
+        state = {"resume_text": make_resume(), "resume_sections": None, "default_resume_path": "resume.pdf",
+                 "job_query": TITLES[0], "location": "Remote", "candidate": "bench",
+                 "policy": {"top_k": 5, "min_score": 0.0, "apply": False, "resume_path": None}}
+        with contextlib.redirect_stdout(io.StringIO()):
+            checkpoints.run_or_resume(app, state, "bench")
+        history = [snapshot.values for snapshot in app.get_state_history(checkpoints.thread_config("bench"))]
+        states = list(reversed(history))[1:]  # oldest first, without the empty input checkpoint
+
+        index = job_index.get_index(config.JOB_INDEX_DIR)
+        saver = checkpoints.get_checkpointer(os.path.join(directory, "bench.sqlite3"))
+        compact = save_all(saver, "compact", states)
+        inline = save_all(saver, "inline", [inline_state(values, index) for values in states])
+
+    print(f"{len(states)} checkpoints, {len(states[-1]['match_scores'])} jobs analyzed")
+    report("compact", *compact)
+    report("inline", *inline)
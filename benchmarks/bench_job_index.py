@@ -0,0 +1,88 @@
+# benchmarks/bench_job_index.py
+# Builds a persistent job index, reloads it through memory mapping and times
+# scoring a fresh resume against the whole stored corpus. Checks first that
+# records survive a save and reload (read lazily from the record store), that
+# removed jobs stay removed, and that an index saved as meta.json is moved over.
+# Usage: python benchmarks/bench_job_index.py [n_jobs]
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_jobs, make_resume
+from modules import job_index
+
+def check_persistence():
+    """Asserts what a saved and reloaded index holds."""
+    jobs = make_jobs(50)
+    with tempfile.TemporaryDirectory() as path:
+        index = job_index.JobIndex(path)
+        keys = index.add_jobs(jobs)
+        index.save()
+        index.remove(keys[:5])
+        index.add_jobs([{**jobs[5], "description": "Rewritten: Python and SQL."}])
+        index.save()
+
+        loaded = job_index.load_index(path)
+        assert not loaded.jobs, "records were read on load"
+        assert len(loaded) == 45 and keys[0] not in loaded
+        assert loaded.get_jobs(keys[5:7])[0]['description'] == "Rewritten: Python and SQL."
+        assert loaded.get_jobs(keys[6:7])[0].to_dict() == jobs[6]
+        assert len(loaded.jobs) == 2, "more records were read than asked for"
+        assert list(loaded.score(make_resume(seed=1), keys[5:])) == list(index.score(make_resume(seed=1), keys[5:]))
+        # Re-adding unchanged postings after a reload does not replace them
+        loaded.add_jobs(jobs[6:])
+        assert not loaded._added
+
+        # An index saved before the record store existed is read once and moved over
+        os.remove(os.path.join(path, "keys.npy"))
+        os.remove(os.path.join(path, job_index._RECORDS))
+        with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({"keys": index.keys, "hashes": index.hashes,
+                       "jobs": {key: job.to_dict() for key, job in index.jobs.items()}}, f)
+        job_index.load_index(path).save()
+        assert not os.path.exists(os.path.join(path, "meta.json"))
+        assert job_index.load_index(path).get_jobs(keys[6:7])[0].to_dict() == jobs[6]
+    print("persistence checks passed")
+
+def bench(n):
+    jobs = make_jobs(n)
+    with tempfile.TemporaryDirectory() as path:
+        start = time.perf_counter()
+        index = job_index.JobIndex(path)
+        keys = index.add_jobs(jobs)
+        index.save()
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index = job_index.load_index(path)
+        load = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index.score(make_resume(seed=1))
+        score = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index.get_jobs(keys[:20])
+        records = time.perf_counter() - start
+
+        # A second run where 1% of the postings are new
+        start = time.perf_counter()
+        index.add_jobs(jobs + make_jobs(max(1, n // 100), seed=1))
+        index.score(make_resume(seed=2))
+        incremental = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index.save()
+        save = time.perf_counter() - start
+
+    print(f"{n:>8} jobs | build {build:7.2f}s | mmap load {load * 1000:7.1f}ms | "
+          f"score {score * 1000:7.1f}ms | 20 records {records * 1000:5.1f}ms | "
+          f"+1% add & score {incremental * 1000:7.1f}ms | save {save * 1000:7.1f}ms")
+
+if __name__ == "__main__":
+    check_persistence()
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,73 @@
+# benchmarks/bench_job_records.py
+# Memory held by a corpus of postings as plain job dicts (scores written onto
+# each dict, and the analyzed list copied with {**job, "match_score": ...} as
+# the old graph state did) against job_records: slotted records, interned
+# strings, one TextStore for descriptions and a float32 score column.
+# Every posting is found by two searches, as overlapping title searches do.
+# Checks first that records read back exactly the dicts they were built from.
+# Usage: python benchmarks/bench_job_records.py [sizes...]
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from benchmarks.synthetic import make_jobs
+from modules import job_records
+
+def search_results(n):
+    """Two independently parsed copies of each posting (distinct string objects, like two HTTP responses)."""
+    payload = json.dumps(make_jobs(n))
+    return json.loads(payload) + json.loads(payload)
+
+def as_dicts(results, scores):
+    found = results
+    for job, score in zip(found, scores):
+        job['match_score'] = float(score)
+    analyzed = [{**job, "match_score": job['match_score']} for job in found]
+    return found, analyzed
+
+def as_records(results, scores):
+    store = job_records.TextStore()
+    records = [job_records.JobRecord.from_dict(job, store) for job in results]
+    return job_records.JobTable(range(len(records)), records, scores)
+
+def measure(build, n):
+    scores = np.random.default_rng(0).random(2 * n)
+    gc.collect()
+    tracemalloc.start()
+    results = search_results(n)
+    start = time.perf_counter()
+    kept = build(results, scores)
+    seconds = time.perf_counter() - start
+    del results  # only what the pipeline keeps counts
+    gc.collect()
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return current / 2 ** 20, seconds
+
+def check_round_trip():
+    """Asserts that a record reads back every key of its dict, standard fields missing or not."""
+    store = job_records.TextStore()
+    for job in [make_jobs(1)[0],
+                {"title": "Engineer", "company": "Acme", "url": "https://a.example.com/1", "salary": "100k"},
+                {"title": "Engineer", "description": "Python", "remote": True, "posted": "2026-10-01"}]:
+        record = job_records.JobRecord.from_dict(job, store)
+        for key, value in job.items():
+            assert record[key] == value and key in record, f"{key!r} lost"
+        assert job_records.JobRecord.from_dict(record, store).to_dict() == record.to_dict()
+    print("round-trip checks passed")
+
+if __name__ == "__main__":
+    check_round_trip()
+    for n in [int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000]:
+        dict_mb, dict_s = measure(as_dicts, n)
+        record_mb, record_s = measure(as_records, n)
+        print(f"{2 * n:>7} postings | dicts {dict_mb:8.1f} MB ({dict_s:5.2f}s) | "
+              f"records {record_mb:8.1f} MB ({record_s:5.2f}s) | {dict_mb / record_mb:4.1f}x smaller")
@@ -0,0 +1,74 @@
+# benchmarks/bench_llm_cache.py
+# Checks the LLM response cache against a fake LLM -- a repeated prompt (or
+# one differing only in whitespace) is not sent again, expired entries are
+# asked for again, the least recently used entries are evicted first -- then
+# times a workload where a share of the prompts repeat, with and without it.
+# Usage: python benchmarks/bench_llm_cache.py [n_prompts] [repeat_share]
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fakes import FakeLLM
+from modules import llm_cache
+
+LLM_LATENCY = 0.01
+
+def check_behaviour():
+    """Asserts what the cache serves, expires and evicts."""
+    fake = FakeLLM()
+    llm = llm_cache.CachedLLM(fake, llm_cache.LLMCache())
+    first = llm.invoke("Rate how well this resume matches.").content
+    assert llm.invoke("Rate how well this resume matches.").content == first
+    assert llm.invoke("  Rate how well   this resume matches.\n").content == first
+    assert fake.calls == 1, "a repeated prompt was sent again"
+    assert llm.cache.stats()["hits"] == 2 and llm.cache.stats()["misses"] == 1
+
+    # TTL: an expired entry is a miss and the model is asked again
+    fake = FakeLLM()
+    llm = llm_cache.CachedLLM(fake, llm_cache.LLMCache(ttl=0.2))
+    llm.invoke("prompt")
+    time.sleep(0.3)
+    llm.invoke("prompt")
+    assert fake.calls == 2, "an expired entry was served"
+
+    # LRU: with room for two entries, the one not used recently goes first
+    fake = FakeLLM()
+    llm = llm_cache.CachedLLM(fake, llm_cache.LLMCache(max_entries=2))
+    for prompt in ["a", "b", "a", "c"]:  # "a" is used again before "c" arrives
+        llm.invoke(prompt)
+        time.sleep(0.01)
+    assert llm.cache.stats()["entries"] == 2
+    calls = fake.calls
+    llm.invoke("a")
+    llm.invoke("c")
+    assert fake.calls == calls, "a recently used entry was evicted"
+    llm.invoke("b")
+    assert fake.calls == calls + 1, "the least recently used entry was kept"
+    print("cache behaviour checks passed")
+
+def run(prompts, cached):
+    fake = FakeLLM(LLM_LATENCY)
+    llm = llm_cache.CachedLLM(fake, llm_cache.LLMCache()) if cached else fake
+    start = time.perf_counter()
+    for prompt in prompts:
+        llm.invoke(prompt)
+    return time.perf_counter() - start, fake.calls, llm.cache if cached else None
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    repeat = float(sys.argv[2]) if len(sys.argv) > 2 else 0.5
+    check_behaviour()
+
+    rng = random.Random(0)
+    distinct = [f"Suggest resume changes for job {i}." for i in range(int(n * (1 - repeat)) or 1)]
+    prompts = distinct + [rng.choice(distinct) for _ in range(n - len(distinct))]
+    rng.shuffle(prompts)
+    uncached, uncached_calls, _ = run(prompts, cached=False)
+    cached, cached_calls, cache = run(prompts, cached=True)
+    print(f"{n} prompts, {repeat:.0%} repeats, {LLM_LATENCY * 1000:.0f}ms per request")
+    print(f"  no cache: {uncached:6.2f}s, {uncached_calls} requests")
+    print(f"  cache:    {cached:6.2f}s, {cached_calls} requests | x{uncached / cached:.1f}")
+    llm_cache.print_stats(cache)
@@ -0,0 +1,146 @@
+# benchmarks/bench_pipeline.py
+# End-to-end offline benchmark of the agent pipeline: searcher -> deduper ->
+# analyst -> RAG build (user proxy, with a selection policy) -> RAG queries
+# (advisor), on synthetic corpora with fake LLM, embedding and job-board
+# backends. Reports per-stage time, throughput and peak memory, and p50/p95
+# latencies of the calls inside the stages. Results can be saved and later
+# compared against, failing when a stage gets slower or hungrier.
+# Usage: python benchmarks/bench_pipeline.py [--sizes 10 1000 10000] [--llm-latency 0.05]
+#        [--save results.json] [--baseline results.json --tolerance 0.25]
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import fakes
+from benchmarks.synthetic import TITLES, make_resume
+from modules import tracing
+import multi_agent_main as graph
+
+STAGES = [
+    ("search", graph.search_agent_node),
+    ("dedup", graph.dedup_agent_node),
+    ("analyze", graph.analysis_agent_node),
+    ("rag_build", graph.user_proxy_agent_node),
+    ("rag_query", graph.advisor_agent_node),
+]
+# Calls inside the stages whose latency distribution is reported
+INNER_SPANS = ["search.source", "analysis.score", "rank.rerank", "embeddings.embed_documents", "rag.index_add",
+               "rag.query", "llm.invoke"]
+# Differences below this are noise, whatever the tolerance
+NOISE_SECONDS = 0.1
+NOISE_MB = 2.0
+
+def stage_inputs(stage, state):
+    """How many jobs a stage worked on, for its throughput."""
+    if stage in ("rag_build", "rag_query"):
+        return len(state.get("selected_job_ids") or [])
+    if stage == "analyze":
+        return len(state.get("analyzed_job_ids") or [])
+    return state.get("_searched", 0)
+
+def run_pipeline(n, args, memory=False):
+    """Runs every stage once on a corpus of about n jobs. Returns {stage: stats} and the final state."""
+    with tempfile.TemporaryDirectory() as directory:
+        n_titles = 1 + 3  # the query plus FakeLLM's related titles
+        fakes.install(directory, args.llm_latency, args.embed_latency, args.search_latency,
+                      per_search=math.ceil(n / n_titles))
+        state = {"resume_text": make_resume(), "resume_sections": None, "default_resume_path": "resume.pdf",
+                 "job_query": TITLES[0], "location": "Remote", "candidate": None,
+                 "policy": {"top_k": args.top_k, "min_score": 0.0, "apply": False, "resume_path": None}}
+        results = {}
+        for stage, node in STAGES:
+            if memory:
+                tracemalloc.start()
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                update = node(state)
+            seconds = time.perf_counter() - start
+            stats = {"seconds": seconds}
+            if memory:
+                stats["peak_mb"] = tracemalloc.get_traced_memory()[1] / 2 ** 20
+                tracemalloc.stop()
+            state = {**state, **update}
+            if stage == "search":
+                state["_searched"] = len(state["found_job_ids"])
+            jobs = stage_inputs(stage, state)
+            stats.update(jobs=jobs, jobs_per_sec=jobs / seconds if seconds else 0.0)
+            results[stage] = stats
+        return results, state
+
+def bench(n, args):
+    tracing.enable()
+    results, state = run_pipeline(n, args)
+    spans = tracing.disable().spans
+    if not args.no_memory:
+        memory, _ = run_pipeline(n, args, memory=True)
+        for stage, stats in memory.items():
+            results[stage]["peak_mb"] = stats["peak_mb"]
+    summary = tracing.summarize(spans)
+    inner = {name: {"p50_ms": summary[name]["p50_ms"], "p95_ms": summary[name]["p95_ms"],
+                    "count": summary[name]["count"]}
+             for name in INNER_SPANS if name in summary}
+    return {"jobs": state["_searched"], "stages": results, "spans": inner}
+
+def report(n, result):
+    print(f"\n=== {n} postings requested, {result['jobs']} found ===")
+    print(f"{'stage':<10} {'seconds':>9} {'jobs':>7} {'jobs/s':>10} {'peak MB':>9}")
+    for stage, stats in result["stages"].items():
+        peak = f"{stats['peak_mb']:9.1f}" if "peak_mb" in stats else f"{'-':>9}"
+        print(f"{stage:<10} {stats['seconds']:9.3f} {stats['jobs']:>7} {stats['jobs_per_sec']:10.1f} {peak}")
+    for name, stats in result["spans"].items():
+        print(f"  {name:<28} x{stats['count']:<6} p50 {stats['p50_ms']:8.2f}ms  p95 {stats['p95_ms']:8.2f}ms")
+
+def regressions(results, baseline, tolerance):
+    """Lists the stages that got slower or used more memory than the baseline allows."""
+    found = []
+    for size, result in results.items():
+        for stage, stats in result["stages"].items():
+            base = baseline.get(size, {}).get("stages", {}).get(stage)
+            if base is None:
+                continue
+            if stats["seconds"] > base["seconds"] * (1 + tolerance) and stats["seconds"] - base["seconds"] > NOISE_SECONDS:
+                found.append(f"{size} jobs / {stage}: {base['seconds']:.3f}s -> {stats['seconds']:.3f}s")
+            if "peak_mb" in stats and "peak_mb" in base and \
+                    stats["peak_mb"] > base["peak_mb"] * (1 + tolerance) and stats["peak_mb"] - base["peak_mb"] > NOISE_MB:
+                found.append(f"{size} jobs / {stage}: {base['peak_mb']:.1f}MB -> {stats['peak_mb']:.1f}MB peak")
+    return found
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline end-to-end pipeline benchmark.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 10000],
+                        help="corpus sizes to run (up to 100000)")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="seconds per fake LLM call")
+    parser.add_argument("--embed-latency", type=float, default=0.01, help="seconds per fake embeddings call")
+    parser.add_argument("--search-latency", type=float, default=0.1, help="seconds per fake job-board search")
+    parser.add_argument("--top-k", type=int, default=5, help="jobs the policy selects for RAG")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--save", metavar="PATH", help="write the results as JSON")
+    parser.add_argument("--baseline", metavar="PATH", help="compare with saved results; exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown, as a fraction")
+    args = parser.parse_args()
+
+    # Warm-up, so lazy imports are not charged to the first size
+    run_pipeline(10, args)
+
+    results = {}
+    for n in args.sizes:
+        results[str(n)] = bench(n, args)
+        report(n, results[str(n)])
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            found = regressions(results, json.load(f), args.tolerance)
+        print("\n" + ("\n".join(f"❌ Regression: {line}" for line in found) if found else "✅ No regressions."))
+        sys.exit(1 if found else 0)
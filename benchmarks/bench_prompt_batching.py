@@ -0,0 +1,110 @@
+# benchmarks/bench_prompt_batching.py
+# Requests and tokens per item for the LLM helpers in analysis_engine, sent
+# one item per request against packed into batch prompts, with a fake LLM
+# (fixed latency per request). A share of malformed batch answers can be
+# injected to measure what the split-and-retry fallback costs. Checks first
+# that a failing request only loses its own items and that unusable batch
+# answers are not cached.
+# Usage: python benchmarks/bench_prompt_batching.py [n_jobs] [batch_size] [malformed_share]
+import contextlib
+import io
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from benchmarks import fakes
+from benchmarks.synthetic import TITLES, make_jobs, make_resume
+from modules import analysis_engine, llm_cache, prompt_batching
+
+LLM_LATENCY = 0.2
+RATE_PER_SEC = 4  # requests per second the provider allows
+
+def run(task, batch_size, malformed):
+    llm, _, _ = fakes.install(tempfile.mkdtemp(), llm_latency=LLM_LATENCY)
+    llm.malformed = malformed
+    config.LLM_BATCH_SIZE = batch_size
+    config.LLM_RATE_PER_SEC = RATE_PER_SEC
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        n = task()
+    seconds = time.perf_counter() - start
+    return {"requests": llm.calls / n, "tokens": (llm.prompt_tokens + llm.completion_tokens) / n,
+            "seconds": seconds}
+
+class FlakyLLM:
+    """Upper-cases batch items; answers malformed JSON to any batch holding "poison"."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, prompt):
+        self.calls += 1
+        if "poison" in prompt:
+            return llm_cache.CachedResponse("Sorry, I cannot answer that.")
+        items = re.findall(r"--- ITEM (\d+) ---\n(\w+)", prompt)
+        return llm_cache.CachedResponse(json.dumps({i: text.upper() for i, text in items}))
+
+def single(item):
+    if item == "poison":
+        raise RuntimeError("provider error")
+    return item.upper()
+
+class RateLimitedLLM(FlakyLLM):
+    """FlakyLLM whose first request fails with a 429."""
+
+    def invoke(self, prompt):
+        if not self.calls:
+            self.calls += 1
+            raise RuntimeError("429 ResourceExhausted: quota exceeded")
+        return super().invoke(prompt)
+
+def check_fault_tolerance():
+    """Asserts that one failing item costs only itself and that unusable answers are not cached."""
+    flaky = FlakyLLM()
+    llm = llm_cache.CachedLLM(flaky, llm_cache.LLMCache())
+
+    def solve(items):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return prompt_batching.run_batched(llm, items, items, "Upper-case each item.", single)
+
+    assert solve(["alpha", "beta", "poison"]) == ["ALPHA", "BETA", None]
+    assert llm.cache.stats()["entries"] == 0, "a malformed batch answer was cached"
+    calls = flaky.calls
+    assert solve(["gamma", "delta"]) == ["GAMMA", "DELTA"] and flaky.calls == calls + 1
+    assert solve(["gamma", "delta"]) == ["GAMMA", "DELTA"] and flaky.calls == calls + 1, "a good answer was not cached"
+
+    # A rate limited batch is retried (with backoff), not given up on
+    limited = RateLimitedLLM()
+    with contextlib.redirect_stdout(io.StringIO()):
+        answers = prompt_batching.run_batched(limited, ["alpha", "beta"], ["alpha", "beta"], "Upper-case each item.",
+                                              single, backoff=0.01)
+    assert answers == ["ALPHA", "BETA"] and limited.calls == 2, "a 429 was not retried"
+    print("fault tolerance checks passed")
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    check_fault_tolerance()
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    malformed = float(sys.argv[3]) if len(sys.argv) > 3 else 0.1
+    resume_text = make_resume()
+    jobs = make_jobs(n)
+    jd_texts = [job['description'] for job in jobs]
+    queries = [f"{TITLES[i % len(TITLES)]} {i}" for i in range(n)]
+    tasks = {
+        "expand_job_titles": lambda: len(analysis_engine.expand_job_titles_many(queries)),
+        "resume_suggestions": lambda: len(analysis_engine.generate_suggestions_many(resume_text, jobs)),
+        "rate_match": lambda: len(analysis_engine.rate_matches_many(resume_text, jd_texts)),
+    }
+    print(f"{n} items per task, {LLM_LATENCY * 1000:.0f}ms per request, {RATE_PER_SEC} requests/s allowed")
+    print(f"{'task':<19} {'mode':<22} {'requests/item':>13} {'tokens/item':>12} {'seconds':>8}")
+    for name, task in tasks.items():
+        for label, size, share in [("unbatched", 1, 0.0), (f"batch {batch_size}", batch_size, 0.0),
+                                   (f"batch {batch_size}, {malformed:.0%} bad", batch_size, malformed)]:
+            stats = run(task, size, share)
+            print(f"{name:<19} {label:<22} {stats['requests']:>13.2f} {stats['tokens']:>12.0f} {stats['seconds']:>8.2f}")
@@ -0,0 +1,99 @@
+# benchmarks/bench_rag_prompt.py
+# Compares the prompt size of the old merged-knowledge-base RAG chain with the
+# per-document, per-job retrieval in rag_engine, then times a search limited
+# to the selected jobs as the long-lived index grows (and checks it finds the
+# same chunks as filtering a search over the whole index). Runs offline on
+# HashEmbeddings.
+# Usage: python benchmarks/bench_rag_prompt.py [n_selected_jobs] [indexed_jobs]
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_community.vectorstores import FAISS
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from benchmarks.synthetic import FILLER, SKILLS, make_jobs, make_resume
+from modules import embedding_store, rag_engine
+
+def long_description(job, rng):
+    """Pads a synthetic posting out to a realistic multi-section description."""
+    return "\n".join([
+        "About the role", job['description'],
+        "Responsibilities", " ".join(rng.choice(FILLER) for _ in range(12)),
+        "Requirements", " ".join(f"Hands-on experience with {s}." for s in rng.sample(SKILLS, 8)),
+        "Benefits", " ".join(rng.choice(FILLER) for _ in range(6)),
+    ])
+
+def old_prompt(resume_text, jds, job_title, backend):
+    """The prompt the merged knowledge base + RetrievalQA "stuff" chain used to send."""
+    knowledge_base_text = resume_text
+    for i, jd in enumerate(jds):
+        knowledge_base_text += f"\n\n--- JOB DESCRIPTION {i+1} ---\n{jd}"
+    docs = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=100).create_documents([knowledge_base_text])
+    store = FAISS.from_documents(docs, backend)
+    query = f"""
+    Based on the provided context (my resume and several job descriptions), 
+    give me a highly detailed, step-by-step plan to tailor my resume specifically 
+    for the role of '{job_title}'. 
+    """
+    context = "\n\n".join(doc.page_content for doc in store.similarity_search(query, k=4))
+    return rag_engine.PROMPT_TEMPLATE.format(context=context, question=query)
+
+def bench(n):
+    rng = random.Random(0)
+    jobs = make_jobs(n)
+    jds = [long_description(job, rng) for job in jobs]
+    resume_text = make_resume()
+    backend = embedding_store.HashEmbeddings()
+
+    with tempfile.TemporaryDirectory() as index_dir:
+        chain = rag_engine.create_rag_chain(resume_text, jds, embedding_backend=backend, index_dir=index_dir)
+        old = [rag_engine.estimate_tokens(old_prompt(resume_text, jds, job['title'], backend)) for job in jobs]
+        new = [rag_engine.estimate_tokens(rag_engine.build_rag_prompt(chain, job['title'], i))
+               for i, job in enumerate(jobs)]
+
+    print(f"{n} selected jobs | merged KB: {statistics.mean(old):6.0f} tokens/prompt | "
+          f"per-job retrieval: {statistics.mean(new):6.0f} tokens/prompt | "
+          f"-{100 * (1 - sum(new) / sum(old)):.0f}%")
+
+def bench_search(n, history, queries=20):
+    """Search latency for n selected jobs in an index that also holds `history` older jobs."""
+    rng = random.Random(1)
+    jobs = make_jobs(history)
+    backend = embedding_store.HashEmbeddings()
+    with tempfile.TemporaryDirectory() as index_dir:
+        index = embedding_store.VectorIndex(os.path.join(index_dir, "index"), backend)
+        for i, job in enumerate(jobs):
+            text = long_description(job, rng)
+            index.add_source(f"jd-{i}", [text[start:start + 300] for start in range(0, len(text), 300)])
+        selected = [f"jd-{i}" for i in rng.sample(range(history), n)]
+        titles = [jobs[i]['title'] for i in range(queries)]
+
+        def filtered(query):
+            # What search() did before: fetch the whole index, filter in Python
+            return index.store.similarity_search_by_vector(
+                backend.embed_query(query), k=4, filter={"source_id": selected}, fetch_k=index.store.index.ntotal)
+
+        for title in titles:
+            found = [doc.metadata["chunk_id"] for doc in index.search(title, selected)]
+            assert found == [doc.metadata["chunk_id"] for doc in filtered(title)], "restricted search disagrees"
+            assert all(doc.metadata["source_id"] in selected for doc in index.search(title, selected))
+        timings = {}
+        for label, search in [("filter whole index", filtered), ("selected chunks", lambda q: index.search(q, selected))]:
+            start = time.perf_counter()
+            for title in titles:
+                search(title)
+            timings[label] = (time.perf_counter() - start) / queries * 1000
+    print(f"{n} selected of {history} indexed jobs ({index.store.index.ntotal} chunks) | " + " | ".join(
+        f"{label}: {ms:.2f}ms/query" for label, ms in timings.items()))
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    bench(n)
+    for history in ([int(sys.argv[2])] if len(sys.argv) > 2 else [100, 1000, 5000]):
+        bench_search(n, history)
@@ -0,0 +1,52 @@
+# benchmarks/bench_ranking.py
+# Two-stage ranking on synthetic corpora with fake backends: reranking every
+# job against reranking only the TF-IDF top K, for the embedding and the LLM
+# reranker. Reports wall time, reranker calls and how many of the full
+# reranking's top 10 the two-stage ranking also puts in its top 10.
+# Usage: python benchmarks/bench_ranking.py [sizes...]
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import fakes
+from benchmarks.synthetic import make_jobs, make_resume
+from modules import job_index, ranking
+
+EMBED_LATENCY = 0.05  # per embeddings request (a batch of up to 32 texts)
+LLM_LATENCY = 0.2     # per rating
+TOP_K = {"embedding": 50, "llm": 20}
+# Reranking every job with the LLM is only timed up to this many jobs
+LLM_FULL_LIMIT = 200
+
+def timed(resume_text, keys, index, name, k, budget=1e9):
+    llm, embeddings, _ = fakes.install(tempfile.mkdtemp(), llm_latency=LLM_LATENCY, embed_latency=EMBED_LATENCY)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = ranking.rank_jobs(resume_text, keys, index, top_k_jobs=k, budget=budget, reranker=name)
+    return result, time.perf_counter() - start, llm.calls + embeddings.calls
+
+def bench(n):
+    jobs = make_jobs(n)
+    resume_text = make_resume()
+    index = job_index.JobIndex()
+    keys = index.add_jobs(jobs)
+    for name, k in TOP_K.items():
+        two_stage, seconds, calls = timed(resume_text, keys, index, name, k)
+        line = f"{n:>6} jobs | {name:<9} top {k:<3} {seconds:7.2f}s {calls:>5} calls"
+        if name == "embedding" or n <= LLM_FULL_LIMIT:
+            full, full_seconds, full_calls = timed(resume_text, keys, index, name, n)
+            overlap = len(set(full.job_ids[:10]) & set(two_stage.job_ids[:10]))
+            line += f" | rerank all {full_seconds:7.2f}s {full_calls:>5} calls | top-10 overlap {overlap}/10"
+        print(line)
+    # A budget caps the LLM reranker however large K is
+    budgeted, seconds, calls = timed(resume_text, keys, index, "llm", n, budget=1.0)
+    print(f"{n:>6} jobs | llm       top {n}, 1s budget: {seconds:5.2f}s, {len(budgeted.rerank_scores)} jobs reranked")
+
+if __name__ == "__main__":
+    for n in [int(arg) for arg in sys.argv[1:]] or [200, 2000, 10000]:
+        bench(n)
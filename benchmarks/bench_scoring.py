@@ -0,0 +1,50 @@
+# benchmarks/bench_scoring.py
+# Compares per-pair TF-IDF scoring with the batched one-vs-many scorer. Both
+# arms only score: the per-pair arm is the TF-IDF fit and cosine that
+# compare_resume_to_jd does, without the skill gaps it also computes.
+# Usage: python benchmarks/bench_scoring.py [sizes...]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_jobs, make_resume
+from modules import analysis_engine
+
+# The per-pair loop refits a vectorizer for every job, so it is only timed
+# on a sample and extrapolated for the larger corpora.
+PAIRWISE_SAMPLE = 1000
+
+def pairwise_score(resume_text, jd_text):
+    """The scoring half of compare_resume_to_jd: a vectorizer fitted on the two texts."""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.metrics.pairwise import cosine_similarity
+    tfidf_matrix = TfidfVectorizer(stop_words='english').fit_transform([resume_text, jd_text])
+    return round(cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0], 2)
+
+def bench(n):
+    resume_text = make_resume()
+    jd_texts = [job['description'] for job in make_jobs(n)]
+
+    start = time.perf_counter()
+    analysis_engine.score_jobs(resume_text, jd_texts)
+    batched = time.perf_counter() - start
+
+    sample = jd_texts[:PAIRWISE_SAMPLE]
+    start = time.perf_counter()
+    for jd in sample:
+        pairwise_score(resume_text, jd)
+    pairwise = (time.perf_counter() - start) * n / len(sample)
+
+    print(f"{n:>8} jobs | batched {batched:8.3f}s ({n / batched:>10.0f} jobs/s) | "
+          f"per-pair ~{pairwise:8.3f}s ({n / pairwise:>8.0f} jobs/s) | x{pairwise / batched:.0f}")
+
+if __name__ == "__main__":
+    sizes = [int(s) for s in sys.argv[1:]] or [1_000, 10_000, 100_000]
+    # sklearn is imported on first use; keep that import out of the first timing
+    analysis_engine.score_jobs(make_resume(), [job['description'] for job in make_jobs(10)])
+    jd = make_jobs(1)[0]['description']
+    assert pairwise_score(make_resume(), jd) == analysis_engine.compare_resume_to_jd(make_resume(), jd)[0]
+    for n in sizes:
+        bench(n)
@@ -0,0 +1,99 @@
+# benchmarks/bench_search.py
+# Streams a search across several HTML sources served by the local fixture
+# server, each with a different response delay, and compares time-to-first-
+# posting and total time with running the same searches one after another.
+# Checks first that postings are parsed, that a posting found by several
+# searches is yielded once, that a failing source is skipped, and that a
+# shared search that failed is tried again by the next caller.
+# Usage: python benchmarks/bench_search.py [n_titles]
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fixture_server import FixtureServer
+from modules import job_searcher
+
+SOURCE_DELAYS_MS = {"fast-board": 50, "medium-board": 200, "slow-board": 800}
+
+def make_sources(server):
+    return [
+        job_searcher.HTMLSource(
+            name, server.base_url + "/jobs.html?q={title}&l={location}&delay=" + str(delay),
+            card=".job-card", title=".job-title", company=".company", url="a.job-link",
+            description=".summary", location=".job-location",
+        )
+        for name, delay in SOURCE_DELAYS_MS.items()
+    ]
+
+def check_behaviour(server, sources):
+    """Asserts what stream_jobs yields from the fixture board, with one source failing."""
+    broken = job_searcher.HTMLSource("broken-board", server.base_url + "/missing.html?q={title}",
+                                     card=".job-card", title=".job-title", company=".company", url="a.job-link")
+
+    async def collect():
+        return [job async for job in job_searcher.stream_jobs(["Data Scientist", "ML Engineer"], "Remote",
+                                                              sources + [broken])]
+
+    page = sources[0].search("Data Scientist", "Remote")
+    assert page and all(job['title'] and job['company'] and job['url'].startswith(server.base_url) for job in page)
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        jobs = asyncio.run(collect())
+    # Every source and title serves the same page: each posting must come out once
+    urls = [job['url'] for job in jobs]
+    assert len(urls) == len(set(urls)) == len({job['url'] for job in page}), "a repeated URL was yielded twice"
+    assert "broken-board" in log.getvalue(), "the failing source was not reported"
+
+    # A shared search that failed is not cached: the next caller searches again
+    outcomes = [ConnectionError("board unreachable"), page]
+
+    class FlakySource(job_searcher.JobSource):
+        name = "flaky-board"
+
+        def search(self, job_title, location):
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+    shared = job_searcher.SharedSource(FlakySource())
+    try:
+        shared.search("Data Scientist", "Remote")
+    except ConnectionError:
+        pass
+    assert shared.search("Data Scientist", "Remote") == page and shared.misses == 2, "a failed search was cached"
+    assert shared.search("data scientist ", "remote") == page and shared.hits == 1
+    print("search checks passed")
+
+async def streamed(titles, sources):
+    start = time.perf_counter()
+    first, count = None, 0
+    async for _ in job_searcher.stream_jobs(titles, "Remote", sources):
+        if first is None:
+            first = time.perf_counter() - start
+        count += 1
+    return first, time.perf_counter() - start, count
+
+def sequential(titles, sources):
+    start = time.perf_counter()
+    for title in titles:
+        for source in sources:
+            source.search(title, "Remote")
+    return time.perf_counter() - start
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 6
+    titles = [f"Data Role {i}" for i in range(n)]
+    with FixtureServer() as server:
+        sources = make_sources(server)
+        check_behaviour(server, sources)
+        first, total, count = asyncio.run(streamed(titles, sources))
+        one_by_one = sequential(titles, sources)
+
+    print(f"{n} titles x {len(SOURCE_DELAYS_MS)} sources | streamed: first posting after {first * 1000:.0f} ms, "
+          f"all {count} after {total * 1000:.0f} ms | sequential: {one_by_one * 1000:.0f} ms")
@@ -0,0 +1,81 @@
+# benchmarks/bench_skills.py
+# Skill extraction over a synthetic job corpus: one regex search per alias
+# (what a naive gazetteer does) against the Aho-Corasick matcher, then the
+# per-job skill gaps with a cold and a warm skill cache. Checks first what
+# the matcher extracts and what the gaps report on hand-written texts.
+# Usage: python benchmarks/bench_skills.py [sizes...]
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_jobs, make_resume
+from modules import skills
+
+def regex_extract(patterns, text):
+    text = text.lower()
+    return sorted({skill for skill, pattern in patterns if pattern.search(text)})
+
+def check_extraction():
+    """Asserts extraction, skill gaps and cache versioning on hand-written texts."""
+    matcher = skills.get_matcher()
+    # Aliases map to canonical names; matches respect word boundaries and line breaks
+    assert matcher.extract("Strong JavaScript, sklearn and PL/SQL; Power\nBI dashboards.") == \
+        ["JavaScript", "Power BI", "SQL", "scikit-learn"]
+    assert "Java" not in matcher.extract("javascript developer")
+    assert matcher.extract("We use Python.") == ["Python"] and matcher.extract("pythonic code") == []
+    assert matcher.extract("C++ and c++") == ["C++"]
+    # Skills named like plain words are only found in unambiguous forms
+    assert matcher.extract("Go excel at forecasting: spark experimentation, react to containers, r&d.") == []
+    assert matcher.extract("Golang, MS Excel, Apache Spark, ReactJS and R programming") == \
+        ["Excel", "Go", "R", "React", "Spark"]
+
+    gap = skills.skill_gap(["Python", "SQL"], ["Python", "Docker", "SQL", "Kubernetes"])
+    assert gap["matched"] == ["Python", "SQL"] and gap["missing"] == ["Docker", "Kubernetes"]
+    assert gap["coverage"] == 0.5
+    gaps = [skills.skill_gap([], ["Docker"]), skills.skill_gap([], ["Docker", "Kubernetes"])]
+    assert skills.aggregate_gaps(gaps, weights=[0.5, 2.0]) == [("Docker", 2.5, 2), ("Kubernetes", 2.0, 1)]
+
+    # A changed taxonomy does not reuse skill sets cached under the old one
+    cache = skills.SkillCache()
+    assert skills.extract_skills_many(["Polars and Python"], matcher, cache) == [["Python"]]
+    extended = skills.SkillMatcher({**skills.TAXONOMY, "Polars": ["polars"]})
+    assert skills.extract_skills_many(["Polars and Python"], extended, cache) == [["Polars", "Python"]]
+    print("extraction checks passed")
+
+def bench(n):
+    texts = [job['description'] for job in make_jobs(n)]
+    resume_text = make_resume()
+    matcher = skills.get_matcher()
+    patterns = [(skill, re.compile(r"(?<!\w)" + re.escape(alias.lower()) + r"(?!\w)"))
+                for skill, aliases in skills.TAXONOMY.items() for alias in aliases]
+
+    start = time.perf_counter()
+    expected = [regex_extract(patterns, text) for text in texts]
+    regex = time.perf_counter() - start
+
+    start = time.perf_counter()
+    found = [matcher.extract(text) for text in texts]
+    automaton = time.perf_counter() - start
+    assert found == expected, "matchers disagree"
+
+    cache = skills.SkillCache()
+    start = time.perf_counter()
+    skills.extract_skills_many(texts, cache=cache)
+    cold = time.perf_counter() - start
+    start = time.perf_counter()
+    resume_skills = skills.extract_skills(resume_text)
+    gaps = [skills.skill_gap(resume_skills, job_skills) for job_skills in skills.extract_skills_many(texts, cache=cache)]
+    warm = time.perf_counter() - start
+
+    top = ", ".join(skill for skill, _, _ in skills.aggregate_gaps(gaps, top_n=3))
+    print(f"{n:>7} jobs | regex per alias {regex:7.3f}s | automaton {automaton:7.3f}s "
+          f"({regex / automaton:5.1f}x) | gaps cold {cold:7.3f}s, warm {warm:7.3f}s | top missing: {top}")
+
+if __name__ == "__main__":
+    check_extraction()
+    print(f"{sum(len(a) for a in skills.TAXONOMY.values())} aliases, {len(skills.TAXONOMY)} skills")
+    for n in [int(arg) for arg in sys.argv[1:]] or [100, 1000, 10000]:
+        bench(n)
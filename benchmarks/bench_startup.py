@@ -0,0 +1,61 @@
+# benchmarks/bench_startup.py
+# Measures how long it takes to import the CLI entry point (and a few modules
+# on their own) with `python -X importtime`, and fails if the entry point or
+# a module that defers its heavy imports regresses.
+# Usage: python benchmarks/bench_startup.py [--max-ms 300] [modules...]
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_MODULES = ["multi_agent_main", "modules.input_handler", "modules.analysis_engine", "modules.rag_engine"]
+# Modules whose heavy dependencies are imported lazily; each must import within --max-ms
+LIMITED_MODULES = ["multi_agent_main", "modules.rag_engine"]
+
+def import_times(module):
+    """Returns [(cumulative_us, self_us, name)] for every import made by `import module`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times.append((int(cumulative_us), int(self_us), name.rstrip()))
+    return times
+
+def depth(name):
+    return len(name) - len(name.lstrip())
+
+def report(module, top=5):
+    """Prints the import time of module and its slowest dependencies. Returns the total in ms."""
+    times = import_times(module)
+    position = max(i for i, t in enumerate(times) if t[2].strip() == module)
+    entry = times[position]
+    # importtime lists a module's own imports just before it, indented deeper
+    start = position
+    while start > 0 and depth(times[start - 1][2]) > depth(entry[2]):
+        start -= 1
+    total_ms = entry[0] / 1000
+    print(f"{module}: {total_ms:.1f} ms")
+    for cumulative_us, _, name in sorted(times[start:position], reverse=True)[:top]:
+        print(f"    {cumulative_us / 1000:8.1f} ms  {name.strip()}")
+    return total_ms
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--max-ms", type=float, default=300,
+                        help="fail if importing the CLI entry point or rag_engine takes longer than this")
+    args = parser.parse_args()
+
+    totals = {module: report(module) for module in args.modules}
+    slow = [module for module in LIMITED_MODULES if totals.get(module, 0) > args.max_ms]
+    for module in slow:
+        print(f"❌ {module} imports in {totals[module]:.1f} ms (limit {args.max_ms:.0f} ms)")
+    if slow:
+        sys.exit(1)
+    print("✅ Startup time within limit.")
@@ -0,0 +1,59 @@
+# benchmarks/bench_tracing.py
+# Measures what instrumentation costs per call with tracing off and on, then
+# traces an offline batch run end to end and prints the per-stage summary.
+# Usage: python benchmarks/bench_tracing.py [n_calls] [n_candidates]
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import bench_batch, fakes
+from modules import tracing
+
+def bare():
+    return None
+
+@tracing.traced("bench.traced")
+def traced():
+    return None
+
+def with_span():
+    with tracing.span("bench.span", attr=1) as span:
+        span.set(other=2)
+
+def per_call_ns(fn, n):
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - start) / n * 1e9
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    candidates = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+
+    base = per_call_ns(bare, n)
+    off = (per_call_ns(traced, n), per_call_ns(with_span, n))
+    tracing.enable()  # in memory only
+    on = (per_call_ns(traced, n), per_call_ns(with_span, n))
+    tracing.disable()
+    print(f"plain call {base:6.0f}ns | tracing off: traced() {off[0] - base:6.0f}ns, span() {off[1] - base:6.0f}ns extra | "
+          f"tracing on: traced() {on[0] - base:6.0f}ns, span() {on[1] - base:6.0f}ns extra")
+
+    with tempfile.TemporaryDirectory() as directory:
+        fakes.install(directory)
+        batch = bench_batch.write_candidates(directory, candidates)
+
+        from multi_agent_main import get_app
+        trace_path = os.path.join(directory, "trace.jsonl")
+        tracing.enable(trace_path)
+        with contextlib.redirect_stdout(io.StringIO()):
+            bench_batch.run(get_app(), batch, 2, directory)
+        tracer = tracing.disable()
+        with open(trace_path, encoding="utf-8") as f:
+            lines = sum(1 for _ in f)
+    print(f"\n{lines} spans written for {candidates} candidates")
+    tracing.print_summary(tracer.spans)
@@ -0,0 +1,119 @@
+# benchmarks/fakes.py
+# Deterministic stand-ins for Gemini, the Gemini embeddings and the job
+# boards, each with a configurable latency, so the pipeline can be benchmarked
+# on a plain Linux box with no network, API key or browser.
+import hashlib
+import json
+import os
+import re
+import time
+import zlib
+
+import config
+from benchmarks.synthetic import TITLES, make_jobs
+from modules import analysis_engine, embedding_store, job_searcher, llm_cache, rag_engine
+
+class FakeLLM:
+    """
+    Answers any prompt after `latency` seconds. Title-expansion prompts get
+    `n_titles` related titles, match ratings a number from 0 to 100; everything
+    else gets a short answer derived from the prompt, so identical prompts get
+    identical answers. Batch prompts (prompt_batching) get a JSON object with
+    an answer per item, except for the share `malformed` of them, which get
+    truncated JSON. Counts requests and estimated tokens.
+    """
+
+    def __init__(self, latency=0.0, n_titles=3, model="fake-llm", malformed=0.0):
+        self.latency = latency
+        self.n_titles = n_titles
+        self.model = model
+        self.malformed = malformed
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    def _answer(self, prompt, digest, batched):
+        if "similar or related job titles" in prompt:
+            titles = TITLES[1:1 + self.n_titles]
+            return titles if batched else ", ".join(titles)
+        if "Rate how well" in prompt:
+            return int(digest, 16) % 101
+        return f"1. Lead with your most relevant project. ({digest})"
+
+    def invoke(self, prompt, **kwargs):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        digest = hashlib.sha1(prompt.encode("utf-8")).hexdigest()[:8]
+        items = re.findall(r"^--- ITEM (\d+) ---\n(.*?)(?=^--- ITEM |\Z)", prompt, re.MULTILINE | re.DOTALL)
+        if items:
+            answers = {}
+            for item_id, text in items:
+                item_digest = hashlib.sha1(text.encode("utf-8")).hexdigest()[:8]
+                answers[item_id] = self._answer(prompt, item_digest, batched=True)
+            content = json.dumps(answers)
+            if int(digest, 16) % 1000 < self.malformed * 1000:
+                content = content[:len(content) // 2]
+        else:
+            content = str(self._answer(prompt, digest, batched=False))
+        self.prompt_tokens += llm_cache.estimate_tokens(prompt)
+        self.completion_tokens += llm_cache.estimate_tokens(content)
+        return llm_cache.CachedResponse(content)
+
+class FakeEmbeddings(embedding_store.HashEmbeddings):
+    """HashEmbeddings that take `latency` seconds per call, like a remote embeddings API."""
+
+    def __init__(self, latency=0.0, size=256):
+        super().__init__(size)
+        self.latency = latency
+        self.calls = 0
+
+    def embed_documents(self, texts):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return super().embed_documents(texts)
+
+    def embed_query(self, text):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return super().embed_query(text)
+
+class SyntheticSource(job_searcher.JobSource):
+    """
+    Job board returning `per_search` synthetic postings per title after
+    `latency` seconds. The same title always returns the same postings.
+    """
+    name = "synthetic"
+
+    def __init__(self, per_search=25, latency=0.0):
+        self.per_search = per_search
+        self.latency = latency
+
+    def search(self, job_title, location):
+        if self.latency:
+            time.sleep(self.latency)
+        return make_jobs(self.per_search, location, seed=zlib.crc32(job_title.encode("utf-8")))
+
+def install(directory, llm_latency=0.0, embed_latency=0.0, search_latency=0.0, per_search=25):
+    """
+    Points every cache and index at `directory` and plugs the fakes into
+    analysis_engine, rag_engine and job_searcher (wrapped in the real caches,
+    as the production clients are). Returns (llm, embeddings, source).
+    """
+    for name, filename in [("JOB_INDEX_DIR", "job_index"), ("RAG_INDEX_DIR", "rag_index"),
+                           ("DEDUP_DB_PATH", "seen.sqlite3"), ("CHECKPOINT_DB_PATH", "checkpoints.sqlite3"),
+                           ("RESUME_CACHE_PATH", "resumes.sqlite3"), ("LLM_CACHE_PATH", "llm.sqlite3"),
+                           ("EMBEDDING_CACHE_PATH", "embeddings.sqlite3"),
+                           ("SKILL_CACHE_PATH", "skills.sqlite3"), ("APPLY_QUEUE_PATH", "applications.sqlite3")]:
+        setattr(config, name, os.path.join(directory, filename))
+    config.LLM_RATE_PER_SEC = 1000
+
+    llm = FakeLLM(llm_latency)
+    embeddings = FakeEmbeddings(embed_latency)
+    source = SyntheticSource(per_search, search_latency)
+    analysis_engine.llm = rag_engine.llm = llm_cache.CachedLLM(llm, llm_cache.LLMCache())
+    rag_engine.embeddings = embedding_store.CachedEmbeddings(embeddings, embedding_store.EmbeddingCache())
+    job_searcher.SOURCES = [source]
+    return llm, embeddings, source
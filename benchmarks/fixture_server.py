@@ -0,0 +1,55 @@
+# benchmarks/fixture_server.py
+# Local HTTP server that stands in for job sites in the browser benchmarks.
+# Serves the pages in benchmarks/fixtures; add ?delay=<ms> to any URL to
+# make the server wait that long before responding.
+import functools
+import http.server
+import os
+import threading
+import time
+from urllib.parse import parse_qs, urlparse
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+class _Handler(http.server.SimpleHTTPRequestHandler):
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        delay_ms = int(query.get("delay", ["0"])[0])
+        if delay_ms:
+            time.sleep(delay_ms / 1000)
+        super().do_GET()
+
+    def log_message(self, *args):
+        pass
+
+class FixtureServer:
+    """Runs the fixture server on a background thread. Use as a context manager."""
+
+    def __init__(self, port=0):
+        handler = functools.partial(_Handler, directory=FIXTURES_DIR)
+        self.httpd = http.server.ThreadingHTTPServer(("127.0.0.1", port), handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def url(self, page, **params):
+        query = "&".join(f"{key}={value}" for key, value in params.items())
+        return f"{self.base_url}/{page}" + (f"?{query}" if query else "")
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+if __name__ == "__main__":
+    with FixtureServer(8765) as server:
+        print(f"Serving {FIXTURES_DIR} at {server.base_url} (Ctrl+C to stop)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,42 @@
+# benchmarks/synthetic.py
+# Deterministic synthetic job postings for the offline benchmarks.
+import random
+
+TITLES = ["Data Scientist", "Machine Learning Engineer", "Gen AI Engineer", "Data Analyst",
+          "Backend Engineer", "MLOps Engineer", "Research Scientist", "Data Engineer"]
+COMPANIES = ["Innovate AI Inc.", "Tech Solutions LLC", "Future Forward", "DataWorks",
+             "Cloudline", "Neural Labs", "Quantix", "BrightPath"]
+SKILLS = ["Python", "TensorFlow", "PyTorch", "scikit-learn", "SQL", "Spark", "AWS", "GCP",
+          "Azure", "Docker", "Kubernetes", "NLP", "computer vision", "LLMs", "statistics",
+          "Airflow", "pandas", "deep learning", "A/B testing", "Tableau"]
+FILLER = ["You will develop models to solve complex business problems.",
+          "This role involves deploying models to production.",
+          "Experience with cloud platforms is a huge plus.",
+          "You will work closely with product and engineering teams.",
+          "We value clear communication and ownership.",
+          "Mentoring junior colleagues is part of the job."]
+
+def make_jobs(n, location="Remote", seed=0):
+    """Returns n synthetic job dicts shaped like the ones job_searcher produces."""
+    rng = random.Random(seed)
+    jobs = []
+    for i in range(n):
+        skills = rng.sample(SKILLS, 5)
+        description = (f"We are seeking a {rng.choice(TITLES)} with experience in "
+                       f"{', '.join(skills[:-1])} and {skills[-1]}. "
+                       + " ".join(rng.sample(FILLER, 3)))
+        jobs.append({
+            "title": rng.choice(TITLES),
+            "company": rng.choice(COMPANIES),
+            "location": location,
+            "url": f"https://jobs.example.com/view/{seed}-{i}",
+            "description": description,
+        })
+    return jobs
+
+def make_resume(seed=0):
+    """Returns a short synthetic resume text."""
+    rng = random.Random(seed)
+    skills = rng.sample(SKILLS, 8)
+    return (f"Experienced {rng.choice(TITLES)} skilled in {', '.join(skills)}. "
+            "Built and deployed machine learning models to production on cloud platforms.")
@@ -10,3 +10,79 @@ GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 # User Credentials
 LINKEDIN_EMAIL = os.getenv("LINKEDIN_EMAIL")
 LINKEDIN_PASSWORD = os.getenv("LINKEDIN_PASSWORD")
+
+# Local caches
+JOB_INDEX_DIR = os.getenv("JOB_INDEX_DIR", os.path.join(".cache", "job_index"))
+
+# LLM response cache (TTL in seconds)
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(".cache", "llm_cache.sqlite3"))
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", 7 * 24 * 3600))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", 10000))
+
+# Concurrent LLM calls
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", 4))
+LLM_RATE_PER_SEC = float(os.getenv("LLM_RATE_PER_SEC", 1))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", 5))
+LLM_BACKOFF_SEC = float(os.getenv("LLM_BACKOFF_SEC", 2))
+
+# Prompt batching: up to LLM_BATCH_SIZE items of the same task per request
+# (1 turns batching off), within LLM_BATCH_TOKENS estimated prompt tokens
+LLM_BATCH_SIZE = int(os.getenv("LLM_BATCH_SIZE", 8))
+LLM_BATCH_TOKENS = int(os.getenv("LLM_BATCH_TOKENS", 6000))
+
+# RAG embeddings: vector cache and long-lived FAISS index
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", os.path.join(".cache", "embeddings.sqlite3"))
+RAG_INDEX_DIR = os.getenv("RAG_INDEX_DIR", os.path.join(".cache", "rag_index"))
+RAG_TOP_K = int(os.getenv("RAG_TOP_K", 4))
+RAG_CONTEXT_TOKENS = int(os.getenv("RAG_CONTEXT_TOKENS", 1200))
+
+# Browser sessions for the application automator
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", 2))
+BROWSER_MAX_USES = int(os.getenv("BROWSER_MAX_USES", 20))
+STEP_TIMEOUT = float(os.getenv("STEP_TIMEOUT", 15))  # seconds each application step may wait
+
+# Job search
+SEARCH_CONCURRENCY = int(os.getenv("SEARCH_CONCURRENCY", 8))
+SEARCH_TIMEOUT = float(os.getenv("SEARCH_TIMEOUT", 10))
+
+# Deduplication: postings whose descriptions are at least this similar count as the same job
+DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", 0.8))
+# ...and this similar when either posting names no company, since nothing else confirms the match
+DEDUP_THRESHOLD_NO_COMPANY = float(os.getenv("DEDUP_THRESHOLD_NO_COMPANY", 0.95))
+DEDUP_MIN_SHINGLES = int(os.getenv("DEDUP_MIN_SHINGLES", 10))  # shorter descriptions are only deduped by URL
+DEDUP_DB_PATH = os.getenv("DEDUP_DB_PATH", os.path.join(".cache", "seen_jobs.sqlite3"))
+
+# Parsed resumes, cached by content hash; batches are parsed across this many processes
+RESUME_CACHE_PATH = os.getenv("RESUME_CACHE_PATH", os.path.join(".cache", "resumes.sqlite3"))
+RESUME_PARSE_WORKERS = int(os.getenv("RESUME_PARSE_WORKERS", os.cpu_count() or 1))
+
+# Batch mode: candidates run through the graph at once
+BATCH_WORKERS = int(os.getenv("BATCH_WORKERS", 4))
+
+# Workflow checkpoints, so interrupted runs can be resumed
+CHECKPOINT_DB_PATH = os.getenv("CHECKPOINT_DB_PATH", os.path.join(".cache", "checkpoints.sqlite3"))
+
+# Tracing: set TRACE_PATH (or pass --trace) to record spans as JSON lines
+TRACE_PATH = os.getenv("TRACE_PATH")
+TRACE_DEFAULT_PATH = os.path.join(".cache", "traces.jsonl")
+
+# Skill extraction: skill sets of job descriptions are cached by content hash.
+# SKILL_TAXONOMY_PATH may name a JSON file of {skill: [aliases]} extending the built-in taxonomy
+# (only the aliases are matched, so list the skill's own name among them if it should be).
+SKILL_CACHE_PATH = os.getenv("SKILL_CACHE_PATH", os.path.join(".cache", "skills.sqlite3"))
+SKILL_TAXONOMY_PATH = os.getenv("SKILL_TAXONOMY_PATH")
+
+# Two-stage ranking: TF-IDF picks the top RANK_TOP_K jobs, which RANK_RERANKER
+# ("embedding", "llm" or "none") reorders within RANK_BUDGET_SEC seconds
+RANK_TOP_K = int(os.getenv("RANK_TOP_K", 50))
+RANK_BUDGET_SEC = float(os.getenv("RANK_BUDGET_SEC", 10))
+RANK_RERANKER = os.getenv("RANK_RERANKER", "embedding")
+
+# Application queue: durable, with retries and per-site concurrency limits
+APPLY_QUEUE_PATH = os.getenv("APPLY_QUEUE_PATH", os.path.join(".cache", "applications.sqlite3"))
+APPLY_WORKERS = int(os.getenv("APPLY_WORKERS", BROWSER_POOL_SIZE))
+APPLY_PER_DOMAIN = int(os.getenv("APPLY_PER_DOMAIN", 2))  # applications running at once against one site
+APPLY_MAX_ATTEMPTS = int(os.getenv("APPLY_MAX_ATTEMPTS", 4))
+APPLY_BACKOFF_SEC = float(os.getenv("APPLY_BACKOFF_SEC", 30))  # first retry delay, doubled each time
+APPLY_LEASE_SEC = float(os.getenv("APPLY_LEASE_SEC", 600))  # after this, a running application counts as abandoned
+APPLY_WAIT_SEC = float(os.getenv("APPLY_WAIT_SEC", 600))  # how long the applicator waits for its results
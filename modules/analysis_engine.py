@@ -1,43 +1,151 @@
 # modules/analysis_engine.py
-from langchain_google_genai import ChatGoogleGenerativeAI
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+# langchain and scikit-learn take seconds to import, so they are only
+# imported by the functions that use them.
+import re
+
+import numpy as np
 import config
+from modules import llm_cache, async_runner, tracing
+
+# The LLM client is created on first use by get_llm(). Assign a stand-in
+# (anything with invoke()) to replace it, e.g. in benchmarks.
+llm = None
 
-# Initialize the LLM
-llm = ChatGoogleGenerativeAI(model="gemini-pro", google_api_key=config.GOOGLE_API_KEY)
+def get_llm():
+    """Returns the LLM, creating it on first use. Identical prompts are answered from the local response cache."""
+    global llm
+    if llm is None:
+        from langchain_google_genai import ChatGoogleGenerativeAI
+        llm = llm_cache.CachedLLM(
+            ChatGoogleGenerativeAI(model="gemini-pro", google_api_key=config.GOOGLE_API_KEY),
+            llm_cache.get_default_cache(),
+        )
+    return llm
 
+@tracing.traced("analysis.expand_job_titles")
 def expand_job_titles(desired_job):
     """Uses LLM to find related job titles."""
     prompt = f"""
     Given the desired job title "{desired_job}", list 5 similar or related job titles.
     Return the list as a comma-separated string. For example: Job A, Job B, Job C
     """
-    response = llm.invoke(prompt)
+    response = get_llm().invoke(prompt)
     expanded_titles = [title.strip() for title in response.content.split(',')]
     return [desired_job] + expanded_titles
 
-def compare_resume_to_jd(resume_text, jd_text):
-    """Compares resume to job description using TF-IDF and Cosine Similarity."""
+def _titles(answer):
+    """A batch answer for one query: a list of titles (or a comma-separated string)."""
+    if isinstance(answer, str):
+        answer = answer.split(',')
+    if not isinstance(answer, list):
+        raise TypeError(f"expected a list of titles, got {type(answer).__name__}")
+    return [str(title).strip() for title in answer if str(title).strip()]
+
+def expand_job_titles_many(desired_jobs, **kwargs):
+    """
+    expand_job_titles for many queries, packed into as few LLM requests as
+    config.LLM_BATCH_SIZE / LLM_BATCH_TOKENS allow. Returns one title list per
+    query, in order, each starting with the query itself.
+    """
+    from modules import prompt_batching
+    related = prompt_batching.run_batched(
+        get_llm(), desired_jobs, desired_jobs,
+        instruction="For each desired job title below, list 5 similar or related job titles.",
+        answer_format=" (a list of 5 job title strings)",
+        single=lambda desired_job: expand_job_titles(desired_job)[1:], convert=_titles, **kwargs,
+    )
+    return [[desired_job] + (titles or []) for desired_job, titles in zip(desired_jobs, related)]
+
+def compare_resume_to_jd(resume_text, jd_text, index=None):
+    """
+    Compares resume to job description using TF-IDF and Cosine Similarity.
+    If a job_index.JobIndex is given, IDF weights come from the stored corpus
+    instead of from the two documents alone. Returns (score, missing skills),
+    the skills the description asks for that the resume does not mention.
+    """
     if not resume_text or not jd_text:
         return 0, []
 
+    missing_skills = skill_gaps(resume_text, [jd_text])[0]["missing"]
+    if index is not None and len(index):
+        return round(float(index.score_texts(resume_text, [jd_text])[0]), 2), missing_skills
+
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.metrics.pairwise import cosine_similarity
+
     texts = [resume_text, jd_text]
     vectorizer = TfidfVectorizer(stop_words='english')
     tfidf_matrix = vectorizer.fit_transform(texts)
     
     # Calculate cosine similarity
     similarity_score = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
-    
-    # Simple skill gap analysis (can be improved with NER)
-    resume_words = set(resume_text.lower().split())
-    jd_words = set(jd_text.lower().split())
-    missing_skills = list(jd_words - resume_words) # This is a simplification
-    
-    # For a more advanced approach, you'd extract skills specifically
-    # For now, we'll just return the score
-    return round(similarity_score, 2), [] # Placeholder for actual missing skills
+    return round(similarity_score, 2), missing_skills
+
+@tracing.traced("analysis.skill_gaps")
+def skill_gaps(resume_text, jd_texts):
+    """
+    Skill gap of the resume against each job description, in order (see
+    skills.skill_gap). Descriptions' skill sets come from the skill cache, so
+    only new postings are scanned.
+    """
+    from modules import skills
+    resume_skills = skills.extract_skills(resume_text or "")
+    return [skills.skill_gap(resume_skills, job_skills) for job_skills in skills.extract_skills_many(jd_texts)]
+
+def score_jobs(resume_text, jd_texts):
+    """
+    Scores one resume against many job descriptions in a single pass.
+    The TF-IDF vocabulary is fitted once over the whole job corpus, the resume
+    is transformed once, and every score comes out of one sparse
+    matrix-vector product. Returns (scores, ranking) where ranking lists the
+    job indices from best to worst match.
+    """
+    scores = np.zeros(len(jd_texts))
+    if not resume_text or len(jd_texts) == 0:
+        return scores, np.arange(len(jd_texts))
+
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    vectorizer = TfidfVectorizer(stop_words='english')
+    try:
+        jd_matrix = vectorizer.fit_transform(jd_texts)
+    except ValueError:
+        # Every description was empty or made only of stop words
+        return scores, np.arange(len(jd_texts))
+    resume_vector = vectorizer.transform([resume_text])
+
+    # Rows are L2-normalised, so the dot product is the cosine similarity
+    scores = (jd_matrix @ resume_vector.T).toarray().ravel()
+    ranking = np.argsort(-scores, kind='stable')
+    return scores.round(2), ranking
+
+def score_keys_with_index(resume_text, keys, index):
+    """
+    Like score_jobs, for jobs already stored in a persistent
+    job_index.JobIndex, given by key. Returns (scores, ranking) in key order.
+    """
+    with tracing.span("analysis.score", jobs=len(keys)):
+        scores = index.score(resume_text, keys).astype(np.float64)
+    ranking = np.argsort(-scores, kind='stable')
+    return scores.round(2), ranking
+
+async def index_job_stream(job_stream, index, batch_size=20):
+    """
+    Consumes an async stream of jobs (job_searcher.stream_jobs), vectorizing
+    them into the index in small batches while slower searches are still
+    running. Returns the jobs in arrival order.
+    """
+    jobs, batch = [], []
+    async for job in job_stream:
+        jobs.append(job)
+        batch.append(job)
+        if len(batch) >= batch_size:
+            index.add_jobs(batch)
+            batch = []
+    if batch:
+        index.add_jobs(batch)
+    return jobs
 
+@tracing.traced("analysis.resume_suggestions")
 def generate_resume_suggestions(resume_text, jd_text):
     """Uses LLM to generate suggestions for tailoring a resume."""
     prompt = f"""
@@ -51,16 +159,129 @@ def generate_resume_suggestions(resume_text, jd_text):
     ---JOB DESCRIPTION---
     {jd_text}
     """
-    response = llm.invoke(prompt)
+    response = get_llm().invoke(prompt)
     return response.content
 
-def suggest_skills_to_learn(resume_text, desired_job):
-    """Suggests skills for the user to learn for their desired career."""
+def _text(answer):
+    """A batch answer for one job: a string, or a list of bullet points."""
+    if isinstance(answer, list):
+        return "\n".join(f"- {point}" for point in answer)
+    if not isinstance(answer, str) or not answer.strip():
+        raise ValueError("expected non-empty text")
+    return answer
+
+def generate_suggestions_batched(resume_text, jd_texts, **kwargs):
+    """
+    generate_resume_suggestions for many job descriptions, several per request:
+    the resume is sent once per batch instead of once per job. Returns one
+    suggestion text (or None) per description, in order.
+    """
+    from modules import prompt_batching
+    return prompt_batching.run_batched(
+        get_llm(), jd_texts, jd_texts,
+        instruction="For each job description below, provide 3-5 specific, actionable bullet points on how to "
+                    "tailor the resume to better match it. Focus on highlighting relevant skills and experiences.",
+        shared=f"---RESUME---\n{resume_text}",
+        answer_format=" (the bullet points, as one string)",
+        single=lambda jd: generate_resume_suggestions(resume_text, jd), convert=_text, **kwargs,
+    )
+
+def generate_suggestions_many(resume_text, jobs, **kwargs):
+    """
+    Runs generate_resume_suggestions for many jobs concurrently, batching
+    several jobs per request when config.LLM_BATCH_SIZE > 1.
+    Returns one suggestion text per job, in order. Keyword arguments are passed
+    to async_runner.map_concurrently (concurrency, rate, max_retries, backoff).
+    """
+    jd_texts = [job.get('description', '') for job in jobs]
+    if config.LLM_BATCH_SIZE > 1:
+        return [result or "" for result in generate_suggestions_batched(resume_text, jd_texts, **kwargs)]
+    results = async_runner.run_concurrently(
+        lambda jd: generate_resume_suggestions(resume_text, jd), jd_texts, **kwargs
+    )
+    suggestions = []
+    for job, result in zip(jobs, results):
+        if isinstance(result, Exception):
+            print(f"❌ Could not get suggestions for {job.get('title')}: {result}")
+            result = ""
+        suggestions.append(result)
+    return suggestions
+
+@tracing.traced("analysis.rate_match")
+def rate_match(resume_text, jd_text):
+    """Asks the LLM how well the resume fits the job. Returns a score between 0 and 1, or None if unparseable."""
+    prompt = f"""
+    Rate how well the candidate's resume matches the job description, from 0 (no fit) to 100 (perfect fit).
+    Consider required skills, experience level and domain. Reply with the number only.
+
+    ---RESUME---
+    {resume_text}
+
+    ---JOB DESCRIPTION---
+    {jd_text}
+    """
+    response = get_llm().invoke(prompt)
+    match = re.search(r"\d+(?:\.\d+)?", response.content)
+    return min(float(match.group()), 100.0) / 100 if match else None
+
+def _rating(answer):
+    """A batch answer for one job: a number from 0 to 100, scaled to 0-1."""
+    return min(max(float(answer), 0.0), 100.0) / 100
+
+def rate_matches_batched(resume_text, jd_texts, **kwargs):
+    """rate_match for many job descriptions, several per request, with the resume sent once per batch."""
+    from modules import prompt_batching
+    return prompt_batching.run_batched(
+        get_llm(), jd_texts, jd_texts,
+        instruction="Rate how well the candidate's resume matches each job description below, from 0 (no fit) "
+                    "to 100 (perfect fit). Consider required skills, experience level and domain.",
+        shared=f"---RESUME---\n{resume_text}",
+        answer_format=" (a number from 0 to 100)",
+        single=lambda jd: rate_match(resume_text, jd), convert=_rating, **kwargs,
+    )
+
+def rate_matches_many(resume_text, jd_texts, **kwargs):
+    """
+    Runs rate_match for many job descriptions concurrently, batching several
+    per request when config.LLM_BATCH_SIZE > 1. Returns one score (or None, for
+    a failed or unparseable rating) per description, in order.
+    Keyword arguments are passed to async_runner.map_concurrently.
+    """
+    if config.LLM_BATCH_SIZE > 1:
+        return rate_matches_batched(resume_text, jd_texts, **kwargs)
+    results = async_runner.run_concurrently(lambda jd: rate_match(resume_text, jd), jd_texts, **kwargs)
+    scores = []
+    for result in results:
+        if isinstance(result, Exception):
+            print(f"❌ Could not rate a job: {result}")
+            result = None
+        scores.append(result)
+    return scores
+
+def skills_to_learn(resume_text, jd_texts, weights=None, top_n=5):
+    """
+    The skills most often missing from the resume across the given job
+    descriptions, computed locally: [(skill, weighted count, number of jobs)].
+    """
+    from modules import skills
+    return skills.aggregate_gaps(skill_gaps(resume_text, jd_texts), weights, top_n)
+
+def suggest_skills_to_learn(resume_text, desired_job, jd_texts=None, top_n=5):
+    """
+    Suggests skills for the user to learn for their desired career. Given the
+    job descriptions found, the suggestions are aggregated from their skill
+    gaps without an LLM call; otherwise the LLM is asked.
+    """
+    if jd_texts:
+        ranked = skills_to_learn(resume_text, jd_texts, top_n=top_n)
+        if ranked:
+            return "\n".join(f"{i}. {skill} (asked for by {jobs} of {len(jd_texts)} jobs found)"
+                             for i, (skill, _, jobs) in enumerate(ranked, 1))
     prompt = f"""
     Based on this resume and a desired job title of "{desired_job}", what are the top 5 technical skills or tools this person should consider learning to advance their career?
     
     ---RESUME---
     {resume_text}
     """
-    response = llm.invoke(prompt)
+    response = get_llm().invoke(prompt)
     return response.content
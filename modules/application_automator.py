@@ -1,55 +1,77 @@
 # modules/application_automator.py
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from webdriver_manager.chrome import ChromeDriverManager
-import time
+from concurrent.futures import ThreadPoolExecutor
 import config
+from modules import browser_pool, site_adapters
 
-def apply_to_job(job_url, resume_path, cover_letter_path=None):
+# Outcomes of submit_application
+SUBMITTED, SIMULATED, UNSUPPORTED = "submitted", "simulated", "unsupported"
+
+def login_linkedin(driver):
+    """Logs a fresh browser session into LinkedIn (conceptual). The pool runs this once per session."""
+    from selenium.webdriver.common.by import By
+    driver.get("https://www.linkedin.com/login")
+    site_adapters.wait_present(driver, (By.ID, "username"), config.STEP_TIMEOUT).send_keys(config.LINKEDIN_EMAIL)
+    driver.find_element(By.ID, "password").send_keys(config.LINKEDIN_PASSWORD)
+    driver.find_element(By.XPATH, "//button[@type='submit']").click()
+    # Logged in once the browser has navigated away from the login form
+    site_adapters.wait_until(driver, lambda d: "/login" not in d.current_url, config.STEP_TIMEOUT)
+
+def submit_application(job_url, resume_path, cover_letter_path=None, pool=None, timings=None):
     """
     Automates the job application process for a given URL.
-    NOTE: This is a conceptual template. The selectors (By.ID, By.NAME)
-    will be different for every single website.
+    NOTE: The flow and selectors are different for every single website; they
+    live in site_adapters. Every step waits on an explicit condition instead of
+    a fixed sleep, and its duration is appended to `timings` if a list is given.
+    The browser is borrowed from a pool of long-lived sessions (the default
+    pool unless one is given). Returns SUBMITTED once the application went
+    through, SIMULATED if the adapter ran its flow without sending it
+    (submit=False), and UNSUPPORTED if there is no automation for the site;
+    errors are raised, so the caller (e.g. application_queue) can retry.
     """
-    print(f"🚀 Attempting to apply to: {job_url}")
-    
-    # This automatically downloads and manages the correct driver for Chrome
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()))
-    
-    try:
-        driver.get(job_url)
-        time.sleep(3) # Wait for the page to load
+    adapter = site_adapters.find_adapter(job_url)
+    if adapter is None:
+        return UNSUPPORTED
 
-        # --- THIS LOGIC IS HIGHLY SPECIFIC TO A WEBSITE ---
-        # Example for a hypothetical "Easy Apply" button on LinkedIn
-        if "linkedin.com" in job_url:
-            # Login first (conceptual)
-            # driver.get("https://www.linkedin.com/login")
-            # driver.find_element(By.ID, "username").send_keys(config.LINKEDIN_EMAIL)
-            # driver.find_element(By.ID, "password").send_keys(config.LINKEDIN_PASSWORD)
-            # driver.find_element(By.XPATH, "//button[@type='submit']").click()
-            # time.sleep(5)
-            # driver.get(job_url)
-            
-            # Find and click the 'Easy Apply' button
-            easy_apply_button = driver.find_element(By.XPATH, "//button[contains(., 'Easy Apply')]")
-            easy_apply_button.click()
-            time.sleep(2)
-            
-            # Navigate through the application modal
-            # Upload resume
-            resume_upload_input = driver.find_element(By.CSS_SELECTOR, "input[type='file']")
-            resume_upload_input.send_keys(resume_path)
-            time.sleep(2)
-
-            # Click 'Next' or 'Submit'
-            submit_button = driver.find_element(By.XPATH, "//button[contains(., 'Submit application')]")
-            # submit_button.click() # Uncomment to actually submit
-            print("✅ Successfully submitted application (simulation).")
+    pool = pool or browser_pool.get_default_pool()
+    step_timings = []
+    try:
+        with pool.session() as driver:
+            adapter.apply(driver, job_url, resume_path, step_timings)
+        return SUBMITTED if adapter.submit else SIMULATED
+    finally:
+        if timings is not None:
+            timings.extend(step_timings)
+        if step_timings:
+            print("⏱️ " + ", ".join(f"{t.step} {t.seconds:.2f}s" + ("" if t.ok else " (failed)") for t in step_timings))
 
+def apply_to_job(job_url, resume_path, cover_letter_path=None, pool=None, timings=None):
+    """
+    Like submit_application, but prints the outcome and returns True if the
+    application flow ran through (submitted or simulated), False otherwise,
+    instead of raising.
+    """
+    print(f"🚀 Attempting to apply to: {job_url}")
+    try:
+        outcome = submit_application(job_url, resume_path, cover_letter_path, pool, timings)
     except Exception as e:
         print(f"❌ Error applying to {job_url}: {e}")
         print("NOTE: Web automation is fragile. The website's structure might have changed.")
-    finally:
-        driver.quit()
+        return False
+    if outcome == SUBMITTED:
+        print("✅ Successfully submitted application.")
+    elif outcome == SIMULATED:
+        print("🧪 Application flow completed (simulation, nothing was submitted).")
+    else:
+        print(f"⚠️ No automation available for {job_url}.")
+    return outcome != UNSUPPORTED
+
+def apply_to_jobs(applications, pool=None, workers=None, timings=None):
+    """
+    Applies to many jobs in parallel across the browser pool.
+    `applications` is a list of (job_url, resume_path) pairs. Returns one
+    True/False result per application, in order. Step timings are appended
+    to `timings` if a list is given.
+    """
+    pool = pool or browser_pool.get_default_pool()
+    with ThreadPoolExecutor(max_workers=workers or pool.size) as executor:
+        return list(executor.map(lambda app: apply_to_job(app[0], app[1], pool=pool, timings=timings), applications))
@@ -0,0 +1,301 @@
+# modules/application_queue.py
+# Durable work queue for job applications. Applications are rows in SQLite,
+# keyed by an idempotency key (candidate + normalised posting URL), so the
+# same application is never queued -- or submitted -- twice (only a failed
+# or simulated one can be queued again), and whatever was
+# queued survives a crash or restart. A pool of worker threads claims due
+# rows, never running more than APPLY_PER_DOMAIN at once against one site,
+# and retries failures with exponential backoff up to APPLY_MAX_ATTEMPTS.
+import hashlib
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import config
+from modules import application_automator, dedup, sqlite_store, tracing
+
+# SIMULATED: the site's flow ran as a dry run (adapter submit=False), so nothing was sent
+QUEUED, RUNNING, SUCCEEDED, SIMULATED, FAILED = "queued", "running", "succeeded", "simulated", "failed"
+FINISHED = (SUCCEEDED, SIMULATED, FAILED)
+
+_COLUMNS = ("key", "candidate", "job_id", "url", "domain", "resume_path", "status", "attempts",
+            "next_attempt_at", "lease_until", "last_error", "created_at", "updated_at")
+
+def idempotency_key(job, candidate=None):
+    """Key of one candidate's application to one posting (its normalised URL, see dedup.posting_key)."""
+    return hashlib.sha1(f"{candidate or ''}\x00{dedup.posting_key(job)}".encode("utf-8")).hexdigest()
+
+def domain_of(url):
+    """The host applications are rate limited by (without a leading "www.")."""
+    host = urlsplit(url or "").netloc.lower()
+    return host[4:] if host.startswith("www.") else host
+
+def backoff_delay(attempts, base=None):
+    """Seconds to wait before retry number `attempts`: exponential, with jitter."""
+    base = config.APPLY_BACKOFF_SEC if base is None else base
+    return base * (2 ** (attempts - 1)) * (1 + random.random())
+
+class ApplicationQueue(sqlite_store.SQLiteStore):
+    """
+    SQLite-backed application queue. enqueue() is idempotent; claim() hands a
+    worker the oldest due application whose site is below its concurrency
+    limit; finish() records the outcome or schedules a retry.
+    """
+
+    def __init__(self, path=":memory:", per_domain=None, max_attempts=None, lease_sec=None):
+        super().__init__(path, [
+            "CREATE TABLE IF NOT EXISTS applications ("
+            " key TEXT PRIMARY KEY, candidate TEXT, job_id TEXT, url TEXT, domain TEXT, resume_path TEXT,"
+            " status TEXT, attempts INTEGER, next_attempt_at REAL, lease_until REAL, last_error TEXT,"
+            " created_at REAL, updated_at REAL)",
+            "CREATE INDEX IF NOT EXISTS applications_due ON applications (status, next_attempt_at)",
+        ])
+        self.per_domain = per_domain or config.APPLY_PER_DOMAIN
+        self.max_attempts = max_attempts or config.APPLY_MAX_ATTEMPTS
+        self.lease_sec = lease_sec or config.APPLY_LEASE_SEC
+
+    def enqueue(self, job, resume_path, candidate=None, job_id=None):
+        """
+        Queues an application and returns its idempotency key. An application
+        already queued, running or succeeded is left as it is; a failed or
+        simulated one is queued again from scratch, with this resume_path.
+        """
+        key = idempotency_key(job, candidate)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO applications VALUES (?, ?, ?, ?, ?, ?, ?, 0, ?, NULL, NULL, ?, ?)",
+                (key, candidate, job_id, job['url'], domain_of(job['url']), resume_path, QUEUED, now, now, now),
+            )
+            self._conn.execute(
+                "UPDATE applications SET status = ?, attempts = 0, next_attempt_at = ?, lease_until = NULL,"
+                " last_error = NULL, resume_path = ?, job_id = COALESCE(?, job_id), updated_at = ?"
+                " WHERE key = ? AND status IN (?, ?)",
+                (QUEUED, now, resume_path, job_id, now, key, FAILED, SIMULATED),
+            )
+            self._conn.commit()
+        return key
+
+    def claim(self):
+        """
+        Marks the oldest due application whose domain has a free slot as
+        running and returns it as a dict, or returns None if there is none.
+        """
+        now = time.time()
+        with self._lock:
+            busy = {domain for domain, running in self._conn.execute(
+                "SELECT domain, COUNT(*) FROM applications WHERE status = ? GROUP BY domain", (RUNNING,)
+            ) if running >= self.per_domain}
+            placeholders = ",".join("?" * len(busy))
+            row = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM applications WHERE status = ? AND next_attempt_at <= ?"
+                + (f" AND domain NOT IN ({placeholders})" if busy else "")
+                + " ORDER BY next_attempt_at, created_at LIMIT 1",
+                [QUEUED, now] + sorted(busy),
+            ).fetchone()
+            if row is None:
+                return None
+            # Conditional update, so two processes sharing the database cannot claim the same row
+            claimed = self._conn.execute(
+                "UPDATE applications SET status = ?, attempts = attempts + 1, lease_until = ?, updated_at = ?"
+                " WHERE key = ? AND status = ?",
+                (RUNNING, now + self.lease_sec, now, row[0], QUEUED),
+            ).rowcount
+            self._conn.commit()
+        if not claimed:
+            return None
+        application = dict(zip(_COLUMNS, row))
+        application.update(status=RUNNING, attempts=application["attempts"] + 1)
+        return application
+
+    def finish(self, key, ok, error=None, retry=True, simulated=False):
+        """
+        Records the outcome of a claimed application: success (SIMULATED
+        rather than SUCCEEDED if nothing was really sent) or failure. A
+        failure is retried after a backoff unless retry is False or the
+        attempts are used up. Returns the new status.
+        """
+        now = time.time()
+        with self._lock:
+            attempts = self._conn.execute("SELECT attempts FROM applications WHERE key = ?", (key,)).fetchone()[0]
+            if ok:
+                status, next_attempt_at = (SIMULATED if simulated else SUCCEEDED), now
+            elif retry and attempts < self.max_attempts:
+                status, next_attempt_at = QUEUED, now + backoff_delay(attempts)
+            else:
+                status, next_attempt_at = FAILED, now
+            self._conn.execute(
+                "UPDATE applications SET status = ?, next_attempt_at = ?, lease_until = NULL, last_error = ?,"
+                " updated_at = ? WHERE key = ?",
+                (status, next_attempt_at, error, now, key),
+            )
+            self._conn.commit()
+        return status
+
+    def requeue_stale(self):
+        """Returns applications whose worker died mid-way (lease expired) to the queue. Returns how many."""
+        now = time.time()
+        with self._lock:
+            count = self._conn.execute(
+                "UPDATE applications SET status = ?, lease_until = NULL, updated_at = ?"
+                " WHERE status = ? AND lease_until < ?",
+                (QUEUED, now, RUNNING, now),
+            ).rowcount
+            self._conn.commit()
+        return count
+
+    def next_due(self):
+        """Seconds until the next queued application is due (0 if one is due now), or None if none is queued."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MIN(next_attempt_at) FROM applications WHERE status = ?", (QUEUED,)
+            ).fetchone()
+        return None if row[0] is None else max(0.0, row[0] - time.time())
+
+    # --- Status API ---
+
+    def get(self, keys):
+        """Returns {key: application dict} for the given idempotency keys."""
+        query = f"SELECT {', '.join(_COLUMNS)} FROM applications WHERE key IN ({{}})"
+        with self._lock:
+            return {row[0]: dict(zip(_COLUMNS, row)) for row in self._select_in(query, keys)}
+
+    def status(self, candidate=None):
+        """
+        Counts of applications per status ("retrying" being queued ones that
+        already failed at least once), for one candidate or all of them.
+        """
+        query = "SELECT status, attempts > 0, COUNT(*) FROM applications"
+        params = []
+        if candidate is not None:
+            query += " WHERE candidate = ?"
+            params.append(candidate)
+        counts = {QUEUED: 0, "retrying": 0, RUNNING: 0, SUCCEEDED: 0, SIMULATED: 0, FAILED: 0}
+        with self._lock:
+            for status, retried, count in self._conn.execute(query + " GROUP BY status, attempts > 0", params):
+                counts["retrying" if status == QUEUED and retried else status] += count
+        counts["total"] = sum(counts.values())
+        return counts
+
+    def applications(self, candidate=None, status=None, limit=100):
+        """The most recently updated applications, as dicts, optionally filtered."""
+        query, conditions, params = f"SELECT {', '.join(_COLUMNS)} FROM applications", [], []
+        if candidate is not None:
+            conditions.append("candidate = ?")
+            params.append(candidate)
+        if status is not None:
+            conditions.append("status = ?")
+            params.append(status)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY updated_at DESC LIMIT ?", params + [limit]).fetchall()
+        return [dict(zip(_COLUMNS, row)) for row in rows]
+
+    def wait(self, keys, timeout=None, poll=0.5):
+        """Blocks until every given application has finished (or timeout seconds pass). Returns get(keys)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            applications = self.get(keys)
+            if all(a["status"] in FINISHED for a in applications.values()):
+                return applications
+            if deadline is not None and time.monotonic() >= deadline:
+                return applications
+            time.sleep(poll)
+
+def default_apply(application):
+    """Submits one claimed application through the browser automation; returns its outcome."""
+    return application_automator.submit_application(application["url"], application["resume_path"])
+
+class Workers:
+    """
+    Worker threads draining an ApplicationQueue. apply(application) returns
+    True (or application_automator.SUBMITTED) on success, SIMULATED for a
+    dry run, and False (or UNSUPPORTED) for an application that cannot
+    succeed (no automation for the site); an exception is a failure worth
+    retrying.
+    With stop_when_idle, the workers exit once nothing is queued or running.
+    """
+
+    def __init__(self, queue, workers=None, apply=None, poll=1.0, stop_when_idle=False):
+        self.queue = queue
+        self.size = workers or config.APPLY_WORKERS
+        self.apply = apply or default_apply
+        self.poll = poll
+        self.stop_when_idle = stop_when_idle
+        self._stop = threading.Event()
+        self._threads = []
+
+    def start(self):
+        self.queue.requeue_stale()
+        for i in range(self.size):
+            thread = threading.Thread(target=self._run, name=f"apply-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def join(self):
+        for thread in self._threads:
+            thread.join()
+
+    def _run(self):
+        while not self._stop.is_set():
+            application = self.queue.claim()
+            if application is None:
+                due = self.queue.next_due()
+                if due is None and self.stop_when_idle and self.queue.status()[RUNNING] == 0:
+                    return
+                self._stop.wait(min(self.poll, due) if due else self.poll)
+                continue
+            self._process(application)
+
+    def _process(self, application):
+        with tracing.span("apply.attempt", domain=application["domain"], attempt=application["attempts"]) as span:
+            try:
+                outcome = self.apply(application)
+                simulated = outcome == application_automator.SIMULATED
+                ok = outcome is True or outcome == application_automator.SUBMITTED or simulated
+                error = None if ok else "no automation available for this site"
+                status = self.queue.finish(application["key"], ok, error, retry=False, simulated=simulated)
+            except Exception as e:
+                status = self.queue.finish(application["key"], False, f"{type(e).__name__}: {e}")
+            span.set(status=status)
+        icon = {SUCCEEDED: '✅', SIMULATED: '🧪', QUEUED: '🔁'}.get(status, '❌')
+        print(f"{icon} {application['url']}: {status} (attempt {application['attempts']})")
+
+def drain(queue, workers=None, apply=None):
+    """Runs workers until the queue has nothing left to do, retries included. Returns the final status counts."""
+    pool = Workers(queue, workers, apply, poll=0.2, stop_when_idle=True).start()
+    pool.join()
+    return queue.status()
+
+_queues = sqlite_store.Registry(ApplicationQueue)
+
+def get_queue(path=None):
+    """Returns the process-wide queue stored at path (default: config.APPLY_QUEUE_PATH)."""
+    return _queues.get(path or config.APPLY_QUEUE_PATH)
+
+_workers = {}
+_workers_lock = threading.Lock()
+
+def get_workers(queue=None):
+    """Starts the process-wide worker pool for a queue (default: get_queue()) once, and returns it."""
+    queue = queue or get_queue()
+    with _workers_lock:
+        if id(queue) not in _workers:
+            _workers[id(queue)] = Workers(queue).start()
+        return _workers[id(queue)]
+
+def print_status(queue, candidate=None, recent=10):
+    """Prints the status counts and the most recently updated applications."""
+    counts = queue.status(candidate)
+    print("--- 📬 Application queue ---")
+    print(" | ".join(f"{status}: {count}" for status, count in counts.items()))
+    for application in queue.applications(candidate, limit=recent):
+        error = f" -- {application['last_error']}" if application["last_error"] and application["status"] != SUCCEEDED else ""
+        print(f"  [{application['status']:<9}] {application['candidate'] or '-'} | {application['url']} "
+              f"(attempts: {application['attempts']}){error}")
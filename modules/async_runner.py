@@ -0,0 +1,67 @@
+# modules/async_runner.py
+# Runs blocking calls (LLM requests, mostly) concurrently on asyncio with a
+# concurrency limit, a token-bucket rate limit and retry/backoff on 429s.
+import asyncio
+import random
+import time
+
+import config
+
+class TokenBucket:
+    """Allows `rate` acquisitions per second on average, with bursts up to `capacity`."""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+def is_rate_limit_error(error):
+    """True for errors that mean the API is asking us to slow down (HTTP 429)."""
+    text = f"{type(error).__name__} {error}"
+    return "429" in text or "ResourceExhausted" in text or "rate limit" in text.lower()
+
+async def _call_with_retry(fn, item, semaphore, bucket, max_retries, backoff):
+    for attempt in range(max_retries + 1):
+        if bucket is not None:
+            await bucket.acquire()
+        async with semaphore:
+            try:
+                return await asyncio.to_thread(fn, item)
+            except Exception as e:
+                if not is_rate_limit_error(e) or attempt == max_retries:
+                    raise
+        # Exponential backoff with jitter, outside the semaphore so others can proceed
+        await asyncio.sleep(backoff * (2 ** attempt) * (1 + random.random()))
+
+async def map_concurrently(fn, items, concurrency=None, rate=None, max_retries=None, backoff=None):
+    """
+    Calls fn(item) for every item concurrently and returns the results in input order.
+    A failed item yields its exception instead of a result, so one bad call
+    does not lose the rest of the batch.
+    """
+    concurrency = concurrency or config.LLM_CONCURRENCY
+    rate = config.LLM_RATE_PER_SEC if rate is None else rate
+    max_retries = config.LLM_MAX_RETRIES if max_retries is None else max_retries
+    backoff = config.LLM_BACKOFF_SEC if backoff is None else backoff
+
+    semaphore = asyncio.Semaphore(concurrency)
+    bucket = TokenBucket(rate) if rate else None
+    tasks = [_call_with_retry(fn, item, semaphore, bucket, max_retries, backoff) for item in items]
+    return await asyncio.gather(*tasks, return_exceptions=True)
+
+def run_concurrently(fn, items, **kwargs):
+    """Synchronous entry point for map_concurrently."""
+    return asyncio.run(map_concurrently(fn, list(items), **kwargs))
@@ -0,0 +1,175 @@
+# modules/batch_runner.py
+# Batch mode: runs the agent graph for many candidates at once, without
+# prompts. Each candidate's selection and confirmation prompts are replaced by
+# a policy (see policies.py). Candidates share the job index, the vector index,
+# the LLM cache and -- through job_searcher.SharedSource -- every search, so
+# overlapping queries are only searched once.
+import contextlib
+import io
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import config
+from modules import checkpoints, input_handler, job_searcher, policies
+
+REQUIRED_KEYS = ("resume", "query", "location")
+
+def load_manifest(path):
+    """
+    Reads a JSON manifest: a list (or {"candidates": [...]}) of entries with
+    "resume", "query", "location" and optionally "name" and "policy". Names
+    must be unique, since a candidate's checkpoints and seen/applied store
+    are keyed by name.
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    entries = data["candidates"] if isinstance(data, dict) else data
+    base_dir = os.path.dirname(os.path.abspath(path))
+
+    candidates = []
+    names = {}
+    for i, entry in enumerate(entries, 1):
+        missing = [key for key in REQUIRED_KEYS if not entry.get(key)]
+        if missing:
+            raise ValueError(f"Manifest entry {i} is missing: {', '.join(missing)}")
+        name = entry.get("name") or f"candidate-{i}"
+        if name in names:
+            raise ValueError(f"Manifest entries {names[name]} and {i} are both named {name!r}")
+        names[name] = i
+        candidates.append({
+            "name": name,
+            # Resume paths are relative to the manifest
+            "resume": os.path.join(base_dir, os.path.expanduser(entry["resume"])),
+            "query": entry["query"],
+            "location": entry["location"],
+            "policy": policies.resolve_policy(entry.get("policy")),
+        })
+    return candidates
+
+def initial_state(candidate, resume, expanded_titles=None):
+    """The graph's starting state for one candidate (with its search titles, if expanded beforehand)."""
+    state = {
+        "resume_text": resume.text,
+        "resume_sections": resume.sections,
+        "default_resume_path": candidate["resume"],
+        "job_query": candidate["query"],
+        "location": candidate["location"],
+        "candidate": candidate["name"],
+        "policy": candidate["policy"],
+    }
+    if expanded_titles:
+        state["expanded_job_titles"] = expanded_titles
+    return state
+
+def expand_queries(candidates):
+    """
+    Expands every distinct query of the batch in as few LLM requests as
+    prompt batching allows. Returns {query: titles}, or {} with batching off.
+    """
+    if config.LLM_BATCH_SIZE <= 1:
+        return {}
+    from modules import analysis_engine
+    queries = list(dict.fromkeys(candidate["query"] for candidate in candidates))
+    return dict(zip(queries, analysis_engine.expand_job_titles_many(queries)))
+
+def run_candidate(app, candidate, resume, run_id, expanded_titles=None):
+    """
+    Runs the graph for one candidate on the thread "<run_id>:<name>", resuming
+    it if it was interrupted. Returns a result dict; errors are recorded, not raised.
+    """
+    result = {"name": candidate["name"], "ok": False, "error": None, "seconds": 0.0,
+              "found": 0, "analyzed": 0, "selected": 0, "applied": 0, "submitted": 0}
+    if resume is None or not resume.text:
+        result["error"] = f"could not read {candidate['resume']}"
+        return result
+
+    start = time.perf_counter()
+    try:
+        thread_id = f"{run_id}:{candidate['name']}"
+        final_state = checkpoints.run_or_resume(app, initial_state(candidate, resume, expanded_titles), thread_id)
+        result.update(
+            ok=True,
+            found=len(final_state.get("found_job_ids") or []),
+            analyzed=len(final_state.get("analyzed_job_ids") or []),
+            selected=len(final_state.get("selected_job_ids") or []),
+            applied=len(final_state.get("applied_job_ids") or []),
+            submitted=len(final_state.get("submitted_job_ids") or []),
+        )
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+def run_batch(app, candidates, workers=None, run_id=None):
+    """
+    Runs every candidate through the graph, `workers` at a time. Pass the
+    run_id of an earlier batch to resume it: finished candidates are not run
+    again and interrupted ones continue from their last checkpoint.
+    Returns (results in manifest order, summary dict).
+    """
+    start = time.perf_counter()
+    run_id = run_id or checkpoints.new_thread_id()
+    resumes = input_handler.parse_resumes([candidate["resume"] for candidate in candidates])
+    expansions = expand_queries(candidates)
+
+    # Share every search between candidates for the duration of the batch
+    original_sources = job_searcher.SOURCES
+    shared_sources = [job_searcher.SharedSource(source) for source in original_sources]
+    job_searcher.SOURCES = shared_sources
+    try:
+        with ThreadPoolExecutor(max_workers=workers or config.BATCH_WORKERS) as executor:
+            results = list(executor.map(
+                lambda pair: run_candidate(app, *pair, run_id, expansions.get(pair[0]["query"])),
+                zip(candidates, resumes),
+            ))
+    finally:
+        job_searcher.SOURCES = original_sources
+
+    wall = time.perf_counter() - start
+    summary = {
+        "run_id": run_id,
+        "candidates": len(results),
+        "succeeded": sum(result["ok"] for result in results),
+        "wall_seconds": wall,
+        "candidate_seconds": sum(result["seconds"] for result in results),
+        "jobs_analyzed": sum(result["analyzed"] for result in results),
+        "applied": sum(result["applied"] for result in results),
+        "submitted": sum(result["submitted"] for result in results),
+        "searches": sum(source.misses for source in shared_sources),
+        "shared_searches": sum(source.hits for source in shared_sources),
+    }
+    return results, summary
+
+def print_report(results, summary):
+    """Prints per-candidate and aggregate throughput."""
+    print("\n--- 📦 Batch report ---")
+    for result in results:
+        if result["ok"]:
+            rate = result["analyzed"] / result["seconds"] if result["seconds"] else 0
+            print(f"✅ {result['name']}: {result['seconds']:.2f}s | {result['found']} found, "
+                  f"{result['selected']} selected, {result['applied']} applied | {rate:.1f} jobs/s")
+        else:
+            print(f"❌ {result['name']}: {result['error']}")
+
+    wall = summary["wall_seconds"] or 1e-9
+    total_searches = summary["searches"] + summary["shared_searches"]
+    print("-" * 20)
+    print(f"{summary['succeeded']}/{summary['candidates']} candidates in {wall:.2f}s "
+          f"({summary['candidates'] / wall * 60:.1f} candidates/min, "
+          f"{summary['jobs_analyzed'] / wall:.1f} jobs analyzed/s)")
+    print(f"Concurrency speed-up: {summary['candidate_seconds'] / wall:.1f}x | "
+          f"searches run: {summary['searches']} of {total_searches} requested | "
+          f"applications submitted: {summary['submitted']}")
+    print(f"Run id: {summary['run_id']} (re-run with --resume {summary['run_id']} to continue it)")
+
+def run_manifest(app, manifest_path, workers=None, quiet=False, run_id=None):
+    """Loads a manifest, runs the batch and prints the report. With quiet, node output is suppressed."""
+    candidates = load_manifest(manifest_path)
+    print(f"📦 Running {len(candidates)} candidates, {workers or config.BATCH_WORKERS} at a time...")
+    output = contextlib.redirect_stdout(io.StringIO()) if quiet else contextlib.nullcontext()
+    with output:
+        results, summary = run_batch(app, candidates, workers, run_id)
+    print_report(results, summary)
+    return results, summary
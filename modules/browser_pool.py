@@ -0,0 +1,129 @@
+# modules/browser_pool.py
+# Pool of long-lived WebDriver sessions for the application automator.
+# The chromedriver binary is resolved once per process and each browser is
+# reused for several applications (logging in only once) before it is recycled.
+import atexit
+import functools
+import queue
+import threading
+from contextlib import contextmanager
+
+import config
+from modules import tracing
+
+@functools.lru_cache(maxsize=None)
+def chromedriver_path():
+    """Resolves (downloading if needed) the chromedriver binary, once per process."""
+    from webdriver_manager.chrome import ChromeDriverManager
+    return ChromeDriverManager().install()
+
+def create_chrome_driver():
+    """Starts a new Chrome session."""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    return webdriver.Chrome(service=Service(chromedriver_path()))
+
+def is_alive(driver):
+    """True if the browser still answers commands."""
+    try:
+        driver.current_url
+        return True
+    except Exception:
+        return False
+
+class _Session:
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0
+
+class BrowserPool:
+    """
+    Hands out up to `size` browser sessions at a time. A session is recycled
+    after `max_uses` applications, or as soon as it stops responding.
+    `on_create(driver)` runs once per new session, e.g. to log in.
+    """
+
+    def __init__(self, size=None, max_uses=None, driver_factory=None, on_create=None):
+        self.size = size or config.BROWSER_POOL_SIZE
+        self.max_uses = max_uses or config.BROWSER_MAX_USES
+        self.driver_factory = driver_factory or create_chrome_driver
+        self.on_create = on_create
+        self.created = 0
+        self.recycled = 0
+        self._idle = queue.LifoQueue()  # most recently used first, so warm sessions get reused
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @tracing.traced("browser.new_session")
+    def _new_session(self):
+        driver = self.driver_factory()
+        with self._lock:
+            self.created += 1
+        if self.on_create:
+            try:
+                self.on_create(driver)
+            except Exception:
+                driver.quit()
+                raise
+        return _Session(driver)
+
+    def _retire(self, session):
+        with self._lock:
+            self.recycled += 1
+        try:
+            session.driver.quit()
+        except Exception:
+            pass
+
+    @contextmanager
+    def session(self):
+        """Context manager that lends a browser and takes it back afterwards."""
+        self._slots.acquire()
+        try:
+            try:
+                session = self._idle.get_nowait()
+            except queue.Empty:
+                session = self._new_session()
+            healthy = True
+            try:
+                yield session.driver
+            except Exception:
+                # A failed application may just be a missing element; only
+                # drop the browser if it no longer responds
+                healthy = is_alive(session.driver)
+                raise
+            finally:
+                session.uses += 1
+                if healthy and session.uses < self.max_uses and not self._closed:
+                    self._idle.put(session)
+                else:
+                    self._retire(session)
+        finally:
+            self._slots.release()
+
+    def close(self):
+        """Quits every idle browser. Sessions still in use are quit when returned."""
+        self._closed = True
+        while True:
+            try:
+                self._retire(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+    def stats(self):
+        return {"size": self.size, "created": self.created, "recycled": self.recycled, "idle": self._idle.qsize()}
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+def get_default_pool():
+    """Returns the process-wide pool, logging new sessions into LinkedIn when credentials are configured."""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            from modules.application_automator import login_linkedin
+            on_create = login_linkedin if config.LINKEDIN_EMAIL and config.LINKEDIN_PASSWORD else None
+            _default_pool = BrowserPool(on_create=on_create)
+            atexit.register(_default_pool.close)
+        return _default_pool
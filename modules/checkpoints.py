@@ -0,0 +1,46 @@
+# modules/checkpoints.py
+# SQLite checkpointing for the agent graph. LangGraph saves the state after
+# every node under a thread id, so a run that crashes (or is interrupted) can
+# be resumed from the last completed node instead of starting over.
+import os
+import sqlite3
+import uuid
+
+import config
+from modules import sqlite_store
+
+def _open_saver(path):
+    from langgraph.checkpoint.sqlite import SqliteSaver
+    if path != ":memory:":
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    # The saver serializes access with its own lock, so batch threads can share it
+    return SqliteSaver(sqlite3.connect(path, check_same_thread=False))
+
+_savers = sqlite_store.Registry(_open_saver)
+
+def get_checkpointer(path=None):
+    """Returns the process-wide SQLite checkpointer stored at path (default: config.CHECKPOINT_DB_PATH)."""
+    return _savers.get(path or config.CHECKPOINT_DB_PATH)
+
+def new_thread_id():
+    return uuid.uuid4().hex[:12]
+
+def thread_config(thread_id):
+    """The invoke() config that ties a run to its checkpoints."""
+    return {"configurable": {"thread_id": thread_id}}
+
+def run_or_resume(app, initial_state, thread_id):
+    """
+    Runs the graph on a thread. A thread with a pending node (it crashed or
+    was interrupted) continues from its last checkpoint; a finished thread
+    returns its final state without running again; a new thread starts from
+    initial_state.
+    """
+    run_config = thread_config(thread_id)
+    snapshot = app.get_state(run_config)
+    if snapshot.next:
+        print(f"↩️ Resuming run {thread_id} at: {', '.join(snapshot.next)}")
+        return app.invoke(None, run_config)
+    if snapshot.values:
+        return snapshot.values
+    return app.invoke(initial_state, run_config)
@@ -0,0 +1,252 @@
+# modules/dedup.py
+# Cross-source job deduplication. Exact duplicates are caught by a hash of the
+# normalised URL; re-posts of the same job on other boards are caught by
+# MinHash signatures of the title and description, bucketed with LSH so each
+# posting is only compared with likely matches, and only merged with one from
+# the same employer (legal suffixes aside) -- or, when either names no
+# employer, with one whose text is nearly identical. Postings whose
+# description is too short to compare are only deduplicated by URL. A
+# persistent store remembers postings already seen and already applied to
+# across runs.
+import hashlib
+import os
+import re
+import time
+import zlib
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import numpy as np
+
+import config
+from modules import sqlite_store
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = re.compile(r"^(utm_.*|ref|refid|trackingid|trk|src|source|from|gclid|fbclid)$", re.I)
+_PRIME = (1 << 32) - 5  # largest prime below 2**32, so (a * x + b) fits in uint64
+# Trailing words that only give a company's legal form ("Innovate AI Inc." is "Innovate AI")
+LEGAL_SUFFIXES = {"inc", "incorporated", "llc", "llp", "lp", "ltd", "limited", "corp", "corporation", "co",
+                  "company", "gmbh", "ag", "plc", "sa", "sas", "sarl", "srl", "bv", "nv", "pty", "pvt", "oy", "ab"}
+
+def normalize_url(url):
+    """Lower-cases scheme and host, drops tracking parameters, fragments and trailing slashes."""
+    parts = urlsplit((url or "").strip())
+    query = urlencode(sorted((k, v) for k, v in parse_qsl(parts.query) if not TRACKING_PARAMS.match(k)))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip("/"), query, ""))
+
+def url_key(url):
+    """Hash of the normalised URL."""
+    return hashlib.sha1(normalize_url(url).encode("utf-8")).hexdigest()
+
+def posting_key(job):
+    """Key of a posting in the seen/applied store: its URL hash, or a description hash without a URL."""
+    if job.get('url'):
+        return url_key(job['url'])
+    return hashlib.sha1(job.get('description', '').encode("utf-8")).hexdigest()
+
+def shingles(text, size=3):
+    """Hashes of every run of `size` consecutive words in the text."""
+    words = re.findall(r"\w+", (text or "").lower())
+    if len(words) < size:
+        words = words + [""] * (size - len(words))
+    grams = {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+    return np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64, count=len(grams))
+
+def company_key(job):
+    """The employer, normalised: lower case, no punctuation, no trailing legal form. "" if unknown."""
+    words = re.findall(r"\w+", (job.get('company') or "").lower())
+    while len(words) > 1 and words[-1] in LEGAL_SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+def posting_text(job):
+    """The text near-duplicates are compared on: the title as well as the description."""
+    return f"{job.get('title') or ''} {job.get('description') or ''}"
+
+def posting_signature(job, hasher):
+    """
+    MinHash signature of a posting, or None if its description has fewer than
+    DEDUP_MIN_SHINGLES shingles: empty or one-line descriptions look alike
+    whatever the job, so comparing them would merge distinct postings.
+    """
+    if len(shingles(job.get('description', ''))) < config.DEDUP_MIN_SHINGLES:
+        return None
+    return hasher.signature(posting_text(job))
+
+class MinHasher:
+    """Computes MinHash signatures with num_perm random hash functions."""
+
+    def __init__(self, num_perm=64, seed=1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.a = rng.integers(1, _PRIME, size=num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, _PRIME, size=num_perm, dtype=np.uint64)
+
+    def signature(self, text):
+        values = shingles(text) % _PRIME
+        hashed = (np.outer(values, self.a) + self.b) % _PRIME
+        return hashed.min(axis=0).astype(np.uint32)
+
+class Deduplicator:
+    """
+    Keeps one posting per job. Signatures are split into `bands` LSH bands;
+    two postings are only compared if they share a band. They count as the
+    same job if they have the same company and their estimated similarity
+    reaches `threshold`, or if either has no company and it reaches
+    `threshold_no_company`; postings of two different companies never match.
+    """
+
+    def __init__(self, threshold=None, num_perm=64, bands=16, threshold_no_company=None):
+        self.threshold = config.DEDUP_THRESHOLD if threshold is None else threshold
+        self.threshold_no_company = (config.DEDUP_THRESHOLD_NO_COMPANY if threshold_no_company is None
+                                     else threshold_no_company)
+        self.hasher = MinHasher(num_perm)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.urls = {}     # url key -> entry id
+        self.labels = []   # entry id -> "kept" / "applied"
+        self.companies = []  # entry id -> company key
+        self.buckets = {}  # (band, band hash) -> [entry ids]
+        self._signatures = np.empty((256, num_perm), dtype=np.uint32)  # entry id -> signature
+
+    def _band_keys(self, signature):
+        return [(band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+                for band in range(self.bands)]
+
+    def _add(self, signature, label, key=None, company=""):
+        entry = len(self.labels)
+        if entry == len(self._signatures):
+            self._signatures = np.concatenate([self._signatures, np.empty_like(self._signatures)])
+        self.labels.append(label)
+        self.companies.append(company)
+        if key:
+            self.urls[key] = entry
+        if signature is None:
+            return entry  # matched by URL only
+        self._signatures[entry] = signature
+        for band_key in self._band_keys(signature):
+            self.buckets.setdefault(band_key, []).append(entry)
+        return entry
+
+    def add_known(self, signature, label="applied", key=None, company=""):
+        """Registers a posting from an earlier run (e.g. one already applied to); signature may be None."""
+        self._add(np.frombuffer(signature, dtype=np.uint32) if isinstance(signature, bytes) else signature,
+                  label, key, company or "")
+
+    def check(self, job):
+        """
+        Returns (label, signature): label is None for a new posting, otherwise
+        what it duplicates ("kept" for an earlier posting in this run, "applied"...).
+        New postings are registered.
+        """
+        key = url_key(job.get('url')) if job.get('url') else None
+        if key in self.urls:
+            return self.labels[self.urls[key]], None
+
+        signature = posting_signature(job, self.hasher)
+        if signature is None:
+            self._add(None, "kept", key)
+            return None, None
+        company = company_key(job)
+        candidates = set()
+        for band_key in self._band_keys(signature):
+            candidates.update(self.buckets.get(band_key, ()))
+        # Only the same company, or postings where either side names none
+        candidates = [entry for entry in candidates
+                      if not company or not self.companies[entry] or self.companies[entry] == company]
+        if candidates:
+            required = np.array([self.threshold if company and self.companies[entry] else self.threshold_no_company
+                                 for entry in candidates])
+            candidates = np.array(candidates, dtype=np.int64)
+            # Estimated Jaccard similarity with every candidate at once
+            similarities = (self._signatures[candidates] == signature).mean(axis=1)
+            similarities[similarities < required] = -1
+            best = int(similarities.argmax())
+            if similarities[best] >= 0:
+                entry = int(candidates[best])
+                if key:
+                    self.urls[key] = entry
+                return self.labels[entry], signature
+
+        self._add(signature, "kept", key, company)
+        return None, signature
+
+class SeenStore(sqlite_store.SQLiteStore):
+    """SQLite record of postings seen and applied to in earlier runs."""
+
+    def __init__(self, path=":memory:"):
+        super().__init__(path, [
+            "CREATE TABLE IF NOT EXISTS seen (key TEXT PRIMARY KEY, first_seen REAL, last_seen REAL)",
+            "CREATE TABLE IF NOT EXISTS applied (key TEXT PRIMARY KEY, url TEXT, signature BLOB, applied_at REAL)",
+        ])
+        if "company" not in {row[1] for row in self._conn.execute("PRAGMA table_info(applied)")}:
+            self._conn.execute("ALTER TABLE applied ADD COLUMN company TEXT")  # stores from before it existed
+        self._conn.commit()
+
+    def mark_seen(self, jobs):
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO seen VALUES (?, ?, ?) ON CONFLICT(key) DO UPDATE SET last_seen = excluded.last_seen",
+                [(posting_key(job), now, now) for job in jobs],
+            )
+            self._conn.commit()
+
+    def seen_keys(self, keys):
+        """Returns the subset of keys recorded in an earlier run."""
+        with self._lock:
+            return {row[0] for row in self._select_in("SELECT key FROM seen WHERE key IN ({})", keys)}
+
+    def mark_applied(self, job, hasher=None):
+        signature = posting_signature(job, hasher or MinHasher())
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO applied (key, url, signature, applied_at, company) VALUES (?, ?, ?, ?, ?)",
+                (posting_key(job), job.get('url'), None if signature is None else signature.tobytes(), time.time(),
+                 company_key(job)),
+            )
+            self._conn.commit()
+
+    def applied(self):
+        """Returns (url key, signature bytes or None, company key) for every posting applied to."""
+        with self._lock:
+            return self._conn.execute("SELECT key, signature, company FROM applied").fetchall()
+
+def store_path(candidate=None):
+    """Path of a candidate's seen/applied store in batch runs; the default store otherwise."""
+    if not candidate:
+        return config.DEDUP_DB_PATH
+    root, ext = os.path.splitext(config.DEDUP_DB_PATH)
+    slug = re.sub(r"[^\w-]+", "_", candidate)
+    return f"{root}.{slug}{ext}"
+
+_stores = sqlite_store.Registry(SeenStore)
+
+def get_seen_store(path=None):
+    """Returns the process-wide seen/applied store."""
+    return _stores.get(path or config.DEDUP_DB_PATH)
+
+def dedupe_jobs(jobs, store=None, threshold=None):
+    """
+    Drops exact and near-duplicate postings, and postings already applied to
+    in an earlier run. Postings seen in an earlier run are kept and counted
+    in stats['seen_before']. Returns (unique_jobs, stats).
+    """
+    store = store or get_seen_store()
+    deduplicator = Deduplicator(threshold)
+    for key, signature, company in store.applied():
+        deduplicator.add_known(signature, "applied", key, company)
+
+    unique_jobs = []
+    stats = {"duplicates": 0, "already_applied": 0}
+    for job in jobs:
+        label, _ = deduplicator.check(job)
+        if label == "applied":
+            stats["already_applied"] += 1
+        elif label is not None:
+            stats["duplicates"] += 1
+        else:
+            unique_jobs.append(job)
+
+    stats["seen_before"] = len(store.seen_keys(posting_key(job) for job in unique_jobs))
+    store.mark_seen(unique_jobs)
+    return unique_jobs, stats
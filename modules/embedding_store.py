@@ -0,0 +1,221 @@
+# modules/embedding_store.py
+# Persistent embedding cache and long-lived FAISS index for the RAG engine.
+# Chunks are embedded once, keyed by a hash of their content, and the FAISS
+# index grows as new job descriptions are seen instead of being rebuilt.
+import hashlib
+import os
+import re
+import threading
+import zlib
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+import config
+from modules import sqlite_store, tracing
+
+def text_hash(text):
+    """Returns a stable hash of a piece of text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def chunk_id(source_id, chunk):
+    """Returns the index id of a chunk belonging to a source document."""
+    return text_hash(f"{source_id}\x00{chunk}")
+
+def embeddings_model_name(embeddings):
+    """Returns the name vectors from an embedding backend are stored under."""
+    return getattr(embeddings, "model", None) or type(embeddings).__name__
+
+class EmbeddingCache(sqlite_store.SQLiteStore):
+    """SQLite store of embedding vectors keyed by model name and text hash."""
+
+    def __init__(self, path=":memory:"):
+        super().__init__(path, ["CREATE TABLE IF NOT EXISTS vectors (key TEXT PRIMARY KEY, vector BLOB)"])
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(model, text):
+        return text_hash(f"{model}\x00{text}")
+
+    def get_many(self, model, texts):
+        """Returns a list with the cached vector of each text, or None where it is missing."""
+        keys = [self._key(model, text) for text in texts]
+        found = {}
+        with self._lock:
+            for key, blob in self._select_in("SELECT key, vector FROM vectors WHERE key IN ({})", keys):
+                found[key] = np.frombuffer(blob, dtype=np.float32).tolist()
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return [found.get(key) for key in keys]
+
+    def set_many(self, model, texts, vectors):
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO vectors VALUES (?, ?)",
+                [(self._key(model, text), np.asarray(vector, dtype=np.float32).tobytes())
+                 for text, vector in zip(texts, vectors)],
+            )
+            self._conn.commit()
+
+    def stats(self):
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM vectors").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+class CachedEmbeddings(Embeddings):
+    """Wraps a LangChain embeddings backend so each distinct text is only embedded once."""
+
+    def __init__(self, embeddings, cache, model_name=None):
+        self.embeddings = embeddings
+        self.cache = cache
+        self.model = model_name or embeddings_model_name(embeddings)
+
+    def embed_documents(self, texts):
+        with tracing.span("embeddings.embed_documents", model=self.model, texts=len(texts)) as span:
+            vectors = self.cache.get_many(self.model, texts)
+            missing = sorted({text for text, vector in zip(texts, vectors) if vector is None})
+            span.set(cache_hit=not missing, embedded=len(missing))
+            if missing:
+                computed = dict(zip(missing, self.embeddings.embed_documents(missing)))
+                self.cache.set_many(self.model, missing, [computed[text] for text in missing])
+                vectors = [computed[text] if vector is None else vector for text, vector in zip(texts, vectors)]
+            return vectors
+
+    def embed_query(self, text):
+        with tracing.span("embeddings.embed_query", model=self.model) as span:
+            # Queries may be embedded differently from documents, so they get their own keys
+            key = f"query:{text}"
+            vector = self.cache.get_many(self.model, [key])[0]
+            span.set(cache_hit=vector is not None)
+            if vector is None:
+                vector = self.embeddings.embed_query(text)
+                self.cache.set_many(self.model, [key], [vector])
+            return vector
+
+class HashEmbeddings(Embeddings):
+    """
+    Deterministic local embedding backend: a normalised bag of hashed words.
+    Needs no network, so the RAG engine can be exercised offline.
+    """
+
+    def __init__(self, size=256):
+        self.size = size
+        self.model = f"hash-{size}"
+
+    def _embed(self, text):
+        vector = np.zeros(self.size, dtype=np.float32)
+        for word in re.findall(r"\w+", text.lower()):
+            vector[zlib.crc32(word.encode("utf-8")) % self.size] += 1
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm else vector).tolist()
+
+    def embed_documents(self, texts):
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text):
+        return self._embed(text)
+
+class VectorIndex:
+    """
+    Long-lived FAISS index of document chunks, saved to and loaded from disk.
+    Every chunk carries its source_id in metadata, and the FAISS positions of
+    each source's chunks are kept, so a search only scans the chunks of the
+    current selection however large the index has grown.
+    """
+
+    def __init__(self, path, embeddings):
+        self.path = path
+        self.embeddings = embeddings
+        self.store = None
+        self.ids = set()
+        self.positions = {}  # source_id -> FAISS positions of its chunks
+        self._lock = threading.Lock()
+        if path and os.path.exists(os.path.join(path, "index.faiss")):
+            from langchain_community.vectorstores import FAISS
+            self.store = FAISS.load_local(path, embeddings, allow_dangerous_deserialization=True)
+            self.ids = set(self.store.index_to_docstore_id.values())
+            self._index_positions(0)
+
+    def _index_positions(self, start):
+        """Records the source of every FAISS position from start on."""
+        for position in range(start, self.store.index.ntotal):
+            doc = self.store.docstore.search(self.store.index_to_docstore_id[position])
+            self.positions.setdefault(doc.metadata["source_id"], []).append(position)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add_source(self, source_id, chunks, metadata=None):
+        """Adds the chunks of one source document. Returns how many were new to the index."""
+        with self._lock, tracing.span("rag.index_add", chunks=len(chunks)) as span:
+            # Checked under the lock so concurrent runs never add the same chunk twice
+            new_ids, new_chunks = [], []
+            for chunk in chunks:
+                cid = chunk_id(source_id, chunk)
+                if cid not in self.ids and cid not in new_ids:
+                    new_ids.append(cid)
+                    new_chunks.append(chunk)
+            if not new_ids:
+                return 0
+
+            metadatas = [{**(metadata or {}), "source_id": source_id, "chunk_id": cid} for cid in new_ids]
+            start = 0 if self.store is None else self.store.index.ntotal
+            if self.store is None:
+                from langchain_community.vectorstores import FAISS
+                self.store = FAISS.from_texts(new_chunks, self.embeddings, metadatas=metadatas, ids=new_ids)
+            else:
+                self.store.add_texts(new_chunks, metadatas=metadatas, ids=new_ids)
+            self.positions.setdefault(source_id, []).extend(range(start, self.store.index.ntotal))
+            self.ids.update(new_ids)
+            span.set(added=len(new_ids))
+        return len(new_ids)
+
+    def search(self, query, source_ids, k=4):
+        """Returns the k chunks most similar to the query, searching only the given sources."""
+        if self.store is None:
+            return []
+        import faiss
+        # The query is embedded outside the lock
+        vector = np.asarray([self.embeddings.embed_query(query)], dtype=np.float32)
+        if self.store._normalize_L2:
+            faiss.normalize_L2(vector)
+        with self._lock, tracing.span("rag.index_search", sources=len(source_ids)) as span:
+            positions = [p for source_id in source_ids for p in self.positions.get(source_id, ())]
+            span.set(chunks=len(positions))
+            if not positions:
+                return []
+            # The selector restricts FAISS to these chunks, so the cost follows
+            # the selection rather than the size of the index
+            selector = faiss.IDSelectorBatch(np.asarray(positions, dtype=np.int64))
+            _, found = self.store.index.search(vector, min(k, len(positions)),
+                                               params=faiss.SearchParameters(sel=selector))
+            return [self.store.docstore.search(self.store.index_to_docstore_id[position])
+                    for position in found[0] if position != -1]
+
+    def save(self):
+        if self.path and self.store is not None:
+            with self._lock:
+                os.makedirs(self.path, exist_ok=True)
+                self.store.save_local(self.path)
+
+_caches = sqlite_store.Registry(EmbeddingCache)
+_indexes = {}
+_registry_lock = threading.Lock()
+
+def get_default_cache():
+    """Returns the process-wide embedding cache configured in config.py."""
+    return _caches.get(config.EMBEDDING_CACHE_PATH)
+
+def get_vector_index(embeddings, index_dir=None):
+    """
+    Returns the long-lived index for an embedding backend, loading it from disk
+    on first use. Each backend gets its own subdirectory, since vectors from
+    different models cannot share an index.
+    """
+    name = re.sub(r"[^\w.-]+", "_", embeddings_model_name(embeddings))
+    path = os.path.join(index_dir or config.RAG_INDEX_DIR, name)
+    with _registry_lock:
+        if path not in _indexes:
+            _indexes[path] = VectorIndex(path, embeddings)
+        return _indexes[path]
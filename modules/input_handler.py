@@ -1,20 +1,178 @@
 # modules/input_handler.py
-import PyPDF2
-import docx
+# Resumes are parsed once: the extracted text and its sections are cached by
+# content hash, with the file's path, mtime and size as a shortcut, so later
+# runs only re-read a resume when the file actually changed.
+import hashlib
+import json
+import os
+from collections import namedtuple
 
-def parse_resume(file_path):
-    """Parses a resume file (PDF or DOCX) and returns its text content."""
-    text = ""
+import config
+from modules import sqlite_store
+
+# A parsed resume: its text and the (section, text) pairs it splits into
+ParsedResume = namedtuple("ParsedResume", ["path", "text", "sections"])
+
+# Words that make a short line on its own (e.g. "SKILLS:", "Key Responsibilities") a section heading
+SECTION_WORDS = (
+    "summary", "profile", "objective", "experience", "employment", "education", "skills",
+    "projects", "certifications", "publications", "awards", "responsibilities",
+    "requirements", "qualifications", "about", "benefits", "nice to have",
+)
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx")
+
+def split_sections(text):
+    """Splits a document on heading lines. Returns a list of (section, text) pairs."""
+    sections = []
+    name, lines = "summary", []
+    for line in text.splitlines():
+        heading = line.strip().rstrip(":").lower()
+        if heading and len(heading.split()) <= 4 and any(word in heading for word in SECTION_WORDS):
+            if any(l.strip() for l in lines):
+                sections.append((name, "\n".join(lines).strip()))
+            name, lines = heading, []
+        else:
+            lines.append(line)
+    if any(l.strip() for l in lines):
+        sections.append((name, "\n".join(lines).strip()))
+    return sections or [("summary", text)]
+
+def iter_pages(file_path):
+    """Yields the text of a PDF page by page, or of a DOCX paragraph by paragraph."""
+    # The parsers are imported here so importing this module stays cheap
     if file_path.endswith('.pdf'):
+        import PyPDF2
         with open(file_path, 'rb') as file:
-            reader = PyPDF2.PdfReader(file)
-            for page in reader.pages:
-                text += page.extract_text()
+            for page in PyPDF2.PdfReader(file).pages:
+                yield page.extract_text() or ""
     elif file_path.endswith('.docx'):
-        doc = docx.Document(file_path)
-        for para in doc.paragraphs:
-            text += para.text + "\n"
-    else:
+        import docx
+        for para in docx.Document(file_path).paragraphs:
+            yield para.text
+
+def extract_text(file_path):
+    """Extracts a resume's text, joining the pages once at the end."""
+    return "\n".join(iter_pages(file_path))
+
+def _parse_file(file_path):
+    """Extracts text and sections; runs in pool workers for parse_resumes()."""
+    text = extract_text(file_path)
+    return text, split_sections(text)
+
+def file_hash(file_path):
+    """SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+class ResumeCache(sqlite_store.SQLiteStore):
+    """
+    SQLite cache of parsed resumes keyed by content hash. The (path, mtime,
+    size) of each file last seen is remembered, so an unchanged file is found
+    without hashing it and a touched-but-identical file without re-parsing it.
+    """
+
+    def __init__(self, path=":memory:"):
+        super().__init__(path, [
+            "CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, mtime REAL, size INTEGER, hash TEXT)",
+            "CREATE TABLE IF NOT EXISTS parsed (hash TEXT PRIMARY KEY, text TEXT, sections TEXT)",
+        ])
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, file_path):
+        """Returns (content hash, cached (text, sections) or None)."""
+        path = os.path.abspath(file_path)
+        stat = os.stat(path)
+        with self._lock:
+            row = self._conn.execute("SELECT mtime, size, hash FROM files WHERE path = ?", (path,)).fetchone()
+        if row is not None and row[0] == stat.st_mtime and row[1] == stat.st_size:
+            digest = row[2]
+        else:
+            digest = file_hash(path)
+            with self._lock:
+                self._conn.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)",
+                                   (path, stat.st_mtime, stat.st_size, digest))
+                self._conn.commit()
+        with self._lock:
+            row = self._conn.execute("SELECT text, sections FROM parsed WHERE hash = ?", (digest,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return digest, None
+            self.hits += 1
+        return digest, (row[0], [tuple(section) for section in json.loads(row[1])])
+
+    def store(self, digest, text, sections):
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO parsed VALUES (?, ?, ?)",
+                               (digest, text, json.dumps(sections)))
+            self._conn.commit()
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses}
+
+_caches = sqlite_store.Registry(ResumeCache)
+
+def get_default_cache():
+    """Returns the process-wide resume cache stored at config.RESUME_CACHE_PATH."""
+    return _caches.get(config.RESUME_CACHE_PATH)
+
+def load_resume(file_path, cache=None):
+    """Parses a resume file (PDF or DOCX) into a ParsedResume, or returns None for an unsupported format."""
+    if not file_path.endswith(SUPPORTED_EXTENSIONS):
         print(f"Unsupported file format: {file_path}")
         return None
-    return text
+    cache = cache or get_default_cache()
+    digest, parsed = cache.lookup(file_path)
+    if parsed is None:
+        parsed = _parse_file(file_path)
+        cache.store(digest, *parsed)
+    return ParsedResume(file_path, *parsed)
+
+def parse_resume(file_path):
+    """Parses a resume file (PDF or DOCX) and returns its text content."""
+    parsed = load_resume(file_path)
+    return parsed.text if parsed else None
+
+def parse_resumes(file_paths, workers=None, cache=None):
+    """
+    Parses many resumes, returning a ParsedResume (or None) per path, in order.
+    Cached resumes are read straight from the cache; the rest are parsed in
+    parallel across a process pool. A file that is missing, unreadable or
+    fails to parse is reported and gets None.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    cache = cache or get_default_cache()
+    results = [None] * len(file_paths)
+    misses = {}  # content hash -> indexes of the paths with that content
+    for i, file_path in enumerate(file_paths):
+        if not file_path.endswith(SUPPORTED_EXTENSIONS):
+            print(f"Unsupported file format: {file_path}")
+            continue
+        try:
+            digest, parsed = cache.lookup(file_path)
+        except OSError as e:
+            print(f"❌ Could not read {file_path}: {e}")
+            continue
+        if parsed is None:
+            misses.setdefault(digest, []).append(i)
+        else:
+            results[i] = ParsedResume(file_path, *parsed)
+
+    if misses:
+        paths = [file_paths[indexes[0]] for indexes in misses.values()]
+        with ProcessPoolExecutor(max_workers=workers or config.RESUME_PARSE_WORKERS) as executor:
+            futures = [executor.submit(_parse_file, path) for path in paths]
+            for (digest, indexes), path, future in zip(misses.items(), paths, futures):
+                try:
+                    parsed = future.result()
+                except Exception as e:
+                    print(f"❌ Could not parse {path}: {e}")
+                    continue
+                cache.store(digest, *parsed)
+                for i in indexes:
+                    results[i] = ParsedResume(file_paths[i], *parsed)
+    return results
@@ -0,0 +1,310 @@
+# modules/job_index.py
+# Persistent job-corpus index: keeps a hashed term-count vector and the
+# document-frequency statistics for every posting we have seen, so a new
+# resume can be scored against the whole stored corpus without re-tokenizing it.
+# The postings themselves live in a SQLite side store and are only read (by
+# key) when a caller asks for them, so loading the index does not parse them.
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import HashingVectorizer
+
+from modules import sqlite_store
+from modules.job_records import JobRecord, TextStore
+
+# Hashed feature space. A fixed vocabulary is what makes incremental add and
+# remove possible without refitting anything.
+N_FEATURES = 2 ** 20
+_ARRAYS = ("data", "indices", "indptr", "alive", "df")
+_RECORDS = "records.sqlite3"
+
+def content_hash(text):
+    """Returns a stable hash of a job description."""
+    return hashlib.sha1((text or "").encode("utf-8")).hexdigest()
+
+def job_key(job):
+    """Returns the index key of a job: a hash of its URL, or of its description if it has none."""
+    return content_hash(job.get('url') or job.get('description', ''))
+
+class RecordStore(sqlite_store.SQLiteStore):
+    """SQLite store of an index's postings, read by key."""
+
+    def __init__(self, path=":memory:"):
+        super().__init__(path, ["CREATE TABLE IF NOT EXISTS jobs (key TEXT PRIMARY KEY, job TEXT)"])
+
+    def get_many(self, keys):
+        """Returns {key: job dict} for the stored keys."""
+        with self._lock:
+            rows = self._select_in("SELECT key, job FROM jobs WHERE key IN ({})", keys)
+            return {key: json.loads(job) for key, job in rows}
+
+    def put_many(self, jobs):
+        """Stores {key: job dict} in one transaction."""
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO jobs VALUES (?, ?)",
+                                   [(key, json.dumps(job)) for key, job in jobs.items()])
+            self._conn.commit()
+
+    def delete_many(self, keys):
+        with self._lock:
+            self._conn.executemany("DELETE FROM jobs WHERE key = ?", [(key,) for key in keys])
+            self._conn.commit()
+
+class JobIndex:
+    """
+    On-disk index of job postings keyed by URL hash.
+    Each row stores raw term counts; IDF weights are derived from the stored
+    document frequencies at query time, so adding or removing a posting only
+    touches that posting's row. Records are read from the record store on
+    first use and kept; save() only writes the ones that changed.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.keys = []      # row number -> job key
+        self.rows = {}      # job key -> row number
+        self.hashes = {}    # job key -> content hash of the description
+        self.jobs = {}      # job key -> JobRecord (those read or added so far)
+        self.texts = TextStore()  # descriptions of the records in self.jobs
+        self._store = None  # RecordStore of a saved (or loaded) index
+        self._added = set()    # keys added or replaced since the last save
+        self._removed = set()  # keys removed since the last save
+        self.counts = sparse.csr_matrix((0, N_FEATURES), dtype=np.float32)
+        self.alive = np.zeros(0, dtype=bool)
+        self.df = np.zeros(N_FEATURES, dtype=np.int32)
+        self._pending = []
+        self._idf = None
+        self._lock = threading.RLock()  # candidates in a batch share one index
+        self._vectorizer = HashingVectorizer(
+            n_features=N_FEATURES, stop_words='english',
+            alternate_sign=False, norm=None, dtype=np.float32,
+        )
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __contains__(self, key):
+        return key in self.rows
+
+    # --- Persistence ---
+
+    @classmethod
+    def load(cls, path):
+        """Loads an index from disk, memory-mapping the vector arrays. Records are read when asked for."""
+        index = cls(path)
+        if os.path.exists(os.path.join(path, "keys.npy")):
+            index.keys = [key.decode("ascii") for key in np.load(os.path.join(path, "keys.npy"))]
+            hashes = [digest.decode("ascii") for digest in np.load(os.path.join(path, "hashes.npy"))]
+            index._store = RecordStore(os.path.join(path, _RECORDS))
+        elif os.path.exists(os.path.join(path, "meta.json")):
+            # Saved before the record store existed: read everything once; the next save moves it over
+            with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+                meta = json.load(f)
+            index.keys = meta["keys"]
+            hashes = [meta["hashes"].get(key, "") for key in index.keys]
+            index.jobs = {key: JobRecord.from_dict(job, index.texts) for key, job in meta["jobs"].items()}
+            index._added = set(index.jobs)
+        else:
+            return index
+
+        arrays = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r') for name in _ARRAYS}
+        index.alive = arrays["alive"]
+        index.df = arrays["df"]
+        index.counts = sparse.csr_matrix(
+            (arrays["data"], arrays["indices"], arrays["indptr"]),
+            shape=(len(index.keys), N_FEATURES), copy=False,
+        )
+        live_rows = np.flatnonzero(index.alive).tolist()
+        index.rows = {index.keys[row]: row for row in live_rows}
+        index.hashes = {index.keys[row]: hashes[row] for row in live_rows}
+        return index
+
+    def save(self, path=None):
+        """
+        Writes the index to disk, dropping removed rows if they make up half of
+        it. Only records added or removed since the last save are written.
+        """
+        with self._lock:
+            path = path or self.path
+            os.makedirs(path, exist_ok=True)
+            self._flush()
+            if len(self.keys) and (~self.alive).sum() * 2 >= len(self.keys):
+                self.compact()
+
+            added = self._added
+            if self._store is None or self._store.path != os.path.join(path, _RECORDS):
+                # A new location gets every record
+                self.get_jobs(list(self.rows))
+                self._store = RecordStore(os.path.join(path, _RECORDS))
+                added = self.rows
+            # Records first and removals last, so the arrays never name a job the store lacks
+            self._store.put_many({key: self.jobs[key].to_dict() for key in added if key in self.rows})
+
+            arrays = {
+                "data": self.counts.data, "indices": self.counts.indices, "indptr": self.counts.indptr,
+                "alive": self.alive, "df": self.df, "keys": np.array(self.keys, dtype="S40"),
+                "hashes": np.array([self.hashes.get(key, "") for key in self.keys], dtype="S40"),
+            }
+            for name, array in arrays.items():
+                tmp = os.path.join(path, f"{name}.tmp.npy")
+                np.save(tmp, np.asarray(array))
+                os.replace(tmp, os.path.join(path, f"{name}.npy"))
+
+            self._store.delete_many([key for key in self._removed if key not in self.rows])
+            if os.path.exists(os.path.join(path, "meta.json")):
+                os.remove(os.path.join(path, "meta.json"))
+            self._added, self._removed = set(), set()
+            self.path = path
+
+    def compact(self):
+        """Physically drops removed rows (and the descriptions only they used)."""
+        with self._lock:
+            self._flush()
+            self.texts = TextStore()
+            self.jobs = {key: JobRecord.from_dict(job, self.texts) for key, job in self.jobs.items()}
+            live_rows = np.flatnonzero(self.alive)
+            self.counts = self.counts[live_rows]
+            self.keys = [self.keys[row] for row in live_rows]
+            self.alive = np.ones(len(self.keys), dtype=bool)
+            self.rows = {key: row for row, key in enumerate(self.keys)}
+
+    def get_jobs(self, keys):
+        """Returns the stored job records for the given keys, in order. Records are read-only, so they are shared."""
+        with self._lock:
+            missing = [key for key in keys if key not in self.jobs]
+            if missing and self._store is not None:
+                for key, job in self._store.get_many(missing).items():
+                    self.jobs[key] = JobRecord.from_dict(job, self.texts)
+            return [self.jobs[key] for key in keys]
+
+    # --- Incremental updates ---
+
+    def add_jobs(self, jobs):
+        """
+        Adds jobs to the index and returns their keys in input order.
+        Postings already stored with the same description are not re-vectorized;
+        postings whose description changed are replaced.
+        """
+        with self._lock:
+            keys, new_keys, new_texts = [], [], []
+            seen = set()
+            for job in jobs:
+                key = job_key(job)
+                keys.append(key)
+                text = job.get('description', '')
+                digest = content_hash(text)
+                if self.hashes.get(key) == digest or key in seen:
+                    continue
+                if key in self.rows:
+                    self.remove([key])
+                seen.add(key)
+                new_keys.append(key)
+                new_texts.append(text)
+                self.hashes[key] = digest
+                self.jobs[key] = JobRecord.from_dict(job, self.texts)
+                self._added.add(key)
+
+            if new_keys:
+                counts = self._vectorizer.transform(new_texts).tocsr()
+                self._writable()
+                np.add.at(self.df, counts.indices, 1)
+                start = len(self.keys)
+                for offset, key in enumerate(new_keys):
+                    self.keys.append(key)
+                    self.rows[key] = start + offset
+                self.alive = np.concatenate([self.alive, np.ones(len(new_keys), dtype=bool)])
+                self._pending.append(counts)
+                self._idf = None
+            return keys
+
+    def remove(self, keys):
+        """Removes jobs from the index. Their rows are dropped on the next compaction."""
+        with self._lock:
+            self._flush()
+            self._writable()
+            for key in keys:
+                row = self.rows.pop(key, None)
+                if row is None:
+                    continue
+                self.alive[row] = False
+                self.df[self.counts[row].indices] -= 1
+                self.hashes.pop(key, None)
+                self.jobs.pop(key, None)
+                self._added.discard(key)
+                self._removed.add(key)
+            self._idf = None
+
+    def _flush(self):
+        """Merges rows added since the last flush into the main matrix."""
+        if self._pending:
+            self.counts = sparse.vstack([self.counts] + self._pending, format='csr')
+            self._pending = []
+
+    def _writable(self):
+        """Copies memory-mapped arrays before they are modified."""
+        if isinstance(self.df, np.memmap):
+            self.df = np.array(self.df)
+        if isinstance(self.alive, np.memmap):
+            self.alive = np.array(self.alive)
+
+    # --- Scoring ---
+
+    def idf(self):
+        """Smoothed IDF weights over the stored corpus (same formula as TfidfVectorizer)."""
+        if self._idf is None:
+            n = len(self.rows)
+            self._idf = (np.log((1 + n) / (1 + np.asarray(self.df, dtype=np.float32))) + 1).astype(np.float32)
+        return self._idf
+
+    def _weighted_rows(self, matrix):
+        """Applies IDF weights to term counts and L2-normalises each row."""
+        idf = self.idf()
+        weighted = sparse.csr_matrix(
+            (matrix.data * idf[matrix.indices], matrix.indices, matrix.indptr), shape=matrix.shape,
+        )
+        norms = np.sqrt(np.asarray(weighted.multiply(weighted).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        return weighted, norms
+
+    def _query_vector(self, text):
+        """Weighted, normalised resume vector. Terms no stored job uses are dropped, as TfidfVectorizer does."""
+        counts = self._vectorizer.transform([text]).tocsr()
+        counts = counts.multiply(np.asarray(self.df) > 0).tocsr()
+        query, norms = self._weighted_rows(counts)
+        dense = np.zeros(N_FEATURES, dtype=np.float32)
+        dense[query.indices] = query.data / norms[0]
+        return dense
+
+    def score(self, resume_text, keys=None):
+        """Cosine TF-IDF scores of the resume against the given stored jobs (default: all)."""
+        with self._lock:
+            self._flush()
+            if keys is None:
+                keys = list(self.rows)
+            if not resume_text or not keys:
+                return np.zeros(len(keys))
+            rows = [self.rows[key] for key in keys]
+            weighted, norms = self._weighted_rows(self.counts[rows])
+            return (weighted @ self._query_vector(resume_text)) / norms
+
+    def score_texts(self, resume_text, jd_texts):
+        """Scores ad-hoc descriptions using the stored corpus statistics, without adding them."""
+        with self._lock:
+            if not resume_text or not jd_texts:
+                return np.zeros(len(jd_texts))
+            weighted, norms = self._weighted_rows(self._vectorizer.transform(jd_texts).tocsr())
+            return (weighted @ self._query_vector(resume_text)) / norms
+
+def load_index(path):
+    """Loads the job index at path, or returns an empty one bound to that path."""
+    return JobIndex.load(path)
+
+_indexes = sqlite_store.Registry(JobIndex.load)
+
+def get_index(path):
+    """Returns the process-wide index for path, loading it on first use."""
+    return _indexes.get(path)
@@ -0,0 +1,135 @@
+# modules/job_records.py
+# Compact in-memory job postings. A JobRecord keeps its fields in __slots__,
+# with titles, companies and locations interned (a few hundred distinct
+# values shared by thousands of postings) and the description held once in a
+# shared TextStore. Per-job results such as scores live in columns of a
+# JobTable rather than on the records, so records are never mutated or copied.
+import sys
+
+import numpy as np
+
+# Fields every posting has; anything else a source returns goes into `extra`
+FIELDS = ("title", "company", "location", "url")
+_STANDARD_KEYS = frozenset(FIELDS + ("description",))
+
+class TextStore:
+    """Append-only store of description texts; identical texts are stored once and share an id."""
+
+    def __init__(self):
+        self.texts = []
+        self._ids = {}  # text -> id (keys are the stored strings themselves)
+
+    def __len__(self):
+        return len(self.texts)
+
+    def add(self, text):
+        text = text or ""
+        text_id = self._ids.get(text)
+        if text_id is None:
+            text_id = self._ids[text] = len(self.texts)
+            self.texts.append(text)
+        return text_id
+
+    def get(self, text_id):
+        return self.texts[text_id]
+
+class JobRecord:
+    """
+    One job posting. Read it like the job dicts sources return
+    (job['title'], job.get('description', ''), {**job}). Records are shared
+    between callers (JobIndex.get_jobs does not copy them), so treat them as
+    read-only; there is no item assignment.
+    """
+    __slots__ = FIELDS + ("text_id", "store", "extra")
+
+    def __init__(self, title, company, location, url, text_id, store, extra=None):
+        self.title = sys.intern(title or "")
+        self.company = sys.intern(company or "")
+        self.location = sys.intern(location or "")
+        self.url = url or ""
+        self.text_id = text_id
+        self.store = store
+        self.extra = extra or None
+
+    @classmethod
+    def from_dict(cls, job, store):
+        """Builds a record from a job dict (or another record), adding its description to store."""
+        extra = None
+        if not _STANDARD_KEYS.issuperset(job.keys()):
+            extra = {key: value for key, value in job.items() if key not in _STANDARD_KEYS}
+        return cls(job.get("title"), job.get("company"), job.get("location"), job.get("url"),
+                   store.add(job.get("description")), store, extra)
+
+    @property
+    def description(self):
+        return self.store.get(self.text_id)
+
+    def keys(self):
+        return list(FIELDS) + ["description"] + list(self.extra or ())
+
+    def __getitem__(self, name):
+        if name in FIELDS or name == "description":
+            return getattr(self, name)
+        if self.extra and name in self.extra:
+            return self.extra[name]
+        raise KeyError(name)
+
+    def __contains__(self, name):
+        return name in FIELDS or name == "description" or bool(self.extra and name in self.extra)
+
+    def get(self, name, default=None):
+        try:
+            return self[name]
+        except KeyError:
+            return default
+
+    def __len__(self):
+        return len(FIELDS) + 1 + len(self.extra or ())
+
+    def items(self):
+        return [(name, self[name]) for name in self.keys()]
+
+    def to_dict(self):
+        return dict(self.items())
+
+    def __repr__(self):
+        return f"JobRecord({self.title!r} at {self.company!r})"
+
+class JobTable:
+    """
+    Jobs in ranked order with per-job columns: match and rerank scores as
+    float32 arrays (NaN where a job was not reranked), missing skills and
+    resume tips. Iterating yields the records.
+    """
+
+    def __init__(self, keys, records, match_scores, rerank_scores=None, missing_skills=None, tips=None):
+        self.keys = list(keys)
+        self.records = list(records)
+        self.match_scores = np.asarray(match_scores, dtype=np.float32)
+        self.rerank_scores = (np.full(len(self.records), np.nan, dtype=np.float32) if rerank_scores is None
+                              else np.asarray(rerank_scores, dtype=np.float32))
+        self.missing_skills = list(missing_skills) if missing_skills is not None else [()] * len(self.records)
+        self.tips = list(tips) if tips is not None else [None] * len(self.records)
+
+    @classmethod
+    def from_state(cls, keys, records, match_scores, rerank_scores=None, missing_skills=None):
+        """Builds a table from the score dicts kept in the graph state (keyed by job id)."""
+        rerank_scores = rerank_scores or {}
+        return cls(keys, records,
+                   [match_scores[key] for key in keys],
+                   [rerank_scores.get(key, np.nan) for key in keys],
+                   missing_skills)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def __getitem__(self, i):
+        return self.records[i]
+
+    def rerank_score(self, i):
+        """The reranker's score for row i, or None if the job was not reranked."""
+        score = self.rerank_scores[i]
+        return None if np.isnan(score) else float(score)
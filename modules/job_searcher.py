@@ -1,40 +1,201 @@
 # modules/job_searcher.py
-# IMPORTANT: This is a MOCK searcher. Real web scraping is complex and
+# IMPORTANT: The built-in source is a MOCK. Real web scraping is complex and
 # can be against a website's terms of service. Always use official APIs when available.
+#
+# Searches run across every (job title, source) pair concurrently and postings
+# are streamed out as each search finishes, so scoring can start on the first
+# results instead of waiting for the slowest source.
+import asyncio
+import threading
+from concurrent.futures import Future
+from urllib.parse import quote_plus, urljoin
 
-def search_jobs(job_titles, location):
-    """MOCK FUNCTION: Simulates searching for jobs and returning a list."""
+import config
+from modules import tracing
+
+class JobSource:
+    """A place jobs come from. Subclasses implement search()."""
+    name = "source"
+
+    def search(self, job_title, location):
+        """Returns a list of job dicts (title, company, location, url, description)."""
+        raise NotImplementedError
+
+class MockSource(JobSource):
+    """MOCK SOURCE: Simulates searching for jobs and returning a list."""
+    name = "mock"
+
+    def search(self, job_title, location):
+        # In a real implementation, you would use libraries like requests and BeautifulSoup
+        # or a dedicated API (e.g., LinkedIn API, if you have access) to get job data.
+        mock_jobs = [
+            {
+                "title": "Senior Data Scientist",
+                "company": "Innovate AI Inc.",
+                "location": location,
+                "url": "https://www.linkedin.com/jobs/view/12345",
+                "description": "Innovate AI is seeking a Senior Data Scientist with experience in Python, TensorFlow, and cloud platforms. You will develop machine learning models to solve complex business problems."
+            },
+            {
+                "title": "Machine Learning Engineer",
+                "company": "Tech Solutions LLC",
+                "location": location,
+                "url": "https://www.indeed.com/viewjob?jk=67890",
+                "description": "We are looking for an ML Engineer proficient in PyTorch, scikit-learn, and SQL. Experience with Natural Language Processing (NLP) is a huge plus. This role involves deploying models to production."
+            },
+            {
+                "title": "Junior Gen AI Engineer",
+                "company": "Future Forward",
+                "location": location,
+                "url": "https://careers.futureforward.com/job/11223",
+                "description": "Entry-level position for a Gen AI Engineer. Must have a foundational understanding of large language models (LLMs), Python, and basic deep learning concepts. No professional experience in AWS is required, but it is a bonus."
+            }
+        ]
+        # Filter mock jobs to somewhat match the input title
+        return [job for job in mock_jobs if job_title.split()[0].lower() in job['title'].lower()]
+
+class HTMLSource(JobSource):
+    """
+    Scrapes a job board's HTML search results with requests + BeautifulSoup.
+    search_url is a template with {title} and {location} placeholders; the
+    selectors are CSS selectors for one job card and, inside it, each field.
+    All searches on a source share one pooled HTTP session.
+    """
+
+    def __init__(self, name, search_url, card, title, company, url, description=None, location=None):
+        self.name = name
+        self.search_url = search_url
+        self.selectors = {"card": card, "title": title, "company": company, "url": url,
+                          "description": description, "location": location}
+        self._session = None
+
+    @property
+    def session(self):
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            self._session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=config.SEARCH_CONCURRENCY)
+            self._session.mount("http://", adapter)
+            self._session.mount("https://", adapter)
+        return self._session
+
+    def search(self, job_title, location):
+        url = self.search_url.format(title=quote_plus(job_title), location=quote_plus(location))
+        response = self.session.get(url, timeout=config.SEARCH_TIMEOUT)
+        response.raise_for_status()
+        return self.parse(response.text, url, location)
+
+    def parse(self, html, page_url, location):
+        """Extracts job dicts from a results page."""
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(html, "html.parser")
+
+        def text(card, field):
+            selector = self.selectors[field]
+            element = card.select_one(selector) if selector else None
+            return element.get_text(" ", strip=True) if element else ""
+
+        jobs = []
+        for card in soup.select(self.selectors["card"]):
+            link = card.select_one(self.selectors["url"])
+            if link is None or not link.get("href"):
+                continue
+            jobs.append({
+                "title": text(card, "title"),
+                "company": text(card, "company"),
+                "location": text(card, "location") or location,
+                "url": urljoin(page_url, link["href"]),
+                "description": text(card, "description"),
+            })
+        return jobs
+
+class SharedSource(JobSource):
+    """
+    Wraps a source so that identical searches (same title and location) run
+    once: concurrent callers wait for the first one, later callers get its
+    results. A failed search is forgotten, so the next caller tries it again.
+    Used by batch runs, where candidates' queries overlap.
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self.name = source.name
+        self.hits = 0
+        self.misses = 0
+        self._results = {}  # (title, location) -> Future
+        self._lock = threading.Lock()
+
+    def search(self, job_title, location):
+        key = (job_title.strip().lower(), location.strip().lower())
+        with self._lock:
+            future = self._results.get(key)
+            owner = future is None
+            if owner:
+                future = self._results[key] = Future()
+                self.misses += 1
+            else:
+                self.hits += 1
+        if owner:
+            try:
+                future.set_result(self.source.search(job_title, location))
+            except Exception as e:
+                with self._lock:
+                    del self._results[key]
+                future.set_exception(e)
+        return future.result()
+
+    def stats(self):
+        return {"searches": self.misses, "shared": self.hits}
+
+# Sources searched by default
+SOURCES = [MockSource()]
+
+async def stream_jobs(job_titles, location, sources=None, concurrency=None):
+    """
+    Async generator over postings from every (title, source) search.
+    Searches run concurrently on worker threads and each posting is yielded as
+    soon as its search finishes. A posting found by several searches (same URL)
+    is only yielded once; a failing search is reported and skipped.
+    """
+    sources = SOURCES if sources is None else sources
+    semaphore = asyncio.Semaphore(concurrency or config.SEARCH_CONCURRENCY)
+
+    def search(source, job_title):
+        with tracing.span("search.source", source=source.name, title=job_title) as span:
+            jobs = source.search(job_title, location)
+            span.set(jobs=len(jobs))
+            return jobs
+
+    async def run(source, job_title):
+        async with semaphore:
+            try:
+                return await asyncio.to_thread(search, source, job_title)
+            except Exception as e:
+                print(f"❌ {source.name} search for '{job_title}' failed: {e}")
+                return []
+
+    tasks = [asyncio.ensure_future(run(source, title)) for title in job_titles for source in sources]
+    seen = set()
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            for job in await next_done:
+                key = job.get('url') or job.get('description')
+                if key in seen:
+                    continue
+                seen.add(key)
+                yield job
+    finally:
+        for task in tasks:
+            task.cancel()
+
+def search_jobs(job_titles, location, sources=None):
+    """Searches every source for every title and returns all postings found."""
     print(f"🔍 Searching for {job_titles} jobs in {location}...")
-    
-    # In a real implementation, you would use libraries like requests and BeautifulSoup
-    # or a dedicated API (e.g., LinkedIn API, if you have access) to get job data.
-    
-    mock_jobs = [
-        {
-            "title": "Senior Data Scientist",
-            "company": "Innovate AI Inc.",
-            "location": location,
-            "url": "https://www.linkedin.com/jobs/view/12345",
-            "description": "Innovate AI is seeking a Senior Data Scientist with experience in Python, TensorFlow, and cloud platforms. You will develop machine learning models to solve complex business problems."
-        },
-        {
-            "title": "Machine Learning Engineer",
-            "company": "Tech Solutions LLC",
-            "location": location,
-            "url": "https://www.indeed.com/viewjob?jk=67890",
-            "description": "We are looking for an ML Engineer proficient in PyTorch, scikit-learn, and SQL. Experience with Natural Language Processing (NLP) is a huge plus. This role involves deploying models to production."
-        },
-        {
-            "title": "Junior Gen AI Engineer",
-            "company": "Future Forward",
-            "location": location,
-            "url": "https://careers.futureforward.com/job/11223",
-            "description": "Entry-level position for a Gen AI Engineer. Must have a foundational understanding of large language models (LLMs), Python, and basic deep learning concepts. No professional experience in AWS is required, but it is a bonus."
-        }
-    ]
-    
-    # Filter mock jobs to somewhat match the input titles
-    found_jobs = [job for job in mock_jobs if any(title.split()[0].lower() in job['title'].lower() for title in job_titles)]
-    
-    print(f"✅ Found {len(found_jobs)} mock jobs.")
+
+    async def collect():
+        return [job async for job in stream_jobs(job_titles, location, sources)]
+
+    found_jobs = asyncio.run(collect())
+    print(f"✅ Found {len(found_jobs)} jobs.")
     return found_jobs
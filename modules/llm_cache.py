@@ -0,0 +1,167 @@
+# modules/llm_cache.py
+# Content-addressed cache for LLM responses, so identical prompts are only
+# sent to the model once. Backed by SQLite with TTL and size-bounded LRU eviction.
+import hashlib
+import time
+from collections import namedtuple
+
+import config
+from modules import sqlite_store, tracing
+
+# What a cache hit returns: it exposes .content like a LangChain message
+CachedResponse = namedtuple("CachedResponse", ["content"])
+
+def normalize_prompt(prompt):
+    """Collapses whitespace so formatting-only differences map to the same key."""
+    return "\n".join(" ".join(line.split()) for line in prompt.strip().splitlines() if line.strip())
+
+def llm_model_name(llm):
+    """Returns the name an LLM's responses are cached under."""
+    return getattr(llm, "model", None) or type(llm).__name__
+
+def estimate_tokens(text):
+    """Rough token count (about 4 characters per token for English text)."""
+    return len(text) // 4 + 1
+
+def token_usage(prompt, response):
+    """(prompt, completion) token counts: the provider's usage metadata if given, else an estimate."""
+    usage = getattr(response, "usage_metadata", None) or {}
+    return (usage.get("input_tokens") or estimate_tokens(prompt),
+            usage.get("output_tokens") or estimate_tokens(response.content))
+
+def cache_key(model, prompt):
+    """Returns the cache key for a model name and prompt."""
+    return hashlib.sha256(f"{model}\x00{normalize_prompt(prompt)}".encode("utf-8")).hexdigest()
+
+class LLMCache(sqlite_store.SQLiteStore):
+    """
+    SQLite-backed response cache.
+    Entries older than ttl seconds are ignored and purged; once more than
+    max_entries are stored, the least recently used ones are evicted.
+    """
+
+    def __init__(self, path=":memory:", ttl=None, max_entries=None):
+        super().__init__(path, [
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, model TEXT, content TEXT,"
+            " created_at REAL, last_used REAL)",
+            "CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)",
+        ])
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, model, prompt):
+        """Returns the cached response text, or None on a miss."""
+        key = cache_key(model, prompt)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self.ttl is not None and now - row[1] > self.ttl:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def set(self, model, prompt, content):
+        """Stores a response and evicts expired and least recently used entries."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (cache_key(model, prompt), model, content, now, now),
+            )
+            if self.ttl is not None:
+                self._conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl,))
+            if self.max_entries is not None:
+                self._conn.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    " SELECT key FROM responses ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+            self._conn.commit()
+
+    def delete(self, model, prompt):
+        """Drops one cached response (e.g. an answer that turned out to be unusable)."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (cache_key(model, prompt),))
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def stats(self):
+        """Returns hit/miss counters and the number of stored entries."""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": entries,
+        }
+
+class CachedLLM:
+    """
+    Wraps any object with an invoke(prompt) method returning a response with
+    .content (a LangChain chat model or a fake for tests) and serves repeated
+    prompts from the cache. Other attributes are passed through to the wrapped LLM.
+    """
+
+    def __init__(self, llm, cache, model_name=None):
+        self.llm = llm
+        self.cache = cache
+        self.model_name = model_name or llm_model_name(llm)
+
+    def invoke(self, prompt, **kwargs):
+        with tracing.span("llm.invoke", model=self.model_name) as span:
+            if not isinstance(prompt, str):
+                # Message lists and prompt values are passed through uncached
+                return self.llm.invoke(prompt, **kwargs)
+            content = self.cache.get(self.model_name, prompt)
+            if content is not None:
+                span.set(cache_hit=True)
+                return CachedResponse(content)
+            response = self.llm.invoke(prompt, **kwargs)
+            self.cache.set(self.model_name, prompt, response.content)
+            if tracing.enabled():
+                prompt_tokens, completion_tokens = token_usage(prompt, response)
+                span.set(cache_hit=False, prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+            return response
+
+    def forget(self, prompt):
+        """Drops the cached response to a prompt, so the next invoke asks the model again."""
+        self.cache.delete(self.model_name, prompt)
+
+    def __getattr__(self, name):
+        return getattr(self.llm, name)
+
+_caches = sqlite_store.Registry(
+    lambda path: LLMCache(path, ttl=config.LLM_CACHE_TTL, max_entries=config.LLM_CACHE_MAX_ENTRIES)
+)
+
+def get_default_cache():
+    """Returns the process-wide cache configured in config.py."""
+    return _caches.get(config.LLM_CACHE_PATH)
+
+def print_stats(cache=None):
+    """Prints a cache's hit/miss counters (default: the process-wide cache, if this run used it)."""
+    cache = cache or _caches.peek(config.LLM_CACHE_PATH)
+    if cache is None:
+        return
+    stats = cache.stats()
+    if stats["hits"] + stats["misses"]:
+        print(f"💾 LLM cache: {stats['hits']} hits, {stats['misses']} misses "
+              f"({stats['hit_rate']:.0%} hit rate), {stats['entries']} entries stored")
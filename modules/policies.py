@@ -0,0 +1,29 @@
+# modules/policies.py
+# Non-interactive stand-ins for the selection and confirmation prompts, used
+# by batch runs. A policy is a plain dict so it can travel in the graph state.
+
+# top_k / min_score pick jobs from the ranked list; apply=False makes the run
+# a dry run (suggestions only); resume_path overrides the candidate's resume.
+DEFAULT_POLICY = {"top_k": 3, "min_score": 0.0, "apply": False, "resume_path": None}
+
+def resolve_policy(policy=None):
+    """Fills in defaults and rejects unknown keys."""
+    policy = dict(policy or {})
+    unknown = set(policy) - set(DEFAULT_POLICY)
+    if unknown:
+        raise ValueError(f"Unknown policy keys: {', '.join(sorted(unknown))}")
+    return {**DEFAULT_POLICY, **policy}
+
+def select_jobs(policy, job_table):
+    """Replaces get_user_selections: the best top_k jobs of a job_records.JobTable scoring at least min_score."""
+    policy = resolve_policy(policy)
+    eligible = [job for job, score in zip(job_table, job_table.match_scores) if score >= policy["min_score"]]
+    return eligible[:policy["top_k"]]
+
+def choose_resume(policy, job, default_resume_path):
+    """Replaces the "use the default resume?" prompt."""
+    return resolve_policy(policy)["resume_path"] or default_resume_path
+
+def confirm_application(policy, job):
+    """Whether to actually submit the application to this job."""
+    return bool(resolve_policy(policy)["apply"])
@@ -0,0 +1,158 @@
+# modules/prompt_batching.py
+# Packs many small LLM tasks of the same kind into one prompt with JSON
+# output, so per-request overhead, rate limits and the shared context (the
+# resume, the instructions) are paid once per batch instead of once per item.
+# Batches are filled up to a token budget; an answer that is not valid JSON,
+# or that misses items, is retried by splitting the batch, down to the
+# ordinary one-item prompt. A request that fails only costs the items it
+# carried (a rate limited one is retried with backoff by async_runner), and
+# unusable answers are not kept in the LLM cache.
+import json
+import re
+
+import config
+from modules import async_runner, tracing
+from modules.llm_cache import estimate_tokens
+
+BATCH_TEMPLATE = """{instruction}
+{shared}
+Answer each of the {count} items below separately. Reply with one JSON object mapping each item id
+(the number after ITEM) to its answer{answer_format}. Do not write anything outside the JSON object.
+
+{items}"""
+
+ITEM_TEMPLATE = "--- ITEM {id} ---\n{text}"
+
+class MalformedBatch(ValueError):
+    """The model's answer to a batch prompt was not the JSON object asked for."""
+
+def pack(texts, max_tokens=None, max_items=None, overhead=0):
+    """
+    Splits item texts into batches, in order: each batch holds at most
+    max_items items and (with the shared overhead) max_tokens estimated prompt
+    tokens. An item too large for any batch gets one to itself.
+    Returns a list of lists of item indices.
+    """
+    max_tokens = config.LLM_BATCH_TOKENS if max_tokens is None else max_tokens
+    max_items = config.LLM_BATCH_SIZE if max_items is None else max_items
+    batches, current, used = [], [], overhead
+    for i, text in enumerate(texts):
+        tokens = estimate_tokens(text)
+        if current and (len(current) >= max_items or used + tokens > max_tokens):
+            batches.append(current)
+            current, used = [], overhead
+        current.append(i)
+        used += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+def build_prompt(instruction, texts, shared="", answer_format=""):
+    """The batch prompt for the given item texts; item ids are their positions, from 1."""
+    items = "\n\n".join(ITEM_TEMPLATE.format(id=i, text=text) for i, text in enumerate(texts, 1))
+    shared = f"\n{shared.strip()}\n" if shared.strip() else ""
+    return BATCH_TEMPLATE.format(instruction=instruction.strip(), shared=shared, count=len(texts),
+                                 answer_format=answer_format, items=items)
+
+def parse_response(content, count):
+    """
+    Reads the {item id: answer} object out of a batch answer (tolerating code
+    fences and text around it). Returns {position: answer} for the ids in
+    1..count that it contains; raises MalformedBatch if there is no such object.
+    """
+    match = re.search(r"\{.*\}", content or "", re.DOTALL)
+    if match is None:
+        raise MalformedBatch("no JSON object in the answer")
+    try:
+        data = json.loads(match.group())
+    except json.JSONDecodeError as e:
+        raise MalformedBatch(f"invalid JSON: {e}") from None
+    if not isinstance(data, dict):
+        raise MalformedBatch("the answer is not a JSON object")
+    answers = {}
+    for key, value in data.items():
+        try:
+            position = int(str(key).strip().lstrip("#").split()[-1]) - 1
+        except (ValueError, IndexError):
+            continue
+        if 0 <= position < count:
+            answers[position] = value
+    return answers
+
+def _forget(llm, prompt):
+    """Drops a cached answer to prompt, if llm is a llm_cache.CachedLLM, so a rerun asks again."""
+    forget = getattr(llm, "forget", None)
+    if forget is not None:
+        forget(prompt)
+
+def _solve(llm, task, indices):
+    """
+    Answers the items at indices, splitting the batch as long as answers are
+    malformed or missing. Items whose request fails get None, except for rate
+    limit errors, which are raised so async_runner retries the batch.
+    """
+    if len(indices) == 1:
+        try:
+            return {indices[0]: task["single"](task["items"][indices[0]])}
+        except Exception as e:
+            if async_runner.is_rate_limit_error(e):
+                raise
+            print(f"❌ LLM request for one item failed: {e}")
+            return {indices[0]: None}
+
+    texts = [task["texts"][i] for i in indices]
+    prompt = build_prompt(task["instruction"], texts, task["shared"], task["answer_format"])
+    with tracing.span("llm.batch", items=len(indices)) as span:
+        try:
+            content = llm.invoke(prompt).content
+        except Exception as e:
+            if async_runner.is_rate_limit_error(e):
+                raise
+            print(f"❌ LLM batch of {len(indices)} items failed: {e}")
+            span.set(error=str(e))
+            return dict.fromkeys(indices)
+        try:
+            answers = parse_response(content, len(indices))
+        except MalformedBatch as e:
+            answers = {}
+            span.set(malformed=str(e))
+    results = {}
+    for position, answer in answers.items():
+        try:
+            results[indices[position]] = task["convert"](answer)
+        except (TypeError, ValueError):
+            pass  # retried below with the other missing items
+    missing = [i for i in indices if i not in results]
+    if missing:
+        _forget(llm, prompt)  # a rerun would otherwise pay for the same split again
+        # Retry the unanswered items: as one smaller batch if some were answered, else in halves
+        parts = [missing] if len(missing) < len(indices) else [missing[:len(missing) // 2], missing[len(missing) // 2:]]
+        for part in parts:
+            results.update(_solve(llm, task, part))
+    return results
+
+def run_batched(llm, items, texts, instruction, single, convert=lambda answer: answer, shared="",
+                answer_format="", max_tokens=None, max_items=None, **kwargs):
+    """
+    Answers one task per item with as few requests as the token budget allows.
+
+    texts[i] is how item i appears in the batch prompt; single(item) answers
+    one item with the ordinary unbatched prompt (used for batches of one and
+    as the last fallback); convert(answer) turns an item's JSON answer into
+    the result, raising ValueError or TypeError if it is unusable. Batches are
+    sent concurrently; keyword arguments go to async_runner.map_concurrently.
+    Returns one result per item, in order (None where an item failed).
+    """
+    task = {"items": items, "texts": texts, "instruction": instruction, "single": single, "convert": convert,
+            "shared": shared, "answer_format": answer_format}
+    overhead = estimate_tokens(build_prompt(instruction, [], shared, answer_format))
+    batches = pack(texts, max_tokens, max_items, overhead)
+    outcomes = async_runner.run_concurrently(lambda batch: _solve(llm, task, batch), batches, **kwargs)
+    results = [None] * len(items)
+    for batch, outcome in zip(batches, outcomes):
+        if isinstance(outcome, Exception):
+            print(f"❌ LLM batch of {len(batch)} items failed: {outcome}")
+            continue
+        for i, result in outcome.items():
+            results[i] = result
+    return results
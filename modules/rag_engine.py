@@ -1,59 +1,171 @@
 # modules/rag_engine.py
-from langchain_google_genai import ChatGoogleGenerativeAI, GoogleGenerativeAIEmbeddings
-from langchain.vectorstores import FAISS
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain.chains import RetrievalQA
+# langchain, the Google clients and embedding_store (which pulls in
+# langchain_core and numpy) are only imported when first needed
+import os
+
 import config
+from modules import llm_cache, async_runner, tracing
+from modules.llm_cache import estimate_tokens
+from modules.input_handler import split_sections
+
+# Created on first use by get_llm() / get_embeddings(); assign stand-ins to replace them
+llm = None
+embeddings = None
+
+def get_llm():
+    """Returns the LLM. Identical prompts (same question, same retrieved context) are answered from the local cache."""
+    global llm
+    if llm is None:
+        from langchain_google_genai import ChatGoogleGenerativeAI
+        llm = llm_cache.CachedLLM(
+            ChatGoogleGenerativeAI(model="gemini-pro", google_api_key=config.GOOGLE_API_KEY),
+            llm_cache.get_default_cache(),
+        )
+    return llm
+
+def get_embeddings():
+    """Returns the embedding backend. Every chunk is embedded once; later runs read the vector from the local cache."""
+    global embeddings
+    if embeddings is None:
+        from langchain_google_genai import GoogleGenerativeAIEmbeddings
+        from modules import embedding_store
+        embeddings = embedding_store.CachedEmbeddings(
+            GoogleGenerativeAIEmbeddings(model="models/embedding-001", google_api_key=config.GOOGLE_API_KEY),
+            embedding_store.get_default_cache(),
+        )
+    return embeddings
+
+# Same wording as LangChain's "stuff" question-answering prompt
+PROMPT_TEMPLATE = """Use the following pieces of context to answer the question at the end. If you don't know the answer, just say that you don't know, don't try to make up an answer.
+
+{context}
+
+Question: {question}
+Helpful Answer:"""
+
+class RagChain:
+    """
+    Knowledge base for one selection of jobs: chunk ids of the resume and of
+    each selected job description in the shared vector index.
+    """
+
+    def __init__(self, index, resume_source_id, job_source_ids):
+        self.index = index
+        self.resume_source_id = resume_source_id
+        self.job_source_ids = job_source_ids  # job id -> source id
+
+    def search(self, query, job_id=None, k=None):
+        """Retrieves the chunks most relevant to the query from the resume and one job (or all selected jobs)."""
+        if job_id is not None and job_id in self.job_source_ids:
+            source_ids = [self.resume_source_id, self.job_source_ids[job_id]]
+        else:
+            source_ids = [self.resume_source_id] + list(self.job_source_ids.values())
+        return self.index.search(query, source_ids, k or config.RAG_TOP_K)
 
-llm = ChatGoogleGenerativeAI(model="gemini-pro", google_api_key=config.GOOGLE_API_KEY)
-embeddings = GoogleGenerativeAIEmbeddings(model="models/embedding-001", google_api_key=config.GOOGLE_API_KEY)
+    def to_ref(self):
+        """Small, serializable reference to this chain (index location and source ids); see load_rag_chain()."""
+        return {
+            "index_dir": os.path.dirname(self.index.path),
+            "resume_source_id": self.resume_source_id,
+            "job_source_ids": dict(self.job_source_ids),
+        }
 
-def create_rag_chain(resume_text, job_descriptions):
+def load_rag_chain(ref, embedding_backend=None):
+    """Re-opens a chain saved with RagChain.to_ref() on the long-lived vector index, without embedding anything."""
+    from modules import embedding_store
+    index = embedding_store.get_vector_index(embedding_backend or get_embeddings(), ref["index_dir"])
+    return RagChain(index, ref["resume_source_id"], ref["job_source_ids"])
+
+@tracing.traced("rag.build")
+def create_rag_chain(resume_text, job_descriptions, job_ids=None, embedding_backend=None, index_dir=None,
+                     resume_sections=None):
     """
     Creates a RAG chain from the user's resume and a list of job descriptions.
+    job_ids label the descriptions (default: their positions) so queries can be
+    restricted to one job. Chunks are added to a long-lived vector index, so only
+    text never seen before is embedded. Pass embedding_backend
+    (e.g. embedding_store.HashEmbeddings()) to run without the Google embeddings API,
+    and resume_sections (from input_handler.load_resume()) to reuse the parsed sections.
     """
-    # 📚 1. Create the Knowledge Base
-    # Combine all text sources into one body of knowledge
-    knowledge_base_text = resume_text
-    for i, jd in enumerate(job_descriptions):
-        knowledge_base_text += f"\n\n--- JOB DESCRIPTION {i+1} ---\n{jd}"
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+    from modules import embedding_store
 
-    # ✂️ 2. Chunk the text
-    # Split the text into smaller, manageable pieces
-    text_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=100)
-    docs = text_splitter.create_documents([knowledge_base_text])
+    index = embedding_store.get_vector_index(embedding_backend or get_embeddings(), index_dir)
+    job_ids = list(range(len(job_descriptions))) if job_ids is None else list(job_ids)
 
-    # 🔗 3. Create Vector Store (The Retriever)
-    # Convert text chunks into vector embeddings and store them
+    # 📚 1. Create the Knowledge Base
+    # Each source is chunked on its own, section by section, so chunks never mix
+    # two documents and stay the same whichever jobs they are selected with
     print("🧠 Building RAG knowledge base from your resume and top jobs...")
-    vector_store = FAISS.from_documents(docs, embeddings)
-    retriever = vector_store.as_retriever()
-    
-    # ⛓️ 4. Create the RAG Chain
-    # This chain combines the retriever and the LLM
-    rag_chain = RetrievalQA.from_chain_type(
-        llm=llm,
-        chain_type="stuff",  # "Stuff" means it crams all retrieved context into the prompt
-        retriever=retriever,
-        return_source_documents=True
-    )
-    
-    print("✅ RAG chain created successfully!")
-    return rag_chain
+    text_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=100)
+
+    def add_source(text, kind, sections=None):
+        source_id = embedding_store.text_hash(text)
+        added = 0
+        for section, section_text in sections or split_sections(text):
+            # ✂️ 2. Chunk the text and 🔗 3. add unseen chunks to the vector store
+            chunks = [f"[{kind} / {section}]\n{chunk}" for chunk in text_splitter.split_text(section_text)]
+            added += index.add_source(source_id, chunks, {"kind": kind, "section": section})
+        return source_id, added
+
+    resume_source_id, new_chunks = add_source(resume_text, "resume", resume_sections)
+    job_source_ids = {}
+    for job_id, jd in zip(job_ids, job_descriptions):
+        job_source_ids[job_id], added = add_source(jd, "job description")
+        new_chunks += added
+    if new_chunks:
+        index.save()
 
-def query_rag_chain(rag_chain, job_title):
+    print(f"✅ RAG chain created successfully! ({new_chunks} new chunks embedded)")
+    return RagChain(index, resume_source_id, job_source_ids)
+
+def build_rag_prompt(rag_chain, job_title, job_id=None):
     """
-    Asks a specific question to the RAG chain to get tailored advice.
+    Builds the prompt sent to the LLM for a job: the question plus the retrieved
+    context, cut to the top-k chunks and the RAG_CONTEXT_TOKENS budget.
     """
+    context = "several job descriptions" if job_id is None else "the job description"
     query = f"""
-    Based on the provided context (my resume and several job descriptions), 
-    give me a highly detailed, step-by-step plan to tailor my resume specifically 
-    for the role of '{job_title}'. 
-    
+    Based on the provided context (my resume and {context}),
+    give me a highly detailed, step-by-step plan to tailor my resume specifically
+    for the role of '{job_title}'.
+
     Focus on:
     1. A summary statement to add at the top.
     2. Which specific skills from the job descriptions I should emphasize.
     3. How to rephrase bullet points in my experience section to match the job's requirements.
     """
-    result = rag_chain({"query": query})
-    return result['result']
+    chunks, used = [], 0
+    for doc in rag_chain.search(query, job_id):
+        tokens = estimate_tokens(doc.page_content)
+        if chunks and used + tokens > config.RAG_CONTEXT_TOKENS:
+            break
+        chunks.append(doc.page_content)
+        used += tokens
+    return PROMPT_TEMPLATE.format(context="\n\n".join(chunks), question=query)
+
+@tracing.traced("rag.query")
+def query_rag_chain(rag_chain, job_title, job_id=None):
+    """
+    Asks a specific question to the RAG chain to get tailored advice.
+    With a job_id, only the resume and that job's description are searched.
+    """
+    return get_llm().invoke(build_rag_prompt(rag_chain, job_title, job_id)).content
+
+def query_rag_many(rag_chain, job_titles, job_ids=None, **kwargs):
+    """
+    Runs query_rag_chain for many job titles concurrently.
+    Returns one answer per title, in order. Keyword arguments are passed to
+    async_runner.map_concurrently (concurrency, rate, max_retries, backoff).
+    """
+    job_ids = [None] * len(job_titles) if job_ids is None else list(job_ids)
+    results = async_runner.run_concurrently(
+        lambda item: query_rag_chain(rag_chain, *item), list(zip(job_titles, job_ids)), **kwargs
+    )
+    answers = []
+    for title, result in zip(job_titles, results):
+        if isinstance(result, Exception):
+            print(f"❌ Could not get suggestions for {title}: {result}")
+            result = ""
+        answers.append(result)
+    return answers
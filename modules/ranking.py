@@ -0,0 +1,97 @@
+# modules/ranking.py
+# Two-stage ranking for large job sets. The job index's TF-IDF scores every
+# posting in one sparse product and keeps the top K; only those K go to the
+# expensive reranker (embedding similarity, or an LLM judgement), which works
+# through them best-first until its latency budget runs out.
+import time
+from collections import namedtuple
+
+import numpy as np
+
+import config
+from modules import tracing
+
+# job_ids: every job, best first (reranked top K, then the rest by TF-IDF)
+# match_scores: TF-IDF score per job id; rerank_scores: reranker score per reranked job id
+Ranking = namedtuple("Ranking", ["job_ids", "match_scores", "rerank_scores"])
+
+# Descriptions and resumes are cut to this many characters before embedding
+EMBED_MAX_CHARS = 8000
+EMBED_BATCH = 32
+
+def rerank_with_embeddings(resume_text, jd_texts, deadline):
+    """
+    Cosine similarity between the resume's and each description's embedding
+    (cached, see embedding_store). Descriptions are embedded in batches, best
+    first; the ones not reached before the deadline get None.
+    """
+    from modules import rag_engine
+    embeddings = rag_engine.get_embeddings()
+    resume = np.asarray(embeddings.embed_documents([resume_text[:EMBED_MAX_CHARS]])[0], dtype=np.float32)
+    resume /= np.linalg.norm(resume) or 1
+    scores = [None] * len(jd_texts)
+    for start in range(0, len(jd_texts), EMBED_BATCH):
+        if time.monotonic() >= deadline:
+            break
+        batch = [text[:EMBED_MAX_CHARS] for text in jd_texts[start:start + EMBED_BATCH]]
+        vectors = np.asarray(embeddings.embed_documents(batch), dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1)
+        norms[norms == 0] = 1
+        scores[start:start + len(batch)] = ((vectors @ resume) / norms).tolist()
+    return scores
+
+def rerank_with_llm(resume_text, jd_texts, deadline):
+    """
+    LLM rating of each description (analysis_engine.rate_match), as many at a
+    time as LLM_CONCURRENCY (times LLM_BATCH_SIZE, when batching) allows,
+    best first, until the deadline.
+    """
+    from modules import analysis_engine
+    scores = [None] * len(jd_texts)
+    step = max(1, config.LLM_CONCURRENCY) * max(1, config.LLM_BATCH_SIZE)
+    for start in range(0, len(jd_texts), step):
+        if time.monotonic() >= deadline:
+            break
+        scores[start:start + step] = analysis_engine.rate_matches_many(resume_text, jd_texts[start:start + step])
+    return scores
+
+RERANKERS = {"none": None, "embedding": rerank_with_embeddings, "llm": rerank_with_llm}
+
+def rank_jobs(resume_text, job_ids, index, top_k_jobs=None, budget=None, reranker=None):
+    """
+    Ranks jobs stored in a job_index.JobIndex against a resume. Returns a Ranking.
+    Defaults come from config.RANK_TOP_K, RANK_BUDGET_SEC and RANK_RERANKER.
+    A reranker that fails or runs out of time leaves the jobs it did not score
+    in TF-IDF order, after the ones it did.
+    """
+    top_k_jobs = config.RANK_TOP_K if top_k_jobs is None else top_k_jobs
+    budget = config.RANK_BUDGET_SEC if budget is None else budget
+    name = reranker or config.RANK_RERANKER
+    if name not in RERANKERS:
+        raise ValueError(f"Unknown reranker {name!r}; expected one of {', '.join(RERANKERS)}")
+
+    # Stage 1: TF-IDF over the whole set, one sparse product
+    from modules import analysis_engine
+    scores, order = analysis_engine.score_keys_with_index(resume_text, job_ids, index)
+    match_scores = {job_ids[i]: float(scores[i]) for i in order}
+    ranked = [job_ids[i] for i in order]
+    if RERANKERS[name] is None or not top_k_jobs or not ranked:
+        return Ranking(ranked, match_scores, {})
+
+    # Stage 2: the reranker only sees the top K
+    candidates, rest = ranked[:top_k_jobs], ranked[top_k_jobs:]
+    jd_texts = [job.get('description', '') for job in index.get_jobs(candidates)]
+    with tracing.span("rank.rerank", reranker=name, jobs=len(candidates), budget=budget) as span:
+        try:
+            rerank = RERANKERS[name](resume_text, jd_texts, time.monotonic() + budget)
+        except Exception as e:
+            print(f"⚠️ {name} reranker failed, keeping the TF-IDF order: {e}")
+            rerank = [None] * len(candidates)
+        rerank_scores = {job_id: round(float(score), 4)
+                         for job_id, score in zip(candidates, rerank) if score is not None}
+        span.set(reranked=len(rerank_scores))
+
+    # Stable sort: equal reranker scores, and unscored jobs, keep their TF-IDF order
+    reranked = sorted((job_id for job_id in candidates if job_id in rerank_scores), key=lambda j: -rerank_scores[j])
+    unscored = [job_id for job_id in candidates if job_id not in rerank_scores]
+    return Ranking(reranked + unscored + rest, match_scores, rerank_scores)
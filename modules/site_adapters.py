@@ -0,0 +1,158 @@
+# modules/site_adapters.py
+# Per-site application flows. Each step waits on an explicit condition
+# (element present/clickable, page loaded, network idle, upload finished)
+# with its own timeout instead of sleeping for a fixed time, and records how
+# long it actually took.
+import time
+from collections import namedtuple
+
+import config
+from modules import tracing
+
+# How long one step took; ok is False if it failed or timed out
+StepTiming = namedtuple("StepTiming", ["step", "seconds", "ok"])
+
+# --- Wait conditions ---
+
+def wait_until(driver, condition, timeout, poll_frequency=0.1):
+    """Polls condition(driver) until it returns something truthy, and returns that."""
+    from selenium.webdriver.support.ui import WebDriverWait
+    return WebDriverWait(driver, timeout, poll_frequency=poll_frequency).until(condition)
+
+def wait_for_page_load(driver, timeout):
+    """Waits until the document has finished loading."""
+    wait_until(driver, lambda d: d.execute_script("return document.readyState") == "complete", timeout)
+
+def wait_for_network_idle(driver, timeout, idle_time=0.5):
+    """Waits until the page has loaded and no new resources were fetched for idle_time seconds."""
+    wait_for_page_load(driver, timeout)
+    state = {"count": -1, "since": time.monotonic()}
+
+    def idle(d):
+        count = d.execute_script("return performance.getEntriesByType('resource').length")
+        now = time.monotonic()
+        if count != state["count"]:
+            state["count"], state["since"] = count, now
+        return now - state["since"] >= idle_time
+
+    wait_until(driver, idle, timeout)
+
+def wait_present(driver, locator, timeout):
+    """Waits for an element to be in the DOM and returns it."""
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+    return WebDriverWait(driver, timeout).until(EC.presence_of_element_located(locator))
+
+def wait_clickable(driver, locator, timeout):
+    """Waits for an element to be visible and enabled and returns it."""
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+    return WebDriverWait(driver, timeout).until(EC.element_to_be_clickable(locator))
+
+def wait_upload_complete(driver, file_input, timeout, done_locator=None):
+    """Waits until the file input holds a file and, if given, the site's upload indicator is shown."""
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+    wait = WebDriverWait(driver, timeout)
+    wait.until(lambda d: d.execute_script("return arguments[0].files.length > 0", file_input))
+    if done_locator:
+        wait.until(EC.visibility_of_element_located(done_locator))
+
+# --- Adapters ---
+
+class SiteAdapter:
+    """
+    Base class for a site's application flow. Subclasses implement steps(),
+    returning (name, action, timeout) tuples; action(driver) must wait for
+    whatever condition tells it the step is done. A timeout of None means
+    config.STEP_TIMEOUT.
+    """
+    name = "generic"
+    submit = True  # whether the flow really sends the application (False: a dry run)
+
+    def matches(self, job_url):
+        return False
+
+    def steps(self, job_url, resume_path):
+        return []
+
+    def apply(self, driver, job_url, resume_path, timings=None):
+        """Runs every step in order. Step durations are appended to timings; a failing step raises."""
+        timings = [] if timings is None else timings
+        for name, action, timeout in self.steps(job_url, resume_path):
+            start = time.perf_counter()
+            try:
+                with tracing.span(f"browser.{name}", site=self.name):
+                    action(driver, timeout or config.STEP_TIMEOUT)
+            except Exception:
+                timings.append(StepTiming(f"{self.name}.{name}", time.perf_counter() - start, False))
+                raise
+            timings.append(StepTiming(f"{self.name}.{name}", time.perf_counter() - start, True))
+        return timings
+
+class EasyApplyAdapter(SiteAdapter):
+    """
+    "Easy Apply" style flow: open the posting, click the apply button, upload
+    the resume, find the submit button. Selectors are (By, value) locators,
+    e.g. ("xpath", "//button") -- By.XPATH is just the string "xpath".
+    """
+
+    def __init__(self, name, url_pattern, apply_button, file_input, submit_button,
+                 upload_done=None, submit=False):
+        self.name = name
+        self.url_pattern = url_pattern
+        self.apply_button = apply_button
+        self.file_input = file_input
+        self.submit_button = submit_button
+        self.upload_done = upload_done
+        self.submit = submit  # False keeps this a simulation
+
+    def matches(self, job_url):
+        return self.url_pattern in job_url
+
+    def steps(self, job_url, resume_path):
+        def open_posting(driver, timeout):
+            driver.get(job_url)
+            wait_for_network_idle(driver, timeout)
+
+        def click_apply(driver, timeout):
+            wait_clickable(driver, self.apply_button, timeout).click()
+
+        def upload_resume(driver, timeout):
+            file_input = wait_present(driver, self.file_input, timeout)
+            file_input.send_keys(resume_path)
+            wait_upload_complete(driver, file_input, timeout, self.upload_done)
+
+        def find_submit(driver, timeout):
+            submit_button = wait_clickable(driver, self.submit_button, timeout)
+            if self.submit:
+                submit_button.click()
+
+        return [
+            ("open", open_posting, None),
+            ("easy_apply", click_apply, None),
+            ("upload_resume", upload_resume, None),
+            ("submit", find_submit, None),
+        ]
+
+# Registered adapters, checked in order. Benchmarks register fixture adapters here too.
+ADAPTERS = []
+
+def register(adapter):
+    ADAPTERS.append(adapter)
+    return adapter
+
+def find_adapter(job_url):
+    """Returns the adapter that handles job_url, or None."""
+    for adapter in ADAPTERS:
+        if adapter.matches(job_url):
+            return adapter
+    return None
+
+# --- THIS LOGIC IS HIGHLY SPECIFIC TO A WEBSITE ---
+register(EasyApplyAdapter(
+    "linkedin", "linkedin.com",
+    apply_button=("xpath", "//button[contains(., 'Easy Apply')]"),
+    file_input=("css selector", "input[type='file']"),
+    submit_button=("xpath", "//button[contains(., 'Submit application')]"),
+))
@@ -0,0 +1,313 @@
+# modules/skills.py
+# Skill extraction: a gazetteer of skills (canonical name -> aliases) compiled
+# into an Aho-Corasick automaton, so every skill mentioned in a job
+# description or resume is found in one linear pass over the text. Skill sets
+# of job descriptions are cached by content hash, which makes per-job skill
+# gaps for thousands of postings a matter of set differences.
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import Counter, deque
+
+import config
+from modules import sqlite_store
+
+# Canonical skill -> aliases (matched case-insensitively, on word boundaries).
+# Only the aliases are matched, not the canonical name, so skills whose name is
+# also a plain English word ("R", "Go", "Excel", "Spark") are only found in
+# unambiguous forms.
+TAXONOMY = {
+    # Languages
+    "Python": ["python"],
+    "Java": ["java"],
+    "Scala": ["scala"],
+    "Go": ["golang", "go lang"],
+    "Rust": ["rust"],
+    "C++": ["c++", "cpp"],
+    "C#": ["c#", "csharp"],
+    "JavaScript": ["javascript", "js", "ecmascript"],
+    "TypeScript": ["typescript"],
+    "R": ["r programming", "r language", "rstudio"],
+    "Julia": ["julia"],
+    "Bash": ["bash", "shell scripting"],
+    "SQL": ["sql", "t-sql", "pl/sql"],
+    # Data and ML libraries
+    "pandas": ["pandas"],
+    "NumPy": ["numpy"],
+    "SciPy": ["scipy"],
+    "scikit-learn": ["scikit-learn", "scikit learn", "sklearn"],
+    "TensorFlow": ["tensorflow", "tf2"],
+    "Keras": ["keras"],
+    "PyTorch": ["pytorch", "torch"],
+    "JAX": ["jax"],
+    "XGBoost": ["xgboost"],
+    "LightGBM": ["lightgbm"],
+    "Hugging Face": ["hugging face", "huggingface", "transformers library"],
+    "LangChain": ["langchain"],
+    "LlamaIndex": ["llamaindex", "llama index"],
+    "OpenCV": ["opencv"],
+    "spaCy": ["spacy"],
+    "NLTK": ["nltk"],
+    "Matplotlib": ["matplotlib"],
+    # ML domains
+    "Machine Learning": ["machine learning"],
+    "Deep Learning": ["deep learning", "neural networks", "neural network"],
+    "NLP": ["nlp", "natural language processing"],
+    "Computer Vision": ["computer vision"],
+    "LLMs": ["llms", "llm", "large language models", "large language model"],
+    "Generative AI": ["generative ai", "genai", "gen ai"],
+    "RAG": ["rag", "retrieval augmented generation", "retrieval-augmented generation"],
+    "Prompt Engineering": ["prompt engineering"],
+    "Reinforcement Learning": ["reinforcement learning"],
+    "Recommender Systems": ["recommender systems", "recommendation systems"],
+    "Time Series": ["time series", "time-series", "time series forecasting"],
+    "Statistics": ["statistics", "statistical modeling", "statistical modelling"],
+    "A/B Testing": ["a/b testing", "ab testing", "a/b tests", "split testing"],
+    "Feature Engineering": ["feature engineering"],
+    "MLOps": ["mlops"],
+    "MLflow": ["mlflow"],
+    "Kubeflow": ["kubeflow"],
+    "Vector Databases": ["vector database", "vector databases", "faiss", "pinecone", "weaviate", "milvus"],
+    # Data engineering
+    "Spark": ["pyspark", "apache spark", "spark sql", "spark streaming"],
+    "Hadoop": ["hadoop", "hdfs"],
+    "Kafka": ["kafka"],
+    "Airflow": ["airflow"],
+    "dbt": ["dbt"],
+    "Snowflake": ["snowflake"],
+    "BigQuery": ["bigquery", "big query"],
+    "Redshift": ["redshift"],
+    "Databricks": ["databricks"],
+    "ETL": ["etl", "elt", "data pipelines", "data pipeline"],
+    "Data Warehousing": ["data warehousing", "data warehouse"],
+    # Databases
+    "PostgreSQL": ["postgresql", "postgres"],
+    "MySQL": ["mysql"],
+    "MongoDB": ["mongodb", "mongo"],
+    "Redis": ["redis"],
+    "Elasticsearch": ["elasticsearch", "elastic search", "opensearch"],
+    "NoSQL": ["nosql"],
+    # Cloud and infrastructure
+    "AWS": ["aws", "amazon web services", "sagemaker"],
+    "GCP": ["gcp", "google cloud", "vertex ai"],
+    "Azure": ["azure"],
+    "Docker": ["docker", "dockerfile"],
+    "Kubernetes": ["kubernetes", "k8s"],
+    "Terraform": ["terraform"],
+    "CI/CD": ["ci/cd", "continuous integration", "github actions", "jenkins"],
+    "Linux": ["linux", "unix"],
+    "Git": ["git"],
+    # Web and services
+    "REST APIs": ["rest api", "rest apis", "restful"],
+    "GraphQL": ["graphql"],
+    "FastAPI": ["fastapi"],
+    "Flask": ["flask"],
+    "Django": ["django"],
+    "React": ["reactjs", "react.js", "react hooks", "react components"],
+    "Node.js": ["node.js", "nodejs"],
+    "Microservices": ["microservices", "microservice"],
+    # Analytics
+    "Tableau": ["tableau"],
+    "Power BI": ["power bi", "powerbi"],
+    "Looker": ["looker"],
+    "Excel": ["ms excel", "microsoft excel", "advanced excel", "excel spreadsheets"],
+    "Data Visualization": ["data visualization", "data visualisation"],
+}
+
+def _normalize(text):
+    """Lower-cases and collapses whitespace, so aliases match across line breaks."""
+    return re.sub(r"\s+", " ", (text or "").lower())
+
+def _is_word_char(char):
+    return char.isalnum() or char == "_"
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over the aliases of a taxonomy. extract() walks the
+    text once, whatever the number of aliases, and keeps matches that start
+    and end on word boundaries (so "java" does not match inside "javascript").
+    Only the aliases are matched; the canonical names are what it returns.
+    """
+
+    def __init__(self, taxonomy=None):
+        self.taxonomy = taxonomy or TAXONOMY
+        # Changes whenever the taxonomy does, so cached skill sets are not reused across versions
+        self.version = hashlib.sha1(json.dumps(self.taxonomy, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+        self._goto = [{}]     # state -> {char: state}
+        self._fail = [0]
+        self._output = [[]]   # state -> [(alias length, skill)] ending here
+        for skill, aliases in self.taxonomy.items():
+            for alias in {_normalize(a).strip() for a in aliases}:
+                if alias:
+                    self._add(alias, skill)
+        self._build_failure_links()
+
+    def _add(self, alias, skill):
+        state = 0
+        for char in alias:
+            if char not in self._goto[state]:
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[state][char] = len(self._goto) - 1
+            state = self._goto[state][char]
+        self._output[state].append((len(alias), skill))
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                # Aliases that are suffixes of this one end here too
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def extract(self, text):
+        """Returns the canonical skills mentioned in text, sorted."""
+        text = _normalize(text)
+        found = set()
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for end, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length, skill in output[state]:
+                if skill in found:
+                    continue
+                start = end - length + 1
+                if (start == 0 or not _is_word_char(text[start - 1])) and \
+                        (end + 1 == len(text) or not _is_word_char(text[end + 1])):
+                    found.add(skill)
+        return sorted(found)
+
+def load_taxonomy(path=None):
+    """The built-in taxonomy, extended (or overridden per skill) by the JSON file at path if there is one."""
+    path = path if path is not None else config.SKILL_TAXONOMY_PATH
+    taxonomy = dict(TAXONOMY)
+    if path and os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            taxonomy.update(json.load(f))
+    return taxonomy
+
+_matcher = None
+_matcher_lock = threading.Lock()
+
+def get_matcher():
+    """Returns the process-wide matcher, compiling the taxonomy on first use."""
+    global _matcher
+    with _matcher_lock:
+        if _matcher is None:
+            _matcher = SkillMatcher(load_taxonomy())
+        return _matcher
+
+def text_hash(text):
+    """Returns the key a text's skills are cached under."""
+    return hashlib.sha1((text or "").encode("utf-8")).hexdigest()
+
+class SkillCache(sqlite_store.SQLiteStore):
+    """
+    SQLite cache of extracted skill sets keyed by content hash and matcher
+    version, with an in-memory layer in front of it.
+    """
+
+    def __init__(self, path=":memory:"):
+        super().__init__(path, [
+            "CREATE TABLE IF NOT EXISTS skills (hash TEXT, version TEXT, skills TEXT, PRIMARY KEY (hash, version))"
+        ])
+        self.hits = 0
+        self.misses = 0
+        self._memory = {}
+
+    def get_many(self, digests, version):
+        """Returns {hash: skills} for the hashes that are cached."""
+        found = {}
+        with self._lock:
+            missing = []
+            for digest in set(digests):
+                if (digest, version) in self._memory:
+                    found[digest] = self._memory[(digest, version)]
+                else:
+                    missing.append(digest)
+            rows = self._select_in("SELECT hash, skills FROM skills WHERE version = ? AND hash IN ({})",
+                                   missing, [version])
+            for digest, skills in rows:
+                found[digest] = self._memory[(digest, version)] = json.loads(skills)
+            self.hits += len(found)
+            self.misses += len(set(digests)) - len(found)
+        return found
+
+    def put_many(self, items, version):
+        """Stores {hash: skills} in one transaction."""
+        with self._lock:
+            for digest, skills in items.items():
+                self._memory[(digest, version)] = skills
+            self._conn.executemany("INSERT OR REPLACE INTO skills VALUES (?, ?, ?)",
+                                   [(digest, version, json.dumps(skills)) for digest, skills in items.items()])
+            self._conn.commit()
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses}
+
+_caches = sqlite_store.Registry(SkillCache)
+
+def get_default_cache():
+    """Returns the process-wide skill cache stored at config.SKILL_CACHE_PATH."""
+    return _caches.get(config.SKILL_CACHE_PATH)
+
+def extract_skills(text, matcher=None):
+    """Returns the canonical skills mentioned in a text, sorted."""
+    return (matcher or get_matcher()).extract(text)
+
+def extract_skills_many(texts, matcher=None, cache=None):
+    """
+    Returns the skills of each text, in order. Skill sets are cached by
+    content hash, so only texts not seen before are scanned.
+    """
+    matcher = matcher or get_matcher()
+    cache = cache or get_default_cache()
+    digests = [text_hash(text) for text in texts]
+    known = cache.get_many(digests, matcher.version)
+    new = {}
+    for digest, text in zip(digests, texts):
+        if digest not in known and digest not in new:
+            new[digest] = matcher.extract(text)
+    if new:
+        cache.put_many(new, matcher.version)
+        known.update(new)
+    return [known[digest] for digest in digests]
+
+def skill_gap(resume_skills, job_skills):
+    """
+    Compares a resume's skills with a job's. Returns a dict with the skills the
+    job asks for, the ones the resume has ("matched"), the ones it lacks
+    ("missing") and the share of the job's skills covered.
+    """
+    have = set(resume_skills)
+    matched = [skill for skill in job_skills if skill in have]
+    missing = [skill for skill in job_skills if skill not in have]
+    return {
+        "job_skills": list(job_skills), "matched": matched, "missing": missing,
+        "coverage": round(len(matched) / len(job_skills), 2) if job_skills else 1.0,
+    }
+
+def aggregate_gaps(gaps, weights=None, top_n=10):
+    """
+    Ranks the skills missing across many jobs. Each job counts once per missing
+    skill, times its weight (e.g. its match score) if weights are given.
+    Returns [(skill, weighted count, number of jobs)], most wanted first.
+    """
+    weighted, jobs = Counter(), Counter()
+    for i, gap in enumerate(gaps):
+        weight = 1.0 if weights is None else float(weights[i])
+        for skill in gap["missing"]:
+            weighted[skill] += weight
+            jobs[skill] += 1
+    ranked = sorted(weighted, key=lambda skill: (-weighted[skill], -jobs[skill], skill))
+    return [(skill, round(weighted[skill], 2), jobs[skill]) for skill in ranked[:top_n]]
@@ -0,0 +1,57 @@
+# modules/sqlite_store.py
+# The SQLite plumbing shared by the caches and stores: one connection per
+# file, created along with its directory and tables and shared by threads
+# behind a lock, chunked "IN (...)" lookups, and process-wide registries of
+# stores keyed by path.
+import os
+import sqlite3
+import threading
+
+# Keys per "IN (...)" query, to stay under SQLite's limit on query parameters
+CHUNK_SIZE = 500
+
+class SQLiteStore:
+    """
+    Base class of the SQLite-backed stores. Subclasses pass the statements
+    creating their tables and hold self._lock whenever they use self._conn.
+    """
+
+    def __init__(self, path=":memory:", schema=()):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        for statement in schema:
+            self._conn.execute(statement)
+        self._conn.commit()
+
+    def _select_in(self, query, keys, params=()):
+        """
+        Yields the rows of query for all keys, where "{}" in query stands for
+        the IN list and params are bound before the keys. The caller holds
+        self._lock.
+        """
+        keys = list(keys)
+        for start in range(0, len(keys), CHUNK_SIZE):
+            chunk = keys[start:start + CHUNK_SIZE]
+            yield from self._conn.execute(query.format(",".join("?" * len(chunk))), [*params, *chunk])
+
+class Registry:
+    """Process-wide stores keyed by path, each created by factory(path) on first use."""
+
+    def __init__(self, factory):
+        self.factory = factory
+        self._stores = {}
+        self._lock = threading.Lock()
+
+    def get(self, path):
+        with self._lock:
+            if path not in self._stores:
+                self._stores[path] = self.factory(path)
+            return self._stores[path]
+
+    def peek(self, path):
+        """The store at path if one was created, else None."""
+        with self._lock:
+            return self._stores.get(path)
@@ -0,0 +1,170 @@
+# modules/tracing.py
+# Lightweight spans for the agent graph. Graph nodes, LLM and embedding calls,
+# searches and browser steps record their wall time, token counts, cache hits
+# and errors as spans, exported as JSON lines and summarised per stage
+# (p50/p95) at the end of a run. While tracing is off, span() and traced()
+# return immediately, so instrumented code pays one global lookup per call.
+import atexit
+import contextvars
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+import uuid
+
+import config
+
+_tracer = None
+_current = contextvars.ContextVar("current_span", default=None)
+_ids = itertools.count(1)
+
+class _NoopSpan:
+    """What span() returns while tracing is off."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+_NOOP = _NoopSpan()
+
+class Span:
+    """One timed operation. Attributes added with set() end up in the trace."""
+
+    def __init__(self, tracer, name, attrs):
+        self.tracer = tracer
+        self.name = name
+        self.attrs = attrs
+        self.span_id = next(_ids)
+        self.parent_id = None
+        self.error = None
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        parent = _current.get()
+        self.parent_id = parent.span_id if parent is not None else None
+        self._token = _current.set(self)
+        self.start = time.time()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration = time.perf_counter() - self._start
+        _current.reset(self._token)
+        if exc_type is not None:
+            self.error = f"{exc_type.__name__}: {exc}"
+        self.tracer.record(self)
+        return False
+
+class Tracer:
+    """Collects finished spans and appends them to a JSON lines file (if a path is given)."""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.trace_id = uuid.uuid4().hex[:12]  # tells runs apart in a shared trace file
+        self.spans = []
+        self._lock = threading.Lock()
+        self._file = None
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._file = open(path, "a", encoding="utf-8")
+
+    def record(self, span):
+        row = {
+            "trace_id": self.trace_id, "name": span.name, "span_id": span.span_id, "parent_id": span.parent_id,
+            "start": span.start, "duration_ms": round(span.duration * 1000, 3),
+            "thread": threading.current_thread().name, "error": span.error, **span.attrs,
+        }
+        with self._lock:
+            self.spans.append(row)
+            if self._file:
+                self._file.write(json.dumps(row, default=str) + "\n")
+
+    def close(self):
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+def enable(path=None):
+    """Starts recording spans, appending them to path (default: config.TRACE_PATH) if set."""
+    global _tracer
+    disable()
+    _tracer = Tracer(path or config.TRACE_PATH)
+    atexit.register(_tracer.close)
+    return _tracer
+
+def disable():
+    """Stops recording spans. Returns the tracer that was active, if any."""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    if tracer is not None:
+        tracer.close()
+    return tracer
+
+def enabled():
+    return _tracer is not None
+
+def span(name, **attrs):
+    """Context manager timing the enclosed block as a span (a no-op while tracing is off)."""
+    if _tracer is None:
+        return _NOOP
+    return Span(_tracer, name, attrs)
+
+def traced(name=None):
+    """Decorator recording every call of a function as a span."""
+    def decorate(fn):
+        span_name = name or f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _tracer is None:
+                return fn(*args, **kwargs)
+            with Span(_tracer, span_name, {}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def _percentile(sorted_values, q):
+    index = min(len(sorted_values) - 1, max(0, round(q * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def summarize(spans=None):
+    """Per-stage statistics: count, errors, total/p50/p95/max milliseconds, tokens and cache hits."""
+    spans = (_tracer.spans if _tracer else []) if spans is None else spans
+    stages = {}
+    for row in spans:
+        stages.setdefault(row["name"], []).append(row)
+    summary = {}
+    for name, rows in stages.items():
+        durations = sorted(row["duration_ms"] for row in rows)
+        summary[name] = {
+            "count": len(rows),
+            "errors": sum(1 for row in rows if row.get("error")),
+            "total_ms": sum(durations),
+            "p50_ms": _percentile(durations, 0.5),
+            "p95_ms": _percentile(durations, 0.95),
+            "max_ms": durations[-1],
+            "tokens": sum(row.get("prompt_tokens", 0) + row.get("completion_tokens", 0) for row in rows),
+            "cache_hits": sum(1 for row in rows if row.get("cache_hit")),
+        }
+    return summary
+
+def print_summary(spans=None):
+    """Prints the per-stage summary table, slowest stages first."""
+    summary = summarize(spans)
+    if not summary:
+        return
+    print("\n--- ⏱️ Trace summary ---")
+    print(f"{'stage':<32} {'count':>6} {'err':>4} {'total ms':>10} {'p50 ms':>9} {'p95 ms':>9} {'tokens':>8} {'cached':>7}")
+    for name, stats in sorted(summary.items(), key=lambda item: -item[1]["total_ms"]):
+        print(f"{name:<32} {stats['count']:>6} {stats['errors']:>4} {stats['total_ms']:>10.1f} "
+              f"{stats['p50_ms']:>9.1f} {stats['p95_ms']:>9.1f} {stats['tokens']:>8} {stats['cache_hits']:>7}")
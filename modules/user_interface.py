@@ -13,25 +13,31 @@ def get_initial_input():
     location = input("Enter your desired location (e.g., 'Chennai, India'): ")
     return resume_path, desired_job, location
 
-def display_jobs(job_list):
-    """Displays the ranked list of jobs."""
+def display_jobs(job_table):
+    """Displays the ranked list of jobs (a job_records.JobTable)."""
     print("\n--- 📊 Here are the top job matches for you ---")
-    if not job_list:
+    if not len(job_table):
         print("No jobs found.")
         return
         
-    for i, job in enumerate(job_list, 1):
-        print(f"{i}. {job['title']} at {job['company']}")
-        print(f"   Match Score: {job['match_score'] * 100:.0f}% {' düşük eşleşme' if job['match_score'] < 0.2 else ''}")
+    for i, job in enumerate(job_table):
+        match_score = float(job_table.match_scores[i])
+        print(f"{i + 1}. {job['title']} at {job['company']}")
+        print(f"   Match Score: {match_score * 100:.0f}% {' düşük eşleşme' if match_score < 0.2 else ''}")
+        rerank_score = job_table.rerank_score(i)
+        if rerank_score is not None:
+            print(f"   Rerank Score: {rerank_score:.2f}")
         print(f"   Location: {job['location']}")
         print(f"   URL: {job['url']}")
-        if job.get('suggestions'):
-            print(f"   💡 Resume Tip: {job['suggestions']}")
+        if job_table.missing_skills[i]:
+            print(f"   🧩 Missing skills: {', '.join(job_table.missing_skills[i])}")
+        if job_table.tips[i]:
+            print(f"   💡 Resume Tip: {job_table.tips[i]}")
         print("-" * 20)
 
 def get_user_selections(job_list):
     """Asks the user to select which jobs to apply for."""
-    if not job_list:
+    if not len(job_list):
         return []
         
     selections = input("\nEnter the numbers of the jobs you want to apply for (comma-separated), or 'q' to quit: ")
@@ -1,144 +1,355 @@
 # multi_agent_main.py
 
+import asyncio
 import os
-from typing import List, TypedDict, Optional
+import time
+from typing import Dict, List, TypedDict, Optional
 
 # --- Assume all our modules are available ---
-from modules import (
-    input_handler, 
-    analysis_engine, 
-    job_searcher, 
-    application_automator, 
-    user_interface, 
-    rag_engine
-)
-from langgraph.graph import StateGraph, END
+# Only the modules needed before the first prompt are imported here. The rest
+# (and langchain, langgraph, scikit-learn, selenium, FAISS behind them) are
+# imported by the nodes that use them, so the CLI starts instantly.
+from modules import input_handler, llm_cache, tracing, user_interface
+import config
 
 # --- 1. Define the Agent State  ---
 class AgentState(TypedDict):
-    """Represents the shared state of our agent system."""
+    """
+    Represents the shared state of our agent system. It is checkpointed after
+    every node, so it stays small: jobs are referenced by their key in the job
+    index, and the RAG chain by its vector index location and source ids.
+    """
     resume_text: str
+    resume_sections: Optional[List[tuple]]
     default_resume_path: str
     job_query: str
     location: str
     expanded_job_titles: Optional[List[str]]
-    found_jobs: Optional[List[dict]]
-    analyzed_jobs: Optional[List[dict]]
-    selected_jobs: Optional[List[dict]]
+    found_job_ids: Optional[List[str]]
+    analyzed_job_ids: Optional[List[str]]  # best match first (see ranking.rank_jobs)
+    match_scores: Optional[Dict[str, float]]  # TF-IDF
+    rerank_scores: Optional[Dict[str, float]]  # reranker scores of the top RANK_TOP_K jobs
+    skills_to_learn: Optional[List[tuple]]  # (skill, weighted count, jobs) most missing across the analyzed jobs
+    selected_job_ids: Optional[List[str]]
+    rag_chain_ref: Optional[dict]
+    suggestions: Optional[Dict[str, str]]
+    applied_job_ids: Optional[List[str]]  # including jobs applied to in earlier runs
+    submitted_job_ids: Optional[List[str]]  # only the applications this run sent
     final_feedback: str
+    # Batch mode: who the run is for and the policy that replaces the prompts
+    candidate: Optional[str]
+    policy: Optional[dict]
 
 # --- 2. Define the Agent Nodes ---
+# Each node returns only the keys it changes; LangGraph merges them into the state.
 
-def search_agent_node(state: AgentState) -> AgentState:
+@tracing.traced("node.searcher")
+def search_agent_node(state: AgentState) -> dict:
     """Agent responsible for searching for jobs."""
     print("--- AGENT: Searcher ---")
-    print("Expanding job search...")
-    expanded_titles = analysis_engine.expand_job_titles(state["job_query"])
+    from modules import analysis_engine, job_index, job_searcher
+    # Batch runs expand every candidate's query up front, in batched prompts
+    expanded_titles = state.get("expanded_job_titles")
+    if not expanded_titles:
+        print("Expanding job search...")
+        expanded_titles = analysis_engine.expand_job_titles(state["job_query"])
     print(f"Searching for: {expanded_titles}")
     
-    found_jobs = job_searcher.search_jobs(expanded_titles, state["location"])
+    # Postings are vectorized into the job index as they stream in, so the
+    # analyst only has to score them once the slowest source has answered
+    index = job_index.get_index(config.JOB_INDEX_DIR)
+    job_stream = job_searcher.stream_jobs(expanded_titles, state["location"])
+    found_jobs = asyncio.run(analysis_engine.index_job_stream(job_stream, index))
+    # Saved now so the job ids in the checkpoint still resolve if the run is resumed later
+    index.save()
+    print(f"✅ Found {len(found_jobs)} jobs.")
     
-    return {**state, "expanded_job_titles": expanded_titles, "found_jobs": found_jobs}
+    return {"expanded_job_titles": expanded_titles, "found_job_ids": [job_index.job_key(job) for job in found_jobs]}
 
-def analysis_agent_node(state: AgentState) -> AgentState:
+@tracing.traced("node.deduper")
+def dedup_agent_node(state: AgentState) -> dict:
+    """Agent that drops duplicate postings and jobs already applied to."""
+    print("\n--- AGENT: Deduplicator ---")
+    from modules import dedup, job_index
+    found_jobs = job_index.get_index(config.JOB_INDEX_DIR).get_jobs(state["found_job_ids"])
+    store = dedup.get_seen_store(dedup.store_path(state.get("candidate")))
+    unique_jobs, stats = dedup.dedupe_jobs(found_jobs, store)
+    print(f"🧹 Kept {len(unique_jobs)} of {len(found_jobs)} postings "
+          f"({stats['duplicates']} duplicates, {stats['already_applied']} already applied).")
+    return {"found_job_ids": [job_index.job_key(job) for job in unique_jobs]}
+
+@tracing.traced("node.analyst")
+def analysis_agent_node(state: AgentState) -> dict:
     """Agent responsible for analyzing and ranking jobs."""
     print("\n--- AGENT: Analyst ---")
+    from modules import analysis_engine, job_index, ranking
     print("Analyzing jobs against your resume...")
-    analyzed_jobs = []
-    resume_text = state["resume_text"]
-    
-    for job in state["found_jobs"]:
-        score, _ = analysis_engine.compare_resume_to_jd(resume_text, job.get('description', ''))
-        job['match_score'] = score
-        analyzed_jobs.append(job)
-        
-    analyzed_jobs.sort(key=lambda x: x['match_score'], reverse=True)
-    return {**state, "analyzed_jobs": analyzed_jobs}
+    job_ids = state["found_job_ids"]
+    index = job_index.get_index(config.JOB_INDEX_DIR)
+    # TF-IDF over every job, then the configured reranker over the best RANK_TOP_K
+    ranked = ranking.rank_jobs(state["resume_text"], job_ids, index)
+    if ranked.rerank_scores:
+        print(f"Reranked the top {len(ranked.rerank_scores)} of {len(job_ids)} jobs with the {config.RANK_RERANKER} reranker.")
+
+    # Skills missing across the corpus, weighted by how well each job matches otherwise
+    jd_texts = [job.get('description', '') for job in index.get_jobs(job_ids)]
+    weights = [ranked.match_scores[job_id] for job_id in job_ids]
+    to_learn = analysis_engine.skills_to_learn(state["resume_text"], jd_texts, weights=weights)
+    if to_learn:
+        print("📚 Skills most often missing: " + ", ".join(f"{skill} ({jobs} jobs)" for skill, _, jobs in to_learn))
+    return {"analyzed_job_ids": ranked.job_ids, "match_scores": ranked.match_scores,
+            "rerank_scores": ranked.rerank_scores, "skills_to_learn": to_learn}
 
-def user_proxy_agent_node(state: AgentState) -> AgentState:
-    """Agent that interacts with the user for selection."""
+@tracing.traced("node.user_proxy")
+def user_proxy_agent_node(state: AgentState) -> dict:
+    """Agent that interacts with the user for selection (or applies the batch policy)."""
     print("\n--- AGENT: User Proxy ---")
-    user_interface.display_jobs(state["analyzed_jobs"])
-    selected_jobs = user_interface.get_user_selections(state["analyzed_jobs"])
+    from modules import analysis_engine, job_index, job_records
+    job_ids = state["analyzed_job_ids"]
+    jobs = job_index.get_index(config.JOB_INDEX_DIR).get_jobs(job_ids)
+    # Served from the skill cache the analyst filled
+    gaps = analysis_engine.skill_gaps(state["resume_text"], [job.description for job in jobs])
+    analyzed_jobs = job_records.JobTable.from_state(
+        job_ids, jobs, state["match_scores"], state.get("rerank_scores"), [gap["missing"] for gap in gaps]
+    )
+    if state.get("policy") is None:
+        user_interface.display_jobs(analyzed_jobs)
+        selected_jobs = user_interface.get_user_selections(analyzed_jobs)
+    else:
+        from modules import policies
+        selected_jobs = policies.select_jobs(state["policy"], analyzed_jobs)
+        print(f"🤖 Policy selected {len(selected_jobs)} of {len(analyzed_jobs)} jobs.")
     
     if not selected_jobs:
         print("User selected no jobs. Ending process.")
-        return {**state, "selected_jobs": []}
+        return {"selected_job_ids": []}
 
     # Build the RAG chain for the next step
+    from modules import rag_engine
     selected_jds = [job['description'] for job in selected_jobs]
-    rag_chain = rag_engine.create_rag_chain(state["resume_text"], selected_jds)
+    selected_ids = [job_index.job_key(job) for job in selected_jobs]
+    rag_chain = rag_engine.create_rag_chain(
+        state["resume_text"], selected_jds, selected_ids, resume_sections=state.get("resume_sections")
+    )
     
-    return {**state, "selected_jobs": selected_jobs, "rag_chain": rag_chain}
+    return {"selected_job_ids": selected_ids, "rag_chain_ref": rag_chain.to_ref()}
+
+@tracing.traced("node.advisor")
+def advisor_agent_node(state: AgentState) -> dict:
+    """Agent that prepares RAG-powered resume suggestions for the selected jobs."""
+    print("\n--- AGENT: Advisor ---")
+    from modules import job_index, rag_engine
+    job_ids = state["selected_job_ids"]
+    jobs = job_index.get_index(config.JOB_INDEX_DIR).get_jobs(job_ids)
+    rag_chain = rag_engine.load_rag_chain(state["rag_chain_ref"])
+
+    # Fetched in one go, and checkpointed, so the applicator never waits on the
+    # LLM and a resumed run never pays for the same suggestions twice
+    print(f"Preparing suggestions for {len(jobs)} jobs...")
+    answers = rag_engine.query_rag_many(rag_chain, [job['title'] for job in jobs], job_ids)
+    return {"suggestions": dict(zip(job_ids, answers))}
 
-def application_agent_node(state: AgentState) -> AgentState:
+@tracing.traced("node.applicator")
+def application_agent_node(state: AgentState) -> dict:
     """Agent that applies to the selected jobs."""
     print("\n--- AGENT: Applicator ---")
-    rag_chain = state["rag_chain"]
+    from modules import application_queue, dedup, job_index, policies
+    policy = state.get("policy")
+    job_ids = state["selected_job_ids"]
+    jobs = job_index.get_index(config.JOB_INDEX_DIR).get_jobs(job_ids)
+    suggestions = state.get("suggestions") or {}
+    store = dedup.get_seen_store(dedup.store_path(state.get("candidate")))
+    # A resumed run must not apply twice to jobs an earlier attempt got through
+    already_applied = {key for key, *_ in store.applied()}
     
-    for job in state["selected_jobs"]:
+    applications = []
+    applied_job_ids = []
+    submitted_job_ids = []
+    for job_id, job in zip(job_ids, jobs):
+        if dedup.posting_key(job) in already_applied:
+            print(f"\nAlready applied to {job['title']} at {job['company']}, skipping.")
+            applied_job_ids.append(job_id)
+            continue
         print(f"\nProcessing application for: {job['title']} at {job['company']}")
         
         print("\n--- RAG-Powered Resume Suggestions ---")
-        suggestions = rag_engine.query_rag_chain(rag_chain, job['title'])
-        print(suggestions)
+        print(suggestions.get(job_id, ""))
         print("-" * 20)
         
+        if policy is not None:
+            if policies.confirm_application(policy, job):
+                applications.append((job_id, job, policies.choose_resume(policy, job, state["default_resume_path"])))
+            continue
+
         use_default = input("Use the default resume? (y/n): ").lower()
         current_resume_path = state["default_resume_path"]
         if use_default != 'y':
             custom_resume = input("Enter path to tailored resume: ")
             current_resume_path = custom_resume if os.path.exists(custom_resume) else state["default_resume_path"]
-        
-        application_automator.apply_to_job(job['url'], current_resume_path)
-    
-    return state # No state change needed here
+        applications.append((job_id, job, current_resume_path))
 
-# --- 3. Define the Graph and Edges ---
+    if not applications:
+        print(f"\nApplied to 0 of {len(jobs)} jobs.")
+        return {"applied_job_ids": applied_job_ids, "submitted_job_ids": submitted_job_ids}
 
-workflow = StateGraph(AgentState)
+    # Submitted through the durable queue: the shared workers apply in parallel,
+    # within each site's concurrency limit, retrying failures; the idempotency
+    # key keeps a re-run (or a resumed run) from applying twice
+    queue = application_queue.get_queue()
+    application_queue.get_workers(queue)
+    keys = [queue.enqueue(job, path, state.get("candidate"), job_id) for job_id, job, path in applications]
+    print(f"\n📬 Queued {len(keys)} applications; waiting for the workers...")
+    results = queue.wait(keys, timeout=config.APPLY_WAIT_SEC)
 
-# Add nodes to the graph
-workflow.add_node("searcher", search_agent_node)
-workflow.add_node("analyst", analysis_agent_node)
-workflow.add_node("user_proxy", user_proxy_agent_node)
-workflow.add_node("applicator", application_agent_node)
+    # Remember submitted applications so later runs skip these postings;
+    # simulated ones (dry-run adapters) were not sent, so they stay visible
+    pending = simulated = 0
+    for (job_id, job, _), key in zip(applications, keys):
+        status = results[key]["status"]
+        if status == application_queue.SUCCEEDED:
+            store.mark_applied(job)
+            applied_job_ids.append(job_id)
+            submitted_job_ids.append(job_id)
+        elif status == application_queue.SIMULATED:
+            simulated += 1
+        elif status not in application_queue.FINISHED:
+            pending += 1
+    print(f"\nApplied to {len(applied_job_ids)} of {len(jobs)} jobs.")
+    if simulated:
+        print(f"🧪 {simulated} applications were simulated only (the site's adapter does not submit).")
+    if pending:
+        print(f"⏳ {pending} applications are still queued; follow them with --queue-status, "
+              "or finish them later with --drain.")
 
-# Define the flow of control (edges)
-workflow.set_entry_point("searcher")
-workflow.add_edge("searcher", "analyst")
-workflow.add_edge("analyst", "user_proxy")
+    return {"applied_job_ids": applied_job_ids, "submitted_job_ids": submitted_job_ids}
+
+# --- 3. Define the Graph and Edges ---
 
-# Add a conditional edge
 def decide_to_apply(state: AgentState):
     """Decides whether to proceed to application or end."""
-    if state.get("selected_jobs") and len(state["selected_jobs"]) > 0:
-        return "applicator"
+    from langgraph.graph import END
+    if state.get("selected_job_ids"):
+        return "advisor"
     else:
         return END
 
-workflow.add_conditional_edges(
-    "user_proxy",
-    decide_to_apply,
-    {"applicator": "applicator", END: END}
-)
-workflow.add_edge("applicator", END) # End after applying
+def build_graph():
+    """Builds the agent workflow graph."""
+    from langgraph.graph import StateGraph, END
+
+    workflow = StateGraph(AgentState)
 
-# Compile the graph into a runnable app
-app = workflow.compile()
+    # Add nodes to the graph
+    workflow.add_node("searcher", search_agent_node)
+    workflow.add_node("deduper", dedup_agent_node)
+    workflow.add_node("analyst", analysis_agent_node)
+    workflow.add_node("user_proxy", user_proxy_agent_node)
+    workflow.add_node("advisor", advisor_agent_node)
+    workflow.add_node("applicator", application_agent_node)
+
+    # Define the flow of control (edges)
+    workflow.set_entry_point("searcher")
+    workflow.add_edge("searcher", "deduper")
+    workflow.add_edge("deduper", "analyst")
+    workflow.add_edge("analyst", "user_proxy")
+
+    # Add a conditional edge
+    workflow.add_conditional_edges(
+        "user_proxy",
+        decide_to_apply,
+        {"advisor": "advisor", END: END}
+    )
+    workflow.add_edge("advisor", "applicator")
+    workflow.add_edge("applicator", END) # End after applying
+    return workflow
+
+_app = None
+
+def get_app():
+    """Returns the compiled graph, compiling it on first use. State is checkpointed to config.CHECKPOINT_DB_PATH."""
+    global _app
+    if _app is None:
+        from modules import checkpoints
+        _app = build_graph().compile(checkpointer=checkpoints.get_checkpointer())
+    return _app
 
 # --- 4. Run the Multi-Agent System ---
-if __name__ == "__main__":
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="AI job application agent.")
+    parser.add_argument("--batch", metavar="MANIFEST",
+                        help="run every candidate in a JSON manifest, without prompts")
+    parser.add_argument("--workers", type=int, help="candidates run at once in batch mode (application workers with --drain)")
+    parser.add_argument("--quiet", action="store_true", help="batch mode: only print the report")
+    parser.add_argument("--resume", metavar="RUN_ID",
+                        help="continue an interrupted run (or batch) from its last checkpoint")
+    parser.add_argument("--trace", metavar="PATH", nargs="?", const=config.TRACE_DEFAULT_PATH,
+                        help="record spans to a JSON lines file and print a per-stage summary")
+    parser.add_argument("--queue-status", action="store_true", help="show the application queue and exit")
+    parser.add_argument("--watch", type=float, metavar="SECONDS", nargs="?", const=2.0,
+                        help="with --queue-status: refresh until no application is queued or running")
+    parser.add_argument("--drain", action="store_true",
+                        help="apply to everything still queued (e.g. after a restart), then exit")
+    args = parser.parse_args(argv)
+
+    if args.trace or config.TRACE_PATH:
+        tracer = tracing.enable(args.trace)
+        print(f"Tracing to {tracer.path}")
+    try:
+        run(args)
+    finally:
+        llm_cache.print_stats()
+        if tracing.enabled():
+            tracing.print_summary()
+            tracing.disable()
+
+def run(args):
+    """Runs the batch, the resumed run or the new interactive run that args ask for."""
+    from modules import checkpoints
+
+    if args.queue_status or args.drain:
+        from modules import application_queue
+        queue = application_queue.get_queue()
+        if args.drain:
+            application_queue.drain(queue, workers=args.workers)
+        while args.watch and not args.drain:
+            counts = queue.status()
+            if not counts[application_queue.QUEUED] + counts["retrying"] + counts[application_queue.RUNNING]:
+                break
+            application_queue.print_status(queue)
+            time.sleep(args.watch)
+        application_queue.print_status(queue)
+        return
+
+    if args.batch:
+        from modules import batch_runner
+        batch_runner.run_manifest(get_app(), args.batch, workers=args.workers, quiet=args.quiet, run_id=args.resume)
+        return
+
+    if args.resume:
+        if not get_app().get_state(checkpoints.thread_config(args.resume)).values:
+            print(f"No saved run with id {args.resume}.")
+            return
+        checkpoints.run_or_resume(get_app(), None, args.resume)
+        print("\n\n✅ Multi-agent workflow complete.")
+        return
+
     resume_path, desired_job, location = user_interface.get_initial_input()
-    resume_text = input_handler.parse_resume(resume_path)
+    resume = input_handler.load_resume(resume_path)
 
-    if resume_text:
+    if resume and resume.text:
         initial_state = AgentState(
-            resume_text=resume_text,
+            resume_text=resume.text,
+            resume_sections=resume.sections,
             default_resume_path=resume_path,
             job_query=desired_job,
             location=location
         )
         # Run the graph
-        final_state = app.invoke(initial_state)
+        run_id = checkpoints.new_thread_id()
+        print(f"Run id: {run_id} (if interrupted, continue with --resume {run_id})")
+        checkpoints.run_or_resume(get_app(), initial_state, run_id)
         print("\n\n✅ Multi-agent workflow complete.")
+
+if __name__ == "__main__":
+    main()